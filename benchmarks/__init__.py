@@ -0,0 +1,13 @@
+"""
+Benchmarks del sistema Umbrella (python -m benchmarks.<módulo>).
+
+    bench_micro     microbenchmarks de normalización, servicios, alertas y kernels
+    bench_pipeline  throughput y latencia de extremo a extremo con carga sintética
+    gate            compara resultados con benchmarks/baseline.json
+    bench_matmul, bench_primes, bench_factorial  kernels frente a la versión original
+"""
+import os
+
+# Un benchmark nunca debe enviar correos ni webhooks: canal de alertas "log"
+# salvo que se pida otro explícitamente (antes de importar la configuración)
+os.environ.setdefault("ALERT_CHANNEL", "log")
@@ -0,0 +1,74 @@
+"""
+bench_factorial.py
+Compara factorial (división binaria de src.processing.factorials) con la
+recursión original para n = 10**3 ... 10**6: cálculo en frío, partiendo de
+un factorial cercano en caché, producto repartido entre procesos y
+math.factorial como referencia.
+
+    python -m benchmarks.bench_factorial --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import math
+import sys
+from typing import List, Optional
+
+from benchmarks.common import best_of, format_table
+from src.processing.factorials import FactorialEngine
+from src.processing.process_pool import shutdown_process_executor
+
+
+def legacy_factorial(n: int) -> int:
+    """Implementación original (recursión), referencia del benchmark."""
+    if n <= 1:
+        return 1
+    return n * legacy_factorial(n - 1)
+
+
+def _legacy(n: int, legacy_max: int, repeat: int) -> Optional[float]:
+    # La recursión necesita un marco por factor: se sube el límite solo aquí
+    if n > legacy_max:
+        return None
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, n + 100))
+    try:
+        return best_of(lambda: legacy_factorial(n), repeat)
+    except RecursionError:
+        return None
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+def _nearby(n: int) -> float:
+    engine = FactorialEngine(parallel_min=n + 1)
+    engine.factorial(n - n // 100)
+    return best_of(lambda: engine.factorial(n), 1)
+
+
+def run(sizes: List[int], legacy_max: int, repeat: int) -> str:
+    rows = []
+    for n in sizes:
+        legacy = _legacy(n, legacy_max, repeat)
+        cold = best_of(lambda: FactorialEngine(cache_size=0, parallel_min=n + 1).factorial(n), repeat)
+        parallel = best_of(lambda: FactorialEngine(cache_size=0, parallel_min=1).factorial(n), repeat)
+        nearby = min(_nearby(n) for _ in range(max(1, repeat)))
+        reference = best_of(lambda: math.factorial(n), repeat)
+        speedup = f"{legacy / cold:.0f}x" if legacy else None
+        rows.append([n, legacy, cold, nearby, parallel, reference, speedup])
+    return format_table(["n", "original (s)", "división binaria (s)", "desde caché (s)", "paralelo (s)",
+                         "math.factorial (s)", "vs original"], rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-max", type=int, default=100_000, help="mayor n para la recursión original")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    try:
+        print(run(args.sizes, args.legacy_max, args.repeat))
+    finally:
+        shutdown_process_executor()
+
+
+if __name__ == "__main__":
+    main()
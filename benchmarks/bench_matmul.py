@@ -0,0 +1,59 @@
+"""
+bench_matmul.py
+Compara heavy_matrix_multiplication (motor de src.processing.matmul) con la
+implementación original de triple bucle, para varios tamaños y backends.
+
+    python -m benchmarks.bench_matmul --sizes 64 128 256 --legacy-max 256
+"""
+import argparse
+from typing import List
+
+from benchmarks.common import best_of, format_table
+from src.processing.cpu_bound import heavy_matrix_multiplication
+from src.processing.process_pool import shutdown_process_executor
+
+BACKENDS = ("numpy", "blocked", "parallel")
+
+
+def legacy_matrix_multiplication(size: int) -> List[List[int]]:
+    """Implementación original (triple bucle sobre listas), referencia del benchmark."""
+    A = [[i + j for j in range(size)] for i in range(size)]
+    B = [[i * j for j in range(size)] for i in range(size)]
+    result = [[0 for _ in range(size)] for _ in range(size)]
+    for i in range(size):
+        for j in range(size):
+            for k in range(size):
+                result[i][j] += A[i][k] * B[k][j]
+    return result
+
+
+def run(sizes: List[int], legacy_max: int, blocked_max: int, repeat: int) -> str:
+    rows = []
+    for size in sizes:
+        legacy = best_of(lambda: legacy_matrix_multiplication(size), repeat) if size <= legacy_max else None
+        timings = {}
+        for backend in BACKENDS:
+            if backend == "blocked" and size > blocked_max:
+                timings[backend] = None
+                continue
+            timings[backend] = best_of(lambda: heavy_matrix_multiplication(size, backend=backend), repeat)
+        speedup = f"{legacy / timings['numpy']:.0f}x" if legacy else None
+        rows.append([size, legacy, timings["numpy"], timings["blocked"], timings["parallel"], speedup])
+    return format_table(["n", "original (s)", "numpy (s)", "blocked (s)", "parallel (s)", "numpy vs original"], rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 128, 256, 512, 1024, 2048])
+    parser.add_argument("--legacy-max", type=int, default=256, help="mayor n para el triple bucle original")
+    parser.add_argument("--blocked-max", type=int, default=512, help="mayor n para la versión en Python puro")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    try:
+        print(run(args.sizes, args.legacy_max, args.blocked_max, args.repeat))
+    finally:
+        shutdown_process_executor()
+
+
+if __name__ == "__main__":
+    main()
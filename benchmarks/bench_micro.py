@@ -0,0 +1,117 @@
+"""
+bench_micro.py
+Microbenchmarks de las piezas del pipeline con carga sintética: normalización
+(por registro y por lote), analyze/analyze_batch y handle_result de cada
+servicio, send_alert por el canal "log" y los kernels de cpu_bound. Los
+tiempos son por operación (registro, alerta o llamada al kernel), el mejor
+de 'repeat' ejecuciones. El logging se configura como en main pero escribe
+en /dev/null, así que su coste sí se mide.
+
+    python -m benchmarks.bench_micro --records 2000 --json micro.json
+    python -m benchmarks.bench_micro --only normalize analyze_batch
+"""
+import argparse
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.common import Metrics, best_of, format_table, metric, save_results
+from src.alerts import notifier
+from src.processing.cpu_bound import heavy_matrix_multiplication
+from src.processing.factorials import FactorialEngine
+from src.processing.primes import PrimeSieve
+from src.processing.process_pool import shutdown_process_executor
+from src.services.bioquimico_service import BioquimicoService
+from src.services.fisico_service import FisicoService
+from src.services.genetico_service import GeneticoService
+from src.sources.synthetic import SyntheticGenerator
+from src.utils.log_setup import setup_logging
+from src.utils.normalizer import normalize_batch, normalize_data
+from src.utils.record_batch import RecordBatch
+
+SERVICES = {"genetico": GeneticoService, "bioquimico": BioquimicoService, "fisico": FisicoService}
+
+# Caso: nombre -> (función cronometrada, operaciones por llamada)
+Case = Tuple[Callable[[], object], int]
+
+# Tamaños de los kernels: rápidos pero por encima del ruido del temporizador
+FACTORIAL_N = 20_000
+PRIMES_LIMIT = 1_000_000
+MATMUL_SIZE = 128
+
+# En los casos de pocos µs/op la variación entre procesos llega a duplicar
+# la medida (disposición de memoria, planificación de la VM): el gate solo
+# marca ahí regresiones groseras (x2), que son las algorítmicas
+NOISY_BELOW_US = 20.0
+NOISY_TOLERANCE = 1.0
+
+
+def build_cases(records: int, anomaly_ratio: float, seed: int) -> Dict[str, Case]:
+    cases: Dict[str, Case] = {}
+    for data_type, service_cls in SERVICES.items():
+        raw = SyntheticGenerator(data_type, seed=seed, anomaly_ratio=anomaly_ratio).chunk(records)
+        normalized = [normalize_data(r, data_type) for r in raw]
+        batch = RecordBatch.from_records(normalized, data_type)
+        service = service_cls("stream/benchmark")
+        results = service.analyze_batch(batch)
+
+        cases[f"normalize_data.{data_type}"] = (
+            lambda raw=raw, dt=data_type: [normalize_data(r, dt) for r in raw], records)
+        cases[f"normalize_batch.{data_type}"] = (lambda raw=raw, dt=data_type: normalize_batch(raw, dt), records)
+        cases[f"analyze.{data_type}"] = (
+            lambda s=service, items=normalized: [s.analyze(r) for r in items], records)
+        cases[f"analyze_batch.{data_type}"] = (lambda s=service, b=batch: s.analyze_batch(b), records)
+        cases[f"handle_result.{data_type}"] = (
+            lambda s=service, items=results: [s.handle_result(r) for r in items], records)
+
+    event = notifier.alert_event("bioquimico", {"sample_id": "B000001", "ph": 6.2}, "anomalia",
+                                 "Anomalía bioquímica detectada", "warning")
+    alerts = max(1, records // 10)
+    cases["send_alert.log"] = (lambda: [notifier.send_alert(event) for _ in range(alerts)], alerts)
+
+    # Kernels en frío: una caché nueva en cada llamada
+    cases[f"cpu.factorial.{FACTORIAL_N}"] = (lambda: FactorialEngine().factorial(FACTORIAL_N), 1)
+    cases[f"cpu.primes.{PRIMES_LIMIT}"] = (lambda: PrimeSieve().primes_up_to(PRIMES_LIMIT), 1)
+    cases[f"cpu.matmul.{MATMUL_SIZE}"] = (lambda: heavy_matrix_multiplication(MATMUL_SIZE), 1)
+    return cases
+
+
+def run(records: int, repeat: int, anomaly_ratio: float, seed: int,
+        only: Optional[List[str]] = None) -> Tuple[str, Metrics]:
+    cases = build_cases(records, anomaly_ratio, seed)
+    rows = []
+    metrics: Metrics = {}
+    for name, (func, ops) in cases.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        func()  # Calentamiento: cachés, imports diferidos, compilación del panel
+        per_op = best_of(func, repeat) / ops
+        tolerance = NOISY_TOLERANCE if per_op * 1e6 < NOISY_BELOW_US else None
+        metrics[f"micro.{name}"] = metric(per_op * 1e6, "us", tolerance=tolerance)
+        rows.append([name, ops, per_op * 1e6, round(1 / per_op) if per_op else None])
+    return format_table(["caso", "ops", "us/op", "ops/s"], rows), metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=2000, help="registros por caso de servicio")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--anomaly-ratio", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", help="prefijos de los casos a ejecutar")
+    parser.add_argument("--json", help="guarda los resultados para benchmarks.gate")
+    args = parser.parse_args()
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        listener = setup_logging(stream=devnull)
+        try:
+            table, metrics = run(args.records, args.repeat, args.anomaly_ratio, args.seed, args.only)
+        finally:
+            listener.stop()
+            shutdown_process_executor()
+    print(table)
+    if args.json:
+        save_results(args.json, metrics)
+
+
+if __name__ == "__main__":
+    main()
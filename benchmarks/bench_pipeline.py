@@ -0,0 +1,198 @@
+"""
+bench_pipeline.py
+Throughput y latencia de extremo a extremo: los tres servicios leen carga
+sintética (SyntheticSource) y recorren el pipeline completo con el mismo
+montaje que main (WorkerPool, ExecutionRouter, dispatcher y supresor de
+alertas). La latencia va de la lectura de la fuente al final de
+handle_result de cada registro.
+
+    python -m benchmarks.bench_pipeline --records 20000 --json pipeline.json
+    python -m benchmarks.bench_pipeline --rate 500 --mode process --anomaly-ratio 0.05
+    python -m benchmarks.bench_pipeline --trace-rate 0.01 --trace trace.json
+
+Sin --rate la ingesta va a máxima velocidad (throughput máximo; la latencia
+incluye la espera en colas). Con --rate cada flujo recibe esas muestras/s.
+Con --trace-rate se traza esa fracción de registros y se desglosa la
+latencia por tramo (cola, entrega, transferencia, análisis, manejo).
+"""
+import argparse
+import asyncio
+import collections
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.common import Metrics, format_table, metric, save_results
+from src.alerts import notifier
+from src.alerts.dispatcher import AlertDispatcher
+from src.alerts.suppression import AlertSuppressor
+from src.metrics.tracing import Tracer
+from src.config.settings import MAX_WORKERS, PROCESS_POOL_SIZE, SHM_RING_BYTES, THREAD_POOL_SIZE
+from src.processing.orchestrator import run_orchestration
+from src.processing.io_bound import shutdown_io_executor
+from src.processing.process_pool import shutdown_process_executor
+from src.processing.router import MODES, ExecutionRouter
+from src.processing.workers import WorkerPool
+from src.services.bioquimico_service import BioquimicoService
+from src.services.fisico_service import FisicoService
+from src.services.genetico_service import GeneticoService
+from src.sources.adapters import SyntheticSource
+from src.sources.pacing import Pacer
+from src.utils.log_setup import setup_logging
+
+SERVICES = {"genetico": GeneticoService, "bioquimico": BioquimicoService, "fisico": FisicoService}
+
+# De extremo a extremo el ruido es mayor (planificación, exploración del
+# router adaptativo): el gate admite más variación en estas medidas
+PIPELINE_TOLERANCE = 0.4
+
+
+class LatencyProbe:
+    """
+    Marca la hora de lectura de cada registro y la consume al manejar su
+    resultado. Los sample_id se repiten, así que cada clave guarda una cola:
+    si dos lecturas de la misma muestra se reordenan solo se intercambian
+    sus latencias, la distribución no cambia.
+    """
+
+    def __init__(self):
+        self._pending: Dict[Tuple[str, str], Deque[float]] = collections.defaultdict(collections.deque)
+        self.latencies: Dict[str, List[float]] = collections.defaultdict(list)
+
+    def wrap_source(self, service) -> None:
+        fetch = service.fetch_from_source
+
+        async def timed_fetch():
+            record = await fetch()
+            if record is not None:
+                self._pending[(service.data_type, record["sample_id"])].append(time.perf_counter())
+            return record
+
+        service.fetch_from_source = timed_fetch
+
+    def handle(self, service, result: Dict[str, Any]) -> None:
+        service.handle_result(result)
+        stamps = self._pending.get((service.data_type, result["sample_id"]))
+        if stamps:
+            self.latencies[service.data_type].append(time.perf_counter() - stamps.popleft())
+
+
+async def run_pipeline(records: int, rate: float, mode: str, anomaly_ratio: float, seed: int,
+                       tracer: Optional[Tracer] = None) -> Dict[str, Any]:
+    services = []
+    probe = LatencyProbe()
+    for offset, (data_type, service_cls) in enumerate(SERVICES.items()):
+        service = service_cls("stream/benchmark")
+        service.reader = SyntheticSource(data_type, limit=records, seed=seed + offset, anomaly_ratio=anomaly_ratio)
+        probe.wrap_source(service)
+        services.append(service)
+
+    worker_pool = WorkerPool(PROCESS_POOL_SIZE, SHM_RING_BYTES)
+    await worker_pool.warm_up()
+    thread_pool = ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE)
+    router = ExecutionRouter(worker_pool, thread_pool, mode=mode, max_in_flight=MAX_WORKERS)
+    dispatcher = AlertDispatcher()
+    dispatcher.start()
+    notifier.set_dispatcher(dispatcher)
+    suppressor = AlertSuppressor()
+    notifier.set_suppressor(suppressor)
+
+    async def analyze(service, batch):
+        return await router.run(batch)
+
+    def pacing(data_type: str) -> Pacer:
+        return Pacer("rate", rate=rate) if rate > 0 else Pacer("fast")
+
+    start = time.perf_counter()
+    try:
+        pipelines = await run_orchestration(services, analyze, probe.handle, pacing=pacing, tracer=tracer)
+        elapsed = time.perf_counter() - start
+    finally:
+        notifier.set_suppressor(None)
+        notifier.set_dispatcher(None)
+        await dispatcher.stop()
+        thread_pool.shutdown(wait=True)
+        worker_pool.shutdown()
+
+    return {
+        "elapsed": elapsed,
+        "latencies": probe.latencies,
+        "stages": {p.name: p.stats() for p in pipelines},
+        "router": router.stats(),
+        "alerts": {"sent": dispatcher.stats()["sent"], "suppressed": suppressor.stats()},
+        "anomalies": {s.data_type: s.reader.generator.anomalies for s in services},
+        "tracing": tracer.summary() if tracer is not None else {},
+    }
+
+
+def report(outcome: Dict[str, Any]) -> Tuple[str, Metrics]:
+    elapsed = outcome["elapsed"]
+    rows = []
+    metrics: Metrics = {}
+    total = 0
+    for data_type, latencies in sorted(outcome["latencies"].items()):
+        values = np.array(latencies) * 1000
+        p50, p95, p99 = np.percentile(values, [50, 95, 99]).tolist()
+        throughput = len(values) / elapsed
+        total += len(values)
+        rows.append([data_type, len(values), outcome["anomalies"][data_type], throughput, p50, p95, p99,
+                     float(values.max())])
+        metrics[f"pipeline.{data_type}.throughput"] = metric(throughput, "registros/s", "higher", PIPELINE_TOLERANCE)
+        metrics[f"pipeline.{data_type}.p50_ms"] = metric(p50, "ms", tolerance=PIPELINE_TOLERANCE)
+        metrics[f"pipeline.{data_type}.p99_ms"] = metric(p99, "ms", tolerance=PIPELINE_TOLERANCE)
+    metrics["pipeline.throughput"] = metric(total / elapsed, "registros/s", "higher", PIPELINE_TOLERANCE)
+
+    lines = [format_table(["flujo", "registros", "anomalías", "registros/s", "p50 ms", "p95 ms", "p99 ms",
+                           "max ms"], rows)]
+    stage_rows = [
+        [name, stage, stats["processed"], stats["errors"], stats["throughput"]]
+        for name, stages in outcome["stages"].items() for stage, stats in stages.items()
+    ]
+    lines.append(format_table(["flujo", "etapa", "procesados", "errores", "por segundo"], stage_rows))
+    if outcome["tracing"]:
+        span_rows = [
+            [name, span, stats["count"], stats["p50_ms"], stats["p99_ms"], stats["max_ms"]]
+            for name, spans in sorted(outcome["tracing"].items()) for span, stats in spans.items()
+        ]
+        lines.append(format_table(["flujo", "tramo", "trazas", "p50 ms", "p99 ms", "max ms"], span_rows))
+    lines.append(f"Total: {total} registros en {elapsed:.2f} s ({total / elapsed:.0f} registros/s)")
+    lines.append(f"Rutas: {outcome['router']['routed']}")
+    lines.append(f"Alertas enviadas: {outcome['alerts']['sent']}")
+    return "\n\n".join(lines), metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20_000, help="registros por flujo")
+    parser.add_argument("--rate", type=float, default=0.0, help="muestras/s por flujo (0: máxima velocidad)")
+    parser.add_argument("--mode", choices=MODES + ("adaptive",), default="adaptive")
+    parser.add_argument("--anomaly-ratio", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-rate", type=float, default=0.0, help="fracción de registros trazados por etapa")
+    parser.add_argument("--trace", help="exporta las trazas en formato Chrome a este fichero")
+    parser.add_argument("--json", help="guarda los resultados para benchmarks.gate")
+    args = parser.parse_args()
+
+    tracer = Tracer(args.trace_rate, seed=args.seed) if args.trace_rate > 0 else None
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        listener = setup_logging(stream=devnull)
+        try:
+            outcome = asyncio.run(run_pipeline(args.records, args.rate, args.mode, args.anomaly_ratio, args.seed,
+                                               tracer))
+        finally:
+            listener.stop()
+            shutdown_io_executor()
+            shutdown_process_executor()
+    table, metrics = report(outcome)
+    print(table)
+    if tracer is not None and args.trace:
+        tracer.export(args.trace)
+    if args.json:
+        save_results(args.json, metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+bench_primes.py
+Compara compute_primes (criba segmentada de src.processing.primes) con la
+división por tentativa original: criba en frío, ampliación incremental de la
+caché, modo generador y reparto entre procesos.
+
+    python -m benchmarks.bench_primes --limits 10000 100000 1000000 10000000
+"""
+import argparse
+import math
+from typing import List
+
+from benchmarks.common import best_of, format_table
+from src.processing.primes import PrimeSieve
+from src.processing.process_pool import shutdown_process_executor
+
+
+def legacy_compute_primes(limit: int) -> List[int]:
+    """Implementación original (división por tentativa), referencia del benchmark."""
+    primes = []
+    for num in range(2, limit + 1):
+        is_prime = True
+        for i in range(2, int(math.sqrt(num)) + 1):
+            if num % i == 0:
+                is_prime = False
+                break
+        if is_prime:
+            primes.append(num)
+    return primes
+
+
+def _incremental(limit: int) -> float:
+    # Caché ya cubierta hasta limit/10: solo se criba el tramo nuevo
+    sieve = PrimeSieve(parallel_min=limit + 1)
+    sieve.primes_up_to(limit // 10)
+    return best_of(lambda: sieve.primes_up_to(limit), 1)
+
+
+def run(limits: List[int], legacy_max: int, repeat: int) -> str:
+    rows = []
+    for limit in limits:
+        legacy = best_of(lambda: legacy_compute_primes(limit), repeat) if limit <= legacy_max else None
+        cold = best_of(lambda: PrimeSieve(parallel_min=limit + 1).primes_up_to(limit), repeat)
+        parallel = best_of(lambda: PrimeSieve(parallel_min=1).primes_up_to(limit), repeat)
+        incremental = min(_incremental(limit) for _ in range(max(1, repeat)))
+        generator = best_of(lambda: sum(1 for _ in PrimeSieve().iter_primes(limit)), repeat)
+        speedup = f"{legacy / cold:.0f}x" if legacy else None
+        rows.append([limit, legacy, cold, parallel, incremental, generator, speedup])
+    return format_table(["limit", "original (s)", "criba (s)", "paralela (s)", "incremental (s)",
+                         "generador (s)", "criba vs original"], rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limits", type=int, nargs="+", default=[10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--legacy-max", type=int, default=1_000_000, help="mayor límite para la versión original")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    try:
+        print(run(args.limits, args.legacy_max, args.repeat))
+    finally:
+        shutdown_process_executor()
+
+
+if __name__ == "__main__":
+    main()
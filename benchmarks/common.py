@@ -0,0 +1,88 @@
+"""
+common.py
+Utilidades compartidas por los benchmarks: cronometraje, tablas de texto y
+ficheros de resultados (JSON) que compara benchmarks.gate.
+"""
+import gc
+import json
+import os
+import platform
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+Metrics = Dict[str, Dict[str, Any]]
+
+
+def best_of(func: Callable[[], object], repeat: int = 3) -> float:
+    """Mejor tiempo en segundos de 'repeat' ejecuciones de func() (sin GC, como timeit)."""
+    best = float("inf")
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best
+
+
+def format_table(headers: Sequence[str], rows: List[Sequence[object]]) -> str:
+    """Tabla alineada a la derecha, una fila por línea."""
+    cells = [[str(h) for h in headers]] + [[_cell(v) for v in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    lines = ["  ".join(c.rjust(w) for c, w in zip(row, widths)) for row in cells]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
+
+
+def _cell(value: object) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.4f}"
+    return str(value)
+
+
+def metric(value: float, unit: str, better: str = "lower", tolerance: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Una medida del fichero de resultados; 'better' es "lower" o "higher".
+    'tolerance' sustituye a la del gate para medidas más ruidosas.
+    """
+    entry = {"value": value, "unit": unit, "better": better}
+    if tolerance is not None:
+        entry["tolerance"] = tolerance
+    return entry
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Descripción de la máquina: una comparación solo tiene sentido en la misma.
+    Solo versiones y hardware; nada de rutas ni argumentos locales.
+    """
+    import numpy as np
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save_results(path: Union[str, Path], metrics: Metrics, meta: Optional[Dict[str, Any]] = None) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": environment() if meta is None else meta, "metrics": metrics}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: Union[str, Path]) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data.get("metrics"), dict):
+        raise ValueError(f"{path} no es un fichero de resultados de benchmark")
+    return data
@@ -0,0 +1,118 @@
+"""
+gate.py
+Puerta de regresión: compara uno o varios ficheros de resultados (--json
+de bench_micro y bench_pipeline) con la línea base guardada y termina con
+código 1 si alguna medida empeora más que la tolerancia. Si varios ficheros
+traen la misma medida se compara la mejor, así que repetir cada benchmark
+unas cuantas veces filtra el ruido de la máquina; la línea base (--update)
+guarda en cambio la mediana, para que una ejecución con suerte no la deje
+por debajo de lo que la máquina reproduce. Las medidas nuevas o
+ausentes se informan pero no fallan. La línea base solo es comparable en
+la máquina en la que se generó (ver su sección "meta").
+
+    for i in 1 2 3; do python -m benchmarks.bench_micro --json micro$i.json; done
+    python -m benchmarks.bench_pipeline --json pipeline.json
+    python -m benchmarks.gate micro*.json pipeline.json
+    python -m benchmarks.gate micro*.json pipeline.json --update   # nueva línea base
+"""
+import argparse
+import statistics
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.common import Metrics, format_table, load_results, save_results
+
+BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+
+def compare(baseline: Metrics, current: Metrics, tolerance: float = DEFAULT_TOLERANCE,
+            overrides: Optional[Dict[str, float]] = None) -> Tuple[List[list], List[str]]:
+    """
+    Devuelve las filas de la tabla y los nombres de las medidas que
+    empeoran. El cambio es relativo y positivo cuando la medida empeora;
+    una medida puede fijar su propia tolerancia en 'overrides' o con la
+    clave "tolerance" de la línea base.
+    """
+    overrides = overrides or {}
+    rows, regressions = [], []
+    for name in sorted(set(baseline) | set(current)):
+        old, new = baseline.get(name), current.get(name)
+        if old is None or new is None:
+            status = "nueva" if old is None else "ausente"
+            rows.append([name, old and old["value"], new and new["value"], None, status])
+            continue
+        limit = overrides.get(name, old.get("tolerance", tolerance))
+        if old["value"]:
+            change = (new["value"] - old["value"]) / old["value"]
+            if old.get("better", "lower") == "higher":
+                change = -change
+        else:
+            change = 0.0
+        status = "ok"
+        if change > limit:
+            status = "REGRESIÓN"
+            regressions.append(name)
+        elif change < -limit:
+            status = "mejora"
+        rows.append([name, old["value"], new["value"], f"{change:+.1%}", status])
+    return rows, regressions
+
+
+def merge(paths: List[str], pick: str = "best") -> Metrics:
+    """
+    Une varios ficheros de resultados quedándose, por medida, con el mejor
+    valor ("best") o con la mediana ("median").
+    """
+    runs: Dict[str, List[Dict[str, Any]]] = {}
+    for path in paths:
+        for name, entry in load_results(path)["metrics"].items():
+            runs.setdefault(name, []).append(entry)
+    metrics: Metrics = {}
+    for name, entries in runs.items():
+        if pick == "median":
+            entries = sorted(entries, key=lambda e: e["value"])
+            metrics[name] = dict(entries[len(entries) // 2], value=statistics.median(e["value"] for e in entries))
+            continue
+        best = entries[0]
+        for entry in entries[1:]:
+            if _better(entry, best):
+                best = entry
+        metrics[name] = best
+    return metrics
+
+
+def _better(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    if a.get("better", "lower") == "higher":
+        return a["value"] > b["value"]
+    return a["value"] < b["value"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("results", nargs="+", help="ficheros --json de los benchmarks")
+    parser.add_argument("--baseline", default=str(BASELINE))
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="empeoramiento relativo admitido (0.25 = 25%%)")
+    parser.add_argument("--update", action="store_true", help="reemplaza la línea base por la mediana de estos resultados")
+    args = parser.parse_args()
+
+    if args.update:
+        current = merge(args.results, pick="median")
+        save_results(args.baseline, current)
+        print(f"Línea base actualizada: {args.baseline} ({len(current)} medidas)")
+        return
+
+    current = merge(args.results)
+    baseline = load_results(args.baseline)
+    rows, regressions = compare(baseline["metrics"], current, args.tolerance)
+    print(format_table(["medida", "base", "actual", "cambio", "estado"], rows))
+    if regressions:
+        print(f"\n{len(regressions)} regresiones por encima del {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nSin regresiones")
+
+
+if __name__ == "__main__":
+    main()
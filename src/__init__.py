@@ -2,21 +2,33 @@
 Umbrella Data Analysis Package
 Este paquete implementa un sistema concurrente para análisis de datos biológicos.
 Incluye servicios, procesamiento, alertas, métricas y utilidades.
-"""
-
-# Exponer clases principales
-from .services.genetico_service import GeneticoService
-from .services.bioquimico_service import BioquimicoService
-from .services.fisico_service import FisicoService
 
-# Exponer funciones de procesamiento
-from .processing.cpu_bound import factorial, heavy_matrix_multiplication, compute_primes
-from .processing.io_bound import simulate_network_call, batch_network_calls
-from .processing.orchestrator import run_orchestration
+Los nombres exportados se cargan bajo demanda: importar 'src' no arrastra los
+servicios, NumPy, smtplib ni la configuración hasta que se usan.
+"""
+from src._lazy import install
 
-# Exponer utilidades
-from .utils.normalizer import normalize_data
-from .alerts.notifier import send_alert
+_LAZY = {
+    # Clases principales
+    "GeneticoService": ".services.genetico_service",
+    "BioquimicoService": ".services.bioquimico_service",
+    "FisicoService": ".services.fisico_service",
+    # Funciones de procesamiento
+    "factorial": ".processing.cpu_bound",
+    "heavy_matrix_multiplication": ".processing.cpu_bound",
+    "compute_primes": ".processing.cpu_bound",
+    "simulate_network_call": ".processing.io_bound",
+    "batch_network_calls": ".processing.io_bound",
+    "run_orchestration": ".processing.orchestrator",
+    # Utilidades
+    "normalize_data": ".utils.normalizer",
+    "normalize_batch": ".utils.normalizer",
+    "RecordBatch": ".utils.record_batch",
+    "send_alert": ".alerts.notifier",
+    "MetricsMonitor": ".metrics.monitor",
+    # Configuración
+    "DATA_SOURCES": ".config.settings",
+    "PROCESS_POOL_SIZE": ".config.settings",
+}
 
-# Exponer configuración
-from .config.settings import DATA_SOURCES, PROCESS_POOL_SIZE
\ No newline at end of file
+install(globals(), _LAZY)
@@ -0,0 +1,28 @@
+"""
+_lazy.py
+Exportaciones bajo demanda de los paquetes (PEP 562). Cada __init__ declara
+_LAZY (nombre exportado -> submódulo relativo) y llama a install(): el
+submódulo se importa la primera vez que se accede al nombre.
+"""
+import importlib
+from typing import Any, Dict, Mapping
+
+
+def install(namespace: Dict[str, Any], lazy: Mapping[str, str]) -> None:
+    """Define __all__, __getattr__ y __dir__ en el espacio de nombres del paquete."""
+    package = namespace["__name__"]
+
+    def __getattr__(name):
+        module = lazy.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(lazy))
+
+    namespace["__all__"] = list(lazy)
+    namespace["__getattr__"] = __getattr__
+    namespace["__dir__"] = __dir__
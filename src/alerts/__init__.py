@@ -1,4 +1,13 @@
 """
 Sistema de alertas.
 """
-from .notifier import send_alert
\ No newline at end of file
+from src._lazy import install
+
+_LAZY = {
+    "send_alert": ".notifier",
+    "AlertDispatcher": ".dispatcher",
+    "AlertSuppressor": ".suppression",
+    "WebhookClient": ".webhook",
+}
+
+install(globals(), _LAZY)
@@ -0,0 +1,174 @@
+"""
+dispatcher.py
+Envío de alertas en segundo plano: cola acotada, pool de conexiones SMTP
+persistentes y modo resumen que agrupa las alertas de cada ventana.
+"""
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from src.alerts import notifier
+from src.alerts.webhook import WebhookClient
+from src.config import settings
+from src.config.settings import (
+    ALERT_DIGEST_SECONDS,
+    ALERT_QUEUE_SIZE,
+    SMTP_HOST,
+    SMTP_POOL_SIZE,
+    SMTP_PORT,
+    SMTP_TIMEOUT,
+    WEBHOOK_BATCH_SIZE,
+)
+from src.processing.backpressure import BoundedQueue
+from src.processing.batching import drain_batch
+
+logger = logging.getLogger("AlertDispatcher")
+
+
+class SMTPConnectionPool:
+    """
+    Conexiones SMTP reutilizables entre hilos. Como mucho 'size' a la vez;
+    si el servidor cerró una conexión inactiva se reabre y se reintenta una vez.
+    """
+
+    def __init__(self, host: str = SMTP_HOST, port: int = SMTP_PORT, size: int = SMTP_POOL_SIZE,
+                 timeout: float = SMTP_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.opened = 0
+
+    def _connect(self):
+        import smtplib
+
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        self.opened += 1
+        return conn
+
+    def send(self, msg) -> None:
+        import smtplib
+
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                try:
+                    conn.send_message(msg)
+                except (smtplib.SMTPServerDisconnected, ConnectionError):
+                    _quit(conn)
+                    conn = self._connect()
+                    conn.send_message(msg)
+            except Exception:
+                _quit(conn)
+                raise
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                _quit(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+def _quit(conn) -> None:
+    try:
+        conn.quit()
+    except Exception:
+        conn.close()
+
+
+class AlertDispatcher:
+    """
+    Recibe alertas sin bloquear (submit) y las entrega desde hilos propios.
+    Con 'digest_seconds' > 0 las alertas de cada ventana salen en un único
+    mensaje; si no, cada alerta es un mensaje y se envían hasta 'pool_size'
+    en paralelo. El canal webhook agrupa en cada POST lo que haya en cola
+    (hasta WEBHOOK_BATCH_SIZE). Con la cola llena se descartan las más antiguas.
+    """
+
+    def __init__(self, maxsize: int = ALERT_QUEUE_SIZE, pool_size: int = SMTP_POOL_SIZE,
+                 digest_seconds: float = ALERT_DIGEST_SECONDS, channel: Optional[str] = None,
+                 smtp_pool: Optional[SMTPConnectionPool] = None, webhook: Optional[WebhookClient] = None,
+                 max_digest: int = 500):
+        self.queue = BoundedQueue(maxsize, "drop_oldest")
+        self.pool_size = pool_size
+        self.digest_seconds = digest_seconds
+        self.channel = channel
+        self.max_digest = max_digest
+        self.smtp_pool = smtp_pool or SMTPConnectionPool(size=pool_size)
+        self.webhook = webhook or WebhookClient(settings.WEBHOOK_URL, size=settings.WEBHOOK_POOL_SIZE)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+        self.submitted = 0
+        self.sent = 0
+        self.messages = 0
+        self.failed = 0
+
+    def submit(self, event: Dict[str, Any]) -> bool:
+        self.submitted += 1
+        return self.queue.offer(event)
+
+    def start(self) -> None:
+        self._executor = ThreadPoolExecutor(self.pool_size, thread_name_prefix="alertas")
+        senders = 1 if self.digest_seconds > 0 else self.pool_size
+        self._tasks = [asyncio.create_task(self._sender(), name=f"alertas.{i}") for i in range(senders)]
+
+    async def _sender(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.digest_seconds > 0:
+            batch_size = self.max_digest
+        elif (self.channel or settings.ALERT_CHANNEL) == "webhook":
+            batch_size = WEBHOOK_BATCH_SIZE
+        else:
+            batch_size = 1
+        while True:
+            events = await drain_batch(self.queue, batch_size, self.digest_seconds)
+            try:
+                ok = await loop.run_in_executor(self._executor, self._deliver, events)
+                if ok:
+                    self.sent += len(events)
+                    self.messages += 1
+                else:
+                    self.failed += len(events)
+            finally:
+                for _ in events:
+                    self.queue.task_done()
+
+    def _deliver(self, events: List[Dict[str, Any]]) -> bool:
+        return notifier.deliver(events, channel=self.channel, smtp_pool=self.smtp_pool, webhook=self.webhook)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Entrega lo pendiente (con plazo) y libera hilos y conexiones."""
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Se descartan %d alertas pendientes al cerrar", self.queue.qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            # QUIT también es E/S bloqueante: fuera del loop
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.smtp_pool.close)
+            self._executor.shutdown(wait=False)
+        else:
+            self.smtp_pool.close()
+        self.webhook.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "sent": self.sent,
+            "messages": self.messages,
+            "failed": self.failed,
+            "smtp_connections": self.smtp_pool.opened,
+            "webhook": self.webhook.stats(),
+            "queue": self.queue.stats(),
+        }
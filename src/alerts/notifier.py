@@ -1,57 +1,141 @@
 import logging
-import smtplib
-from email.mime.text import MIMEText
-from typing import Dict
-from src.config.settings import ALERT_CHANNEL
+from typing import Dict, List, Optional, Sequence
+from src.config import settings
 
 # Configuración del logger
 logger = logging.getLogger("Notifier")
-logger.setLevel(logging.INFO)
-handler = logging.StreamHandler()
-formatter = logging.Formatter("[%(asctime)s] %(levelname)s - %(name)s - %(message)s")
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+
+# Dispatcher asíncrono activo (src.alerts.dispatcher); None = envío directo
+_dispatcher = None
+# Supresión de repetidas (src.alerts.suppression); None = se envían todas
+_suppressor = None
+# Cliente webhook del envío directo; se crea en el primer uso
+_webhook = None
+
+
+def set_dispatcher(dispatcher) -> None:
+    """Activa (o desactiva con None) el envío en segundo plano."""
+    global _dispatcher
+    _dispatcher = dispatcher
+
+
+def set_suppressor(suppressor) -> None:
+    """Activa (o desactiva con None) la supresión de alertas repetidas."""
+    global _suppressor
+    _suppressor = suppressor
+
+
+def alert_event(service: str, result: Dict, alert_type: str, message: str,
+                severity: Optional[str] = None) -> Dict:
+    """Evento de alerta estándar a partir del resultado de un análisis."""
+    event = {
+        "service": service,
+        "type": alert_type,
+        "sample_id": result.get("sample_id"),
+        "message": message,
+        "details": result,
+    }
+    if severity is not None:
+        event["severity"] = severity
+    return event
+
 
 def send_alert(event: Dict[str, str]):
     """
     Envía una alerta según el canal configurado (email, webhook, log).
+    Con un dispatcher activo solo se encola y nunca bloquea el event loop.
     """
-    try:
-        if ALERT_CHANNEL == "email":
-            _send_email(event)
-        elif ALERT_CHANNEL == "webhook":
-            _send_webhook(event)
-        elif ALERT_CHANNEL == "log":
-            logger.warning(f"[ALERTA] Evento crítico: {event}")
+    events = [event]
+    if _suppressor is not None:
+        event = _suppressor.check(event)
+        # Los recuentos de claves expulsadas salen antes de perderse
+        events = _suppressor.take_evicted()
+        if event is not None:
+            events.append(event)
+    for event in events:
+        if _dispatcher is not None:
+            _dispatcher.submit(event)
         else:
-            logger.error(f"Canal de alerta no soportado: {ALERT_CHANNEL}")
-    except Exception as e:
-        logger.error(f"Error al enviar alerta: {e}")
+            deliver([event])
+
 
-def _send_email(event: Dict[str, str]):
+def deliver(events: Sequence[Dict[str, str]], channel: Optional[str] = None, smtp_pool=None,
+            webhook=None) -> bool:
     """
-    Envía alerta por correo electrónico (simulación).
+    Entrega uno o varios eventos (varios = resumen) por el canal indicado o
+    el configurado. Devuelve False si el envío falló.
     """
+    channel = channel or settings.ALERT_CHANNEL
     try:
-        msg = MIMEText(f"Se ha detectado un evento crítico:\n{event}")
+        if channel == "email":
+            _send_email(events, smtp_pool)
+        elif channel == "webhook":
+            _send_webhook(events, webhook)
+        elif channel == "log":
+            for event in events:
+                logger.warning("[ALERTA] Evento crítico: %s", event)
+        else:
+            logger.error("Canal de alerta no soportado: %s", channel)
+            return False
+        return True
+    except Exception as e:
+        logger.error("Error al enviar alerta: %s", e)
+        return False
+
+
+def build_email(events: Sequence[Dict[str, str]]):
+    """Un evento genera un correo normal; varios, un resumen con todos."""
+    from email.mime.text import MIMEText
+
+    if len(events) == 1:
+        msg = MIMEText(f"Se ha detectado un evento crítico:\n{events[0]}")
         msg["Subject"] = "Alerta crítica - Sistema Umbrella"
-        msg["From"] = "alertas@umbrella.com"
-        msg["To"] = "destinatario@umbrella.com"
+    else:
+        lines = "\n".join(f"- {event}" for event in events)
+        msg = MIMEText(f"Se han detectado {len(events)} eventos críticos:\n{lines}")
+        msg["Subject"] = f"Resumen de {len(events)} alertas - Sistema Umbrella"
+    msg["From"] = settings.ALERT_EMAIL_FROM
+    msg["To"] = settings.ALERT_EMAIL_TO
+    return msg
+
 
-        # Simulación de envío (en producción usar credenciales seguras)
-        with smtplib.SMTP("localhost") as server:
+def _send_email(events: Sequence[Dict[str, str]], smtp_pool=None):
+    """
+    Envía alerta por correo electrónico. Con 'smtp_pool' reutiliza una
+    conexión persistente; sin él abre una conexión por envío.
+    """
+    msg = build_email(events)
+    if smtp_pool is not None:
+        smtp_pool.send(msg)
+    else:
+        # smtplib solo se carga si realmente se envía un correo
+        import smtplib
+
+        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT) as server:
             server.send_message(msg)
+    logger.info("Alerta enviada por email (%d eventos)", len(events))
 
-        logger.info(f"Alerta enviada por email: {event}")
-    except Exception as e:
-        logger.error(f"Error al enviar email: {e}")
 
-def _send_webhook(event: Dict[str, str]):
+def _send_webhook(events: Sequence[Dict[str, str]], webhook=None):
     """
-    Envía alerta a un webhook (simulación).
+    Envía el lote en un único POST JSON. Si el endpoint no responde o el
+    circuito está abierto, las alertas salen por el canal log.
     """
+    from src.alerts.webhook import CircuitOpenError, WebhookClient, WebhookError
+
+    global _webhook
+    if webhook is None:
+        if _webhook is None or _webhook.url != settings.WEBHOOK_URL:
+            _webhook = WebhookClient(settings.WEBHOOK_URL)
+        webhook = _webhook
+    if not webhook.configured:
+        logger.info("Alerta enviada a webhook (simulación, sin WEBHOOK_URL): %s", list(events))
+        return
     try:
-        # Aquí iría la lógica real con requests.post(url, json=event)
-        logger.info(f"Alerta enviada a webhook: {event}")
-    except Exception as e:
-        logger.error(f"Error al enviar webhook: {e}")
\ No newline at end of file
+        webhook.post(events)
+        logger.info("Alerta enviada a webhook (%d eventos)", len(events))
+    except CircuitOpenError:
+        deliver(events, "log")
+    except WebhookError as e:
+        logger.error("Error al enviar webhook: %s", e)
+        deliver(events, "log")
@@ -0,0 +1,106 @@
+"""
+suppression.py
+Supresión de alertas repetidas: índice LRU/TTL por (servicio, muestra, tipo)
+con periodos de enfriamiento y memoria acotada.
+"""
+import collections
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from src.config.settings import ALERT_COOLDOWN_SECONDS, ALERT_COOLDOWNS, ALERT_SUPPRESSION_MAX_ENTRIES
+
+AlertKey = Tuple[Hashable, Hashable, Hashable]
+
+
+class AlertSuppressor:
+    """
+    Deja pasar la primera alerta de cada clave y suprime las repetidas hasta
+    que vence su enfriamiento. Las suprimidas se cuentan y el recuento viaja
+    en la siguiente alerta que sale ("suppressed"). Como mucho 'max_entries'
+    claves: al llenarse se expulsan primero las caducadas y después la
+    menos usada; si esta tenía suprimidas pendientes, su recuento sale en un
+    evento resumen que se recoge con take_evicted().
+    """
+
+    def __init__(self, cooldowns: Optional[Dict[str, float]] = None,
+                 default_cooldown: float = ALERT_COOLDOWN_SECONDS,
+                 max_entries: int = ALERT_SUPPRESSION_MAX_ENTRIES,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_entries <= 0:
+            raise ValueError("max_entries debe ser mayor que 0")
+        self.cooldowns = ALERT_COOLDOWNS if cooldowns is None else cooldowns
+        self.default_cooldown = default_cooldown
+        self.max_entries = max_entries
+        self.clock = clock
+        # clave -> [instante del último envío, suprimidas desde entonces]
+        self._entries: "collections.OrderedDict[AlertKey, list]" = collections.OrderedDict()
+        # Resúmenes de claves expulsadas con suprimidas pendientes
+        self._evicted_events: List[Dict[str, Any]] = []
+        self.passed = 0
+        self.suppressed = 0
+        self.evicted = 0
+
+    @staticmethod
+    def key(event: Dict[str, Any]) -> AlertKey:
+        return event.get("service"), event.get("sample_id"), event.get("type")
+
+    def cooldown(self, alert_type: Any) -> float:
+        return self.cooldowns.get(alert_type, self.default_cooldown)
+
+    def check(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Devuelve el evento a enviar (con el recuento plegado) o None si se suprime."""
+        key = self.key(event)
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.cooldown(key[2]):
+            entry[1] += 1
+            self._entries.move_to_end(key)
+            self.suppressed += 1
+            return None
+
+        self.passed += 1
+        if entry is not None:
+            pending = entry[1]
+            entry[0], entry[1] = now, 0
+            self._entries.move_to_end(key)
+            if pending:
+                event = {**event, "suppressed": pending}
+        else:
+            if len(self._entries) >= self.max_entries:
+                self._evict(now)
+            self._entries[key] = [now, 0]
+        return event
+
+    def _evict(self, now: float) -> None:
+        # Las menos usadas están al principio: se retiran las caducadas sin
+        # suprimidas pendientes y, si no basta, la menos usada
+        while self._entries:
+            key, (sent_at, pending) = next(iter(self._entries.items()))
+            if pending or now - sent_at < self.cooldown(key[2]):
+                break
+            del self._entries[key]
+        if len(self._entries) >= self.max_entries:
+            (service, sample_id, alert_type), (_, pending) = self._entries.popitem(last=False)
+            self.evicted += 1
+            if pending:
+                self._evicted_events.append({
+                    "service": service, "sample_id": sample_id, "type": alert_type,
+                    "message": f"{pending} alertas suprimidas sin enviar (clave expulsada)",
+                    "suppressed": pending,
+                })
+
+    def take_evicted(self) -> List[Dict[str, Any]]:
+        """Devuelve y vacía los resúmenes de las claves expulsadas con suprimidas."""
+        events, self._evicted_events = self._evicted_events, []
+        return events
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "passed": self.passed,
+            "suppressed": self.suppressed,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,204 @@
+"""
+webhook.py
+Canal webhook: lotes JSON por POST sobre conexiones HTTP keep-alive,
+reintentos con backoff exponencial y jitter, y circuit breaker.
+"""
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+from urllib.parse import urlsplit
+
+from src.config.settings import (
+    WEBHOOK_BACKOFF_BASE,
+    WEBHOOK_BACKOFF_MAX,
+    WEBHOOK_BREAKER_RESET,
+    WEBHOOK_BREAKER_THRESHOLD,
+    WEBHOOK_MAX_RETRIES,
+    WEBHOOK_POOL_SIZE,
+    WEBHOOK_TIMEOUT,
+    WEBHOOK_URL,
+)
+
+logger = logging.getLogger("Webhook")
+
+# Respuestas que merecen reintento; el resto de 4xx es un error del lote
+RETRY_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class WebhookError(Exception):
+    """El endpoint rechazó el lote o no respondió tras los reintentos."""
+
+
+class CircuitOpenError(WebhookError):
+    """El circuito está abierto: no se intenta el envío."""
+
+
+class CircuitBreaker:
+    """
+    Tras 'failure_threshold' fallos seguidos el circuito se abre durante
+    'reset_timeout' segundos. Pasado ese tiempo deja pasar una única prueba
+    (half_open): si sale bien se cierra, si falla vuelve a abrirse.
+    """
+
+    def __init__(self, failure_threshold: int = WEBHOOK_BREAKER_THRESHOLD,
+                 reset_timeout: float = WEBHOOK_BREAKER_RESET, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                    logger.warning("Circuito del webhook abierto tras %d fallos", self.failures)
+                self.state = "open"
+                self.opened_at = self.clock()
+
+
+class WebhookClient:
+    """
+    Cliente HTTP(S) con hasta 'size' conexiones persistentes reutilizadas
+    entre hilos. Cada llamada a post() envía un lote como un único JSON.
+    """
+
+    def __init__(self, url: str = WEBHOOK_URL, size: int = WEBHOOK_POOL_SIZE, timeout: float = WEBHOOK_TIMEOUT,
+                 max_retries: int = WEBHOOK_MAX_RETRIES, backoff_base: float = WEBHOOK_BACKOFF_BASE,
+                 backoff_max: float = WEBHOOK_BACKOFF_MAX, breaker: Optional[CircuitBreaker] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.url = url
+        self.size = size
+        parts = urlsplit(url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path or "/"
+        if parts.query:
+            self.path += "?" + parts.query
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.sleep = sleep
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.opened = 0
+        self.posts = 0
+        self.retries = 0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.host)
+
+    def _connect(self):
+        import http.client
+
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        self.opened += 1
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def backoff(self, attempt: int) -> float:
+        """Backoff exponencial con jitter completo."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def post(self, events: Sequence[Dict[str, Any]]) -> None:
+        import http.client
+
+        if not self.breaker.allow():
+            raise CircuitOpenError("Circuito del webhook abierto")
+        body = json.dumps({"alerts": list(events)}, default=str).encode("utf-8")
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.retries += 1
+                self.sleep(self.backoff(attempt - 1))
+            try:
+                status = self._post_once(body)
+            except (OSError, http.client.HTTPException) as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if status < 300:
+                    self.posts += 1
+                    self.breaker.record_success()
+                    return
+                error = f"HTTP {status}"
+                if status < 500 and status not in RETRY_STATUS:
+                    # El endpoint responde y rechaza nuestro lote: no es un fallo del servicio
+                    self.breaker.record_success()
+                    raise WebhookError(f"Webhook rechazó el lote: {error}")
+                if status not in RETRY_STATUS:
+                    break
+            logger.debug("Intento %d del webhook fallido: %s", attempt + 1, error)
+        self.breaker.record_failure()
+        raise WebhookError(f"Webhook no disponible: {error}")
+
+    def _post_once(self, body: bytes) -> int:
+        with self._slots:
+            try:
+                conn, reused = self._idle.get_nowait(), True
+            except queue.Empty:
+                conn, reused = self._connect(), False
+            try:
+                try:
+                    response = self._request(conn, body)
+                except ConnectionError:
+                    if not reused:
+                        raise
+                    # Keep-alive cerrada por el servidor mientras estaba inactiva
+                    conn.close()
+                    conn = self._connect()
+                    response = self._request(conn, body)
+            except Exception:
+                conn.close()
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                self._idle.put(conn)
+            return response.status
+
+    def _request(self, conn, body: bytes):
+        conn.request("POST", self.path, body, {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        response.read()
+        return response
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "posts": self.posts,
+            "retries": self.retries,
+            "connections": self.opened,
+            "breaker": self.breaker.state,
+            "trips": self.breaker.trips,
+        }
@@ -0,0 +1,269 @@
+"""
+rules.py
+Tabla declarativa de reglas de rango (RULES_FILE, por defecto
+src/config/rules.json). Cada regla indica flujo, campo, límites, severidad y
+mensaje; las que llevan 'alert' se evalúan en el análisis y generan una
+alerta de ese tipo, el resto son validaciones de plausibilidad del
+normalizador. Las reglas de cada flujo se compilan una vez en un predicado
+vectorizado que evalúa todas las reglas sobre un lote en una sola pasada.
+
+La tabla se recarga en caliente cuando cambia el fichero. Cada tabla se
+identifica por la huella de su contenido; los workers reciben la huella con
+cada lote y recargan el fichero si no coincide, sin reiniciar el pool.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.config.settings import RULES_FILE, RULES_RELOAD_SECONDS
+from src.utils.record_batch import SCHEMAS, SEQUENCE, STRING
+
+logger = logging.getLogger("Rules")
+
+SEVERITIES = {
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+
+class Rule:
+    """Una regla de la tabla: el valor de 'field' debe estar en [low, high]."""
+    __slots__ = ("name", "stream", "field", "low", "high", "severity", "message", "alert")
+
+    def __init__(self, name: str, stream: str, field: str, low: float, high: float,
+                 severity: str, message: str, alert: Optional[str] = None):
+        self.name = name
+        self.stream = stream
+        self.field = field
+        self.low = low
+        self.high = high
+        self.severity = severity
+        self.message = message
+        self.alert = alert
+
+    @property
+    def level(self) -> int:
+        return SEVERITIES[self.severity]
+
+    def __repr__(self) -> str:
+        return f"Rule({self.stream}.{self.name}: {self.field} en [{self.low}, {self.high}])"
+
+
+class RuleSet:
+    """
+    Reglas compiladas de un flujo: índice de columna, mínimos y máximos en
+    arrays, de modo que violations() compara el lote entero contra todas las
+    reglas con una sola operación de NumPy en lugar de ramas por registro.
+    """
+
+    def __init__(self, stream: str, rules: Sequence[Rule]):
+        self.stream = stream
+        self.rules: Tuple[Rule, ...] = tuple(rules)
+        self.fields: Tuple[str, ...] = tuple(dict.fromkeys(rule.field for rule in self.rules))
+        self.by_field: Dict[str, np.ndarray] = {
+            field: np.array([i for i, rule in enumerate(self.rules) if rule.field == field], dtype=np.intp)
+            for field in self.fields
+        }
+        self._index = np.array([self.fields.index(rule.field) for rule in self.rules], dtype=np.intp)
+        self._low = np.array([rule.low for rule in self.rules], dtype=np.float64)
+        self._high = np.array([rule.high for rule in self.rules], dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __iter__(self) -> Iterator[Rule]:
+        return iter(self.rules)
+
+    def violations(self, columns: Mapping[str, Any]) -> np.ndarray:
+        """
+        Matriz booleana (filas x reglas): True donde el valor queda fuera de
+        los límites de la regla. Un NaN no incumple ninguna regla (la
+        conversión fallida se informa aparte).
+        """
+        if not self.rules:
+            rows = len(next(iter(columns.values()))) if columns else 0
+            return np.zeros((rows, 0), dtype=bool)
+        values = np.column_stack([np.asarray(columns[field], dtype=np.float64) for field in self.fields])
+        picked = values[:, self._index]
+        return (picked < self._low) | (picked > self._high)
+
+    def flags(self, columns: Mapping[str, Any]) -> Dict[str, List[bool]]:
+        """Resultado de violations() como listas por nombre de regla (para construir resultados)."""
+        matrix = self.violations(columns)
+        return {rule.name: matrix[:, i].tolist() for i, rule in enumerate(self.rules)}
+
+    def check(self, record: Mapping[str, Any]) -> List[Rule]:
+        """Reglas que incumple un único registro (camino escalar, sin NumPy)."""
+        broken = []
+        for rule in self.rules:
+            value = record.get(rule.field)
+            if value is not None and (value < rule.low or value > rule.high):
+                broken.append(rule)
+        return broken
+
+    def fired(self, result: Mapping[str, Any]) -> List[Rule]:
+        """Reglas de alerta activas en un resultado; una por tipo de alerta."""
+        fired: Dict[str, Rule] = {}
+        for rule in self.rules:
+            if result.get(rule.name) and rule.alert not in fired:
+                fired[rule.alert] = rule
+        return list(fired.values())
+
+
+class RuleTable:
+    """Tabla completa ya validada, con un RuleSet por flujo y etapa."""
+
+    def __init__(self, rules: Sequence[Rule], digest: str = ""):
+        self.rules: Tuple[Rule, ...] = tuple(rules)
+        self.digest = digest
+        self._validation = {
+            stream: RuleSet(stream, [r for r in self.rules if r.stream == stream and not r.alert])
+            for stream in SCHEMAS
+        }
+        self._alerts = {
+            stream: RuleSet(stream, [r for r in self.rules if r.stream == stream and r.alert])
+            for stream in SCHEMAS
+        }
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def validation(self, stream: str) -> RuleSet:
+        """Reglas de plausibilidad que aplica el normalizador."""
+        return self._validation.get(stream) or RuleSet(stream, ())
+
+    def alerts(self, stream: str) -> RuleSet:
+        """Reglas que el análisis convierte en alertas."""
+        return self._alerts.get(stream) or RuleSet(stream, ())
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], digest: str = "") -> "RuleTable":
+        if not isinstance(data, Mapping) or not isinstance(data.get("rules"), list):
+            raise ValueError("La tabla de reglas debe ser un objeto con una lista 'rules'")
+        rules = [_parse_rule(i, spec) for i, spec in enumerate(data["rules"])]
+        seen = set()
+        for rule in rules:
+            if (rule.stream, rule.name) in seen:
+                raise ValueError(f"Regla duplicada: {rule.stream}.{rule.name}")
+            seen.add((rule.stream, rule.name))
+        return cls(rules, digest)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "RuleTable":
+        raw = Path(path).read_bytes()
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON inválido: {e}") from e
+        return cls.from_dict(data, hashlib.sha1(raw).hexdigest())
+
+
+def _parse_rule(index: int, spec: Any) -> Rule:
+    if not isinstance(spec, Mapping):
+        raise ValueError(f"Regla {index}: debe ser un objeto")
+    stream = spec.get("stream")
+    if stream not in SCHEMAS:
+        raise ValueError(f"Regla {index}: flujo no soportado: {stream!r}")
+    schema = dict(SCHEMAS[stream])
+    field = spec.get("field")
+    if schema.get(field) in (None, STRING, SEQUENCE):
+        raise ValueError(f"Regla {index}: {field!r} no es un campo numérico de {stream}")
+    name = spec.get("name")
+    if not isinstance(name, str) or not name or name in schema:
+        raise ValueError(f"Regla {index}: nombre inválido: {name!r}")
+    low = -math.inf if spec.get("min") is None else spec["min"]
+    high = math.inf if spec.get("max") is None else spec["max"]
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (low, high)) or low > high:
+        raise ValueError(f"Regla {index}: límites inválidos [{spec.get('min')}, {spec.get('max')}]")
+    severity = spec.get("severity", "warning")
+    if severity not in SEVERITIES:
+        raise ValueError(f"Regla {index}: severidad no soportada: {severity!r}")
+    message = spec.get("message")
+    if not isinstance(message, str) or not message:
+        raise ValueError(f"Regla {index}: falta el mensaje")
+    alert = spec.get("alert")
+    if alert is not None and (not isinstance(alert, str) or not alert):
+        raise ValueError(f"Regla {index}: tipo de alerta inválido: {alert!r}")
+    return Rule(name, stream, field, float(low), float(high), severity, message, alert)
+
+
+# Tabla vigente del proceso ------------------------------------------------
+
+_lock = threading.Lock()
+_table: Optional[RuleTable] = None
+_stamp: Optional[Tuple[str, int, int]] = None
+
+
+def _file_stamp(path: Union[str, Path]) -> Tuple[str, int, int]:
+    st = os.stat(path)
+    return str(path), st.st_mtime_ns, st.st_size
+
+
+def current() -> RuleTable:
+    """Tabla vigente; la primera llamada la carga de RULES_FILE (un error aquí es fatal)."""
+    global _table, _stamp
+    if _table is None:
+        with _lock:
+            if _table is None:
+                _stamp = _file_stamp(RULES_FILE)
+                _table = RuleTable.load(RULES_FILE)
+                logger.debug("Tabla de reglas cargada: %d reglas (huella %s)", len(_table), _table.digest[:12])
+    return _table
+
+
+def reload(path: Union[str, Path] = RULES_FILE, force: bool = False) -> bool:
+    """
+    Recarga la tabla si el fichero cambió (o siempre, con 'force'). Una
+    tabla inválida se descarta y sigue vigente la anterior. Devuelve True si
+    la tabla vigente cambió.
+    """
+    global _table, _stamp
+    with _lock:
+        try:
+            stamp = _file_stamp(path)
+            if not force and stamp == _stamp:
+                return False
+            table = RuleTable.load(path)
+        except (OSError, ValueError) as e:
+            logger.error("No se pudo recargar la tabla de reglas %s: %s; se mantiene la anterior", path, e)
+            return False
+        _stamp = stamp
+        if _table is not None and table.digest == _table.digest:
+            return False
+        _table = table
+    logger.info("Tabla de reglas recargada: %d reglas (huella %s)", len(table), table.digest[:12])
+    return True
+
+
+def ensure(digest: Optional[str]) -> RuleTable:
+    """
+    Usada por los workers: si la huella del lote no es la de su tabla,
+    recarga el fichero. Si entretanto cambió otra vez se queda con la más
+    reciente; el proceso principal la alcanzará en su siguiente sondeo.
+    """
+    table = current()
+    if digest is None or digest == table.digest:
+        return table
+    reload(force=True)
+    table = current()
+    if table.digest != digest:
+        logger.debug("Huella de reglas %s no disponible; se usa %s", digest[:12], table.digest[:12])
+    return table
+
+
+async def watch_rules(interval: float = RULES_RELOAD_SECONDS, path: Union[str, Path] = RULES_FILE) -> None:
+    """Sondea el fichero de reglas cada 'interval' segundos y lo recarga si cambió."""
+    current()
+    while True:
+        await asyncio.sleep(interval)
+        reload(path)
@@ -1,4 +1,5 @@
 # src/config/settings.py
+import json
 import os
 from pathlib import Path
 # Base directory
@@ -15,21 +16,216 @@ DATA_SOURCES = {
     "fisico": os.getenv("FISICO_SOURCE", "stream/fisico"),
 }
 
-# Parámetros de procesamiento
+# Parámetros de procesamiento (MAX_WORKERS: lotes en vuelo simultáneos)
 MAX_WORKERS = int(os.getenv("MAX_WORKERS", 4))
 PROCESS_POOL_SIZE = int(os.getenv("PROCESS_POOL_SIZE", 2))
 THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", 4))
 
+# E/S de ficheros (pool de THREAD_POOL_SIZE hilos): bloque de lectura/escritura,
+# tamaño a partir del cual se lee con mmap y búfer de los escritores agrupados
+IO_CHUNK_BYTES = int(os.getenv("IO_CHUNK_BYTES", 1024 * 1024))
+IO_MMAP_THRESHOLD = int(os.getenv("IO_MMAP_THRESHOLD", 64 * 1024 * 1024))
+IO_WRITE_BUFFER = int(os.getenv("IO_WRITE_BUFFER", 1024 * 1024))
+
+# Multiplicación de matrices: bloque de la versión en Python puro, tesela de
+# la versión paralela y tamaño a partir del cual "auto" reparte entre procesos
+MATMUL_BLOCK = int(os.getenv("MATMUL_BLOCK", 64))
+MATMUL_TILE = int(os.getenv("MATMUL_TILE", 512))
+MATMUL_PARALLEL_MIN = int(os.getenv("MATMUL_PARALLEL_MIN", 2048))
+
+# Criba de primos: números por segmento (la mitad en bytes, solo impares) y
+# tamaño del tramo nuevo a partir del cual los segmentos se reparten entre procesos
+SIEVE_SEGMENT = int(os.getenv("SIEVE_SEGMENT", 1 << 21))
+SIEVE_PARALLEL_MIN = int(os.getenv("SIEVE_PARALLEL_MIN", 20_000_000))
+
+# Factorial: factoriales guardados como punto de partida (0 = sin caché) y
+# número de factores a partir del cual el producto se reparte entre procesos
+FACTORIAL_CACHE_SIZE = int(os.getenv("FACTORIAL_CACHE_SIZE", 16))
+FACTORIAL_PARALLEL_MIN = int(os.getenv("FACTORIAL_PARALLEL_MIN", 200_000))
+
+# Llamadas de red: concurrencia global y por host, plazo por llamada y global
+# (segundos; 0 = sin plazo global) y conexiones inactivas por host
+NETWORK_MAX_CONCURRENCY = int(os.getenv("NETWORK_MAX_CONCURRENCY", 100))
+NETWORK_PER_HOST_LIMIT = int(os.getenv("NETWORK_PER_HOST_LIMIT", 10))
+NETWORK_CALL_TIMEOUT = float(os.getenv("NETWORK_CALL_TIMEOUT", 10))
+NETWORK_DEADLINE = float(os.getenv("NETWORK_DEADLINE", 0))
+NETWORK_POOL_MAX_IDLE = int(os.getenv("NETWORK_POOL_MAX_IDLE", 10))
+
+# Colas por flujo: tamaño máximo, política de desbordamiento y ritmo de ingesta
+QUEUE_MAXSIZE = {
+    "genetico": int(os.getenv("GENETICO_QUEUE_MAXSIZE", 1000)),
+    "bioquimico": int(os.getenv("BIOQUIMICO_QUEUE_MAXSIZE", 1000)),
+    "fisico": int(os.getenv("FISICO_QUEUE_MAXSIZE", 1000)),
+}
+QUEUE_POLICY = os.getenv("QUEUE_POLICY", "block")  # block, drop_oldest, drop_newest, sample
+QUEUE_SAMPLE_N = int(os.getenv("QUEUE_SAMPLE_N", 10))
+INGEST_INTERVAL = {
+    "genetico": float(os.getenv("GENETICO_INGEST_INTERVAL", 0.1)),
+    "bioquimico": float(os.getenv("BIOQUIMICO_INGEST_INTERVAL", 0.2)),
+    "fisico": float(os.getenv("FISICO_INGEST_INTERVAL", 0.3)),
+}
+
+# Fuentes: tamaño de bloque de lectura (texto en bytes, binario en registros)
+# y ritmo: live (INGEST_INTERVAL), fast (replay a máxima velocidad) o rate (REPLAY_RATE muestras/s)
+SOURCE_CHUNK_BYTES = int(os.getenv("SOURCE_CHUNK_BYTES", 1024 * 1024))
+SOURCE_CHUNK_RECORDS = int(os.getenv("SOURCE_CHUNK_RECORDS", 4096))
+REPLAY_MODE = os.getenv("REPLAY_MODE", "live")
+REPLAY_RATE = float(os.getenv("REPLAY_RATE", 0))
+
+# Fuente sintética (DATA_SOURCES = "synthetic"): semilla, proporción de
+# lecturas anómalas, nº de sample_id distintos, longitud de las secuencias,
+# registros por flujo (0: infinito) y distribución normal (media, desviación)
+# de cada campo numérico. El ritmo lo fijan REPLAY_MODE y REPLAY_RATE.
+SYNTHETIC_SEED = int(os.getenv("SYNTHETIC_SEED", 0))
+SYNTHETIC_ANOMALY_RATIO = float(os.getenv("SYNTHETIC_ANOMALY_RATIO", 0.01))
+SYNTHETIC_SAMPLES = int(os.getenv("SYNTHETIC_SAMPLES", 1000))
+SYNTHETIC_SEQUENCE_LENGTH = int(os.getenv("SYNTHETIC_SEQUENCE_LENGTH", 200))
+SYNTHETIC_LIMIT = int(os.getenv("SYNTHETIC_LIMIT", 0))
+SYNTHETIC_DISTRIBUTIONS = {
+    "genetico": {"quality": (0.95, 0.02)},
+    "bioquimico": {"ph": (7.4, 0.08), "enzyme_activity": (120.0, 8.0)},
+    "fisico": {"temperature": (36.7, 0.3), "pressure": (101.3, 1.0)},
+}
+
+# Enrutado de ejecución: adaptive, inline, thread o process
+EXECUTION_MODE = os.getenv("EXECUTION_MODE", "adaptive")
+ROUTER_HYSTERESIS = float(os.getenv("ROUTER_HYSTERESIS", 0.2))
+ROUTER_PATIENCE = int(os.getenv("ROUTER_PATIENCE", 5))
+
+# Pipeline: concurrencia por etapa y plazo de drenado al apagar (segundos)
+STAGE_CONCURRENCY = {
+    "ingest": int(os.getenv("INGEST_CONCURRENCY", 1)),
+    "analyze": int(os.getenv("ANALYZE_CONCURRENCY", 2)),
+    "handle": int(os.getenv("HANDLE_CONCURRENCY", 1)),
+}
+SHUTDOWN_DEADLINE = float(os.getenv("SHUTDOWN_DEADLINE", 10))
+
+# Micro-lotes: máximo de muestras por lote y espera máxima antes de despachar
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", 64))
+BATCH_LINGER_MS = float(os.getenv("BATCH_LINGER_MS", 20))
+
+# Panel de motivos/mutaciones del análisis genético: nombre -> motivo o lista
+# de variantes (A/C/G/T). MOTIF_PANEL_FILE apunta a un JSON con el mismo formato.
+DEFAULT_MOTIF_PANEL = {
+    "TP53_R175H": "GTGAGGCACTGC",
+    "TP53_R248Q": "ATGAACCAGAGG",
+    "TP53_R273H": "GCACAAACACGC",
+    "KRAS_G12D": "GTTGGAGCTGATGG",
+    "BRAF_V600E": "GCTACAGAGAAATC",
+    "EGFR_L858R": "GATCACAGATTTTGGGCGGG",
+}
+
+
+def _load_motif_panel(path: str) -> dict:
+    """Lee y valida el JSON de MOTIF_PANEL_FILE (se carga al importar este módulo)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            panel = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"MOTIF_PANEL_FILE no se puede cargar ({path}): {e}") from e
+    if not isinstance(panel, dict) or not panel:
+        raise ValueError(f"MOTIF_PANEL_FILE debe contener un objeto JSON no vacío: {path}")
+    for name, motifs in panel.items():
+        variants = [motifs] if isinstance(motifs, str) else motifs
+        if not isinstance(variants, list) or not variants or not all(
+                isinstance(motif, str) and motif and not set(motif.upper()) - set("ACGT") for motif in variants):
+            raise ValueError(f"MOTIF_PANEL_FILE: motivo inválido en {name}: {motifs!r} (solo A/C/G/T)")
+    return panel
+
+
+MOTIF_PANEL_FILE = os.getenv("MOTIF_PANEL_FILE", "")
+MOTIF_PANEL = _load_motif_panel(MOTIF_PANEL_FILE) if MOTIF_PANEL_FILE else DEFAULT_MOTIF_PANEL
+# Buscar también la cadena complementaria inversa de cada motivo
+MOTIF_BOTH_STRANDS = os.getenv("MOTIF_BOTH_STRANDS", "true").lower() == "true"
+# Bases por carril del escáner: las secuencias largas se trocean en carriles
+# que se recorren a la vez con NumPy
+MOTIF_SCAN_WINDOW = int(os.getenv("MOTIF_SCAN_WINDOW", 256))
+
+# Parámetros de análisis por flujo (los workers los cargan una vez al arrancar).
+# Los límites de rango de bioquímico y físico viven en la tabla de reglas.
+ANALYSIS_THRESHOLDS = {
+    "genetico": {"panel": MOTIF_PANEL},
+}
+
+# Tabla declarativa de reglas de rango (validación en el normalizador y
+# alertas en el análisis); se recarga en caliente cuando cambia el fichero
+RULES_FILE = os.getenv("RULES_FILE", str(BASE_DIR / "config" / "rules.json"))
+RULES_RELOAD_SECONDS = float(os.getenv("RULES_RELOAD_SECONDS", 5))  # 0: sin recarga
+
+# Detección por muestra con estadísticas EWMA: peso de cada lectura, umbral de
+# z-score, lecturas antes de evaluar alarmas, tamaño y caducidad del almacén
+ROLLING_ALPHA = float(os.getenv("ROLLING_ALPHA", 0.1))
+ROLLING_Z_THRESHOLD = float(os.getenv("ROLLING_Z_THRESHOLD", 4.0))
+ROLLING_WARMUP = int(os.getenv("ROLLING_WARMUP", 10))
+ROLLING_MAX_ENTRIES = int(os.getenv("ROLLING_MAX_ENTRIES", 100_000))
+ROLLING_TTL_SECONDS = float(os.getenv("ROLLING_TTL_SECONDS", 3600))  # 0: sin caducidad
+# Campos vigilados por flujo: cambio máximo entre lecturas consecutivas y
+# suelo de la desviación típica (en las unidades del campo)
+ROLLING_FIELDS = {
+    "bioquimico": {
+        "ph": {"max_step": 0.5, "min_std": 0.02},
+        "enzyme_activity": {"max_step": 50.0, "min_std": 1.0},
+    },
+    "fisico": {
+        "temperature": {"max_step": 1.5, "min_std": 0.1},
+        "pressure": {"max_step": 5.0, "min_std": 0.5},
+    },
+}
+# Snapshots de las líneas base (vacío: sin persistencia) y periodo de guardado
+ROLLING_SNAPSHOT_DIR = os.getenv("ROLLING_SNAPSHOT_DIR", "")
+ROLLING_SNAPSHOT_SECONDS = float(os.getenv("ROLLING_SNAPSHOT_SECONDS", 60))
+
+# Tamaño del buffer circular en memoria compartida para transportar lotes
+SHM_RING_BYTES = int(os.getenv("SHM_RING_BYTES", 16 * 1024 * 1024))
+
 # Alertas
 CRITICAL_THRESHOLD = float(os.getenv("CRITICAL_THRESHOLD", 0.9))
 ALERT_CHANNEL = os.getenv("ALERT_CHANNEL", "email")  # email, webhook, etc.
+ALERT_QUEUE_SIZE = int(os.getenv("ALERT_QUEUE_SIZE", 1000))
+ALERT_DIGEST_SECONDS = float(os.getenv("ALERT_DIGEST_SECONDS", 0))  # 0: un mensaje por alerta
+ALERT_EMAIL_FROM = os.getenv("ALERT_EMAIL_FROM", "alertas@umbrella.com")
+ALERT_EMAIL_TO = os.getenv("ALERT_EMAIL_TO", "destinatario@umbrella.com")
+# Enfriamiento por (servicio, muestra, tipo de alerta), en segundos
+ALERT_COOLDOWN_SECONDS = float(os.getenv("ALERT_COOLDOWN_SECONDS", 60))
+ALERT_COOLDOWNS = {
+    "mutacion": float(os.getenv("MUTACION_ALERT_COOLDOWN", ALERT_COOLDOWN_SECONDS)),
+    "anomalia": float(os.getenv("ANOMALIA_ALERT_COOLDOWN", ALERT_COOLDOWN_SECONDS)),
+    "fuera_de_rango": float(os.getenv("FUERA_DE_RANGO_ALERT_COOLDOWN", ALERT_COOLDOWN_SECONDS)),
+    "desviacion": float(os.getenv("DESVIACION_ALERT_COOLDOWN", ALERT_COOLDOWN_SECONDS)),
+}
+ALERT_SUPPRESSION_MAX_ENTRIES = int(os.getenv("ALERT_SUPPRESSION_MAX_ENTRIES", 10000))
+# Webhook: lotes JSON por POST, reintentos con backoff y circuit breaker
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")  # vacío: solo se registra en el log
+WEBHOOK_POOL_SIZE = int(os.getenv("WEBHOOK_POOL_SIZE", 2))
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", 50))
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", 5))
+WEBHOOK_MAX_RETRIES = int(os.getenv("WEBHOOK_MAX_RETRIES", 3))
+WEBHOOK_BACKOFF_BASE = float(os.getenv("WEBHOOK_BACKOFF_BASE", 0.2))
+WEBHOOK_BACKOFF_MAX = float(os.getenv("WEBHOOK_BACKOFF_MAX", 5))
+WEBHOOK_BREAKER_THRESHOLD = int(os.getenv("WEBHOOK_BREAKER_THRESHOLD", 5))
+WEBHOOK_BREAKER_RESET = float(os.getenv("WEBHOOK_BREAKER_RESET", 30))
+SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 25))
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", 2))
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 10))
 
 # Métricas
 METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
 METRICS_INTERVAL = int(os.getenv("METRICS_INTERVAL", 10))  # segundos
+METRICS_LOG_ENABLED = os.getenv("METRICS_LOG_ENABLED", "true").lower() == "true"
+METRICS_LOG_SEGMENT_BYTES = int(os.getenv("METRICS_LOG_SEGMENT_BYTES", 64 * 1024 * 1024))
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Líneas INFO/DEBUG por muestra: 1 de cada N y máximo por segundo y logger (0 = sin límite)
+LOG_SAMPLE_N = int(os.getenv("LOG_SAMPLE_N", 100))
+LOG_RATE_LIMIT = float(os.getenv("LOG_RATE_LIMIT", 0))
 LOG_DIR = BASE_DIR / "logs"
+METRICS_LOG_DIR = Path(os.getenv("METRICS_LOG_DIR", LOG_DIR / "metrics"))
+# Trazas por etapa: fracción de registros trazados (0 = desactivado), últimas
+# trazas conservadas y fichero en formato Chrome que se escribe al terminar
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", 0))
+TRACE_MAX_SAMPLES = int(os.getenv("TRACE_MAX_SAMPLES", 20000))
+TRACE_FILE = Path(os.getenv("TRACE_FILE", LOG_DIR / "trace.json"))
 
 # Otros
 TIMEZONE = os.getenv("TIMEZONE", "UTC")
@@ -50,15 +246,219 @@ def validate_settings():
     if THREAD_POOL_SIZE <= 0:
         errors.append("THREAD_POOL_SIZE debe ser mayor que 0")
 
+    if IO_CHUNK_BYTES <= 0:
+        errors.append("IO_CHUNK_BYTES debe ser mayor que 0")
+
+    if IO_MMAP_THRESHOLD < 0:
+        errors.append("IO_MMAP_THRESHOLD no puede ser negativo")
+
+    if IO_WRITE_BUFFER <= 0:
+        errors.append("IO_WRITE_BUFFER debe ser mayor que 0")
+
+    if MATMUL_BLOCK <= 0:
+        errors.append("MATMUL_BLOCK debe ser mayor que 0")
+
+    if MATMUL_TILE <= 0:
+        errors.append("MATMUL_TILE debe ser mayor que 0")
+
+    if MATMUL_PARALLEL_MIN <= 0:
+        errors.append("MATMUL_PARALLEL_MIN debe ser mayor que 0")
+
+    if not isinstance(MOTIF_PANEL, dict) or not MOTIF_PANEL:
+        errors.append("MOTIF_PANEL debe ser un diccionario no vacío")
+    else:
+        for name, motifs in MOTIF_PANEL.items():
+            for motif in [motifs] if isinstance(motifs, str) else motifs:
+                if not motif or set(motif.upper()) - set("ACGT"):
+                    errors.append(f"Motivo inválido en {name}: {motif!r} (solo A/C/G/T)")
+
+    if not Path(RULES_FILE).is_file():
+        errors.append(f"RULES_FILE no existe: {RULES_FILE}")
+
+    if RULES_RELOAD_SECONDS < 0:
+        errors.append("RULES_RELOAD_SECONDS no puede ser negativo")
+
+    if not (0.0 < ROLLING_ALPHA <= 1.0):
+        errors.append("ROLLING_ALPHA debe estar en (0, 1]")
+
+    if ROLLING_Z_THRESHOLD <= 0:
+        errors.append("ROLLING_Z_THRESHOLD debe ser mayor que 0")
+
+    if ROLLING_WARMUP < 0:
+        errors.append("ROLLING_WARMUP no puede ser negativo")
+
+    if ROLLING_MAX_ENTRIES <= 0:
+        errors.append("ROLLING_MAX_ENTRIES debe ser mayor que 0")
+
+    if ROLLING_TTL_SECONDS < 0:
+        errors.append("ROLLING_TTL_SECONDS no puede ser negativo")
+
+    if ROLLING_SNAPSHOT_SECONDS <= 0:
+        errors.append("ROLLING_SNAPSHOT_SECONDS debe ser mayor que 0")
+
+    if MOTIF_SCAN_WINDOW <= 0:
+        errors.append("MOTIF_SCAN_WINDOW debe ser mayor que 0")
+
+    if SIEVE_SEGMENT <= 0:
+        errors.append("SIEVE_SEGMENT debe ser mayor que 0")
+
+    if SIEVE_PARALLEL_MIN <= 0:
+        errors.append("SIEVE_PARALLEL_MIN debe ser mayor que 0")
+
+    if FACTORIAL_CACHE_SIZE < 0:
+        errors.append("FACTORIAL_CACHE_SIZE no puede ser negativo")
+
+    if FACTORIAL_PARALLEL_MIN <= 0:
+        errors.append("FACTORIAL_PARALLEL_MIN debe ser mayor que 0")
+
+    if NETWORK_MAX_CONCURRENCY <= 0:
+        errors.append("NETWORK_MAX_CONCURRENCY debe ser mayor que 0")
+
+    if NETWORK_PER_HOST_LIMIT <= 0:
+        errors.append("NETWORK_PER_HOST_LIMIT debe ser mayor que 0")
+
+    if NETWORK_CALL_TIMEOUT <= 0:
+        errors.append("NETWORK_CALL_TIMEOUT debe ser mayor que 0")
+
+    if NETWORK_DEADLINE < 0:
+        errors.append("NETWORK_DEADLINE no puede ser negativo")
+
+    if NETWORK_POOL_MAX_IDLE < 0:
+        errors.append("NETWORK_POOL_MAX_IDLE no puede ser negativo")
+
+    if EXECUTION_MODE not in ["adaptive", "inline", "thread", "process"]:
+        errors.append(f"EXECUTION_MODE no soportado: {EXECUTION_MODE}")
+
+    if not (0.0 <= ROUTER_HYSTERESIS < 1.0):
+        errors.append("ROUTER_HYSTERESIS debe estar entre 0.0 y 1.0")
+
+    if ROUTER_PATIENCE <= 0:
+        errors.append("ROUTER_PATIENCE debe ser mayor que 0")
+
+    for stage, concurrency in STAGE_CONCURRENCY.items():
+        if concurrency <= 0:
+            errors.append(f"Concurrencia inválida para la etapa {stage}: {concurrency}")
+
+    if SHUTDOWN_DEADLINE <= 0:
+        errors.append("SHUTDOWN_DEADLINE debe ser mayor que 0")
+
+    if BATCH_SIZE <= 0:
+        errors.append("BATCH_SIZE debe ser mayor que 0")
+
+    if BATCH_LINGER_MS < 0:
+        errors.append("BATCH_LINGER_MS no puede ser negativo")
+
+    for stream, size in QUEUE_MAXSIZE.items():
+        if size <= 0:
+            errors.append(f"Tamaño de cola inválido para {stream}: {size}")
+
+    if QUEUE_POLICY not in ["block", "drop_oldest", "drop_newest", "sample"]:
+        errors.append(f"QUEUE_POLICY no soportada: {QUEUE_POLICY}")
+
+    if QUEUE_SAMPLE_N <= 0:
+        errors.append("QUEUE_SAMPLE_N debe ser mayor que 0")
+
+    for stream, interval in INGEST_INTERVAL.items():
+        if interval < 0:
+            errors.append(f"Intervalo de ingesta negativo para {stream}: {interval}")
+
+    if SOURCE_CHUNK_BYTES <= 0:
+        errors.append("SOURCE_CHUNK_BYTES debe ser mayor que 0")
+
+    if SOURCE_CHUNK_RECORDS <= 0:
+        errors.append("SOURCE_CHUNK_RECORDS debe ser mayor que 0")
+
+    if REPLAY_MODE not in ["live", "fast", "rate"]:
+        errors.append(f"REPLAY_MODE no soportado: {REPLAY_MODE}")
+
+    if REPLAY_MODE == "rate" and REPLAY_RATE <= 0:
+        errors.append("REPLAY_RATE debe ser mayor que 0 con REPLAY_MODE=rate")
+
+    if not (0.0 <= SYNTHETIC_ANOMALY_RATIO <= 1.0):
+        errors.append("SYNTHETIC_ANOMALY_RATIO debe estar en [0, 1]")
+
+    if SYNTHETIC_SAMPLES <= 0:
+        errors.append("SYNTHETIC_SAMPLES debe ser mayor que 0")
+
+    if SYNTHETIC_SEQUENCE_LENGTH <= 0:
+        errors.append("SYNTHETIC_SEQUENCE_LENGTH debe ser mayor que 0")
+
+    if SYNTHETIC_LIMIT < 0:
+        errors.append("SYNTHETIC_LIMIT no puede ser negativo")
+
+    if SHM_RING_BYTES < 0:
+        errors.append("SHM_RING_BYTES no puede ser negativo")
+
     if not (0.0 <= CRITICAL_THRESHOLD <= 1.0):
         errors.append("CRITICAL_THRESHOLD debe estar entre 0.0 y 1.0")
 
     if ALERT_CHANNEL not in ["email", "webhook", "log"]:
         errors.append(f"ALERT_CHANNEL no soportado: {ALERT_CHANNEL}")
 
+    if ALERT_QUEUE_SIZE <= 0:
+        errors.append("ALERT_QUEUE_SIZE debe ser mayor que 0")
+
+    if ALERT_DIGEST_SECONDS < 0:
+        errors.append("ALERT_DIGEST_SECONDS no puede ser negativo")
+
+    for alert_type, cooldown in ALERT_COOLDOWNS.items():
+        if cooldown < 0:
+            errors.append(f"Enfriamiento negativo para alertas {alert_type}: {cooldown}")
+
+    if ALERT_SUPPRESSION_MAX_ENTRIES <= 0:
+        errors.append("ALERT_SUPPRESSION_MAX_ENTRIES debe ser mayor que 0")
+
+    if WEBHOOK_URL and not WEBHOOK_URL.startswith(("http://", "https://")):
+        errors.append(f"WEBHOOK_URL debe empezar por http:// o https://: {WEBHOOK_URL}")
+
+    if WEBHOOK_POOL_SIZE <= 0:
+        errors.append("WEBHOOK_POOL_SIZE debe ser mayor que 0")
+
+    if WEBHOOK_BATCH_SIZE <= 0:
+        errors.append("WEBHOOK_BATCH_SIZE debe ser mayor que 0")
+
+    if WEBHOOK_TIMEOUT <= 0:
+        errors.append("WEBHOOK_TIMEOUT debe ser mayor que 0")
+
+    if WEBHOOK_MAX_RETRIES < 0:
+        errors.append("WEBHOOK_MAX_RETRIES no puede ser negativo")
+
+    if WEBHOOK_BACKOFF_BASE < 0 or WEBHOOK_BACKOFF_MAX < WEBHOOK_BACKOFF_BASE:
+        errors.append("WEBHOOK_BACKOFF_BASE debe ser >= 0 y no mayor que WEBHOOK_BACKOFF_MAX")
+
+    if WEBHOOK_BREAKER_THRESHOLD <= 0:
+        errors.append("WEBHOOK_BREAKER_THRESHOLD debe ser mayor que 0")
+
+    if WEBHOOK_BREAKER_RESET <= 0:
+        errors.append("WEBHOOK_BREAKER_RESET debe ser mayor que 0")
+
+    if SMTP_POOL_SIZE <= 0:
+        errors.append("SMTP_POOL_SIZE debe ser mayor que 0")
+
+    if SMTP_TIMEOUT <= 0:
+        errors.append("SMTP_TIMEOUT debe ser mayor que 0")
+
     if METRICS_INTERVAL <= 0:
         errors.append("METRICS_INTERVAL debe ser mayor que 0")
 
+    if METRICS_LOG_SEGMENT_BYTES <= 0:
+        errors.append("METRICS_LOG_SEGMENT_BYTES debe ser mayor que 0")
+
+    if LOG_LEVEL not in ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]:
+        errors.append(f"LOG_LEVEL no soportado: {LOG_LEVEL}")
+
+    if LOG_SAMPLE_N <= 0:
+        errors.append("LOG_SAMPLE_N debe ser mayor que 0")
+
+    if LOG_RATE_LIMIT < 0:
+        errors.append("LOG_RATE_LIMIT no puede ser negativo")
+
+    if not 0 <= TRACE_SAMPLE_RATE <= 1:
+        errors.append("TRACE_SAMPLE_RATE debe estar entre 0 y 1")
+
+    if TRACE_MAX_SAMPLES <= 0:
+        errors.append("TRACE_MAX_SAMPLES debe ser mayor que 0")
+
     if errors:
         raise ValueError("Errores en configuración:\n" + "\n".join(errors))
 
@@ -1,86 +1,150 @@
 import asyncio
 import logging
 import time
-from concurrent.futures import ProcessPoolExecutor
-import pandas as pd
-import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict
 
 from src.services.genetico_service import GeneticoService
 from src.services.bioquimico_service import BioquimicoService
 from src.services.fisico_service import FisicoService
-from src.config.settings import DATA_SOURCES, PROCESS_POOL_SIZE
+from src.config.settings import DATA_SOURCES, PROCESS_POOL_SIZE, SHM_RING_BYTES, METRICS_ENABLED
+from src.config.settings import METRICS_LOG_ENABLED, METRICS_LOG_DIR, METRICS_LOG_SEGMENT_BYTES
+from src.config.settings import MAX_WORKERS, THREAD_POOL_SIZE, EXECUTION_MODE, ROUTER_HYSTERESIS, ROUTER_PATIENCE
+from src.config.settings import ROLLING_SNAPSHOT_DIR, ROLLING_SNAPSHOT_SECONDS, RULES_FILE, RULES_RELOAD_SECONDS
+from src.config.settings import TRACE_FILE, TRACE_SAMPLE_RATE
+from src.config import rules
 from src.processing.orchestrator import run_orchestration
+from src.processing.io_bound import shutdown_io_executor
+from src.processing.process_pool import shutdown_process_executor
+from src.processing.rolling_stats import persist_periodically
+from src.processing.workers import WorkerPool
+from src.processing.router import ExecutionRouter
+from src.metrics.monitor import MetricsMonitor
+from src.metrics.event_log import MetricsEventLog
+from src.metrics.tracing import Tracer
+from src.alerts import notifier
+from src.alerts.dispatcher import AlertDispatcher
+from src.alerts.suppression import AlertSuppressor
+from src.utils.log_setup import setup_logging
+
+
+def result_status(data_type: str, result: Dict[str, Any]) -> str:
+    """ALERT si el resultado dispara alguna alerta: motivo del panel en genético, regla de alerta en el resto."""
+    if data_type == "genetico":
+        return "ALERT" if result.get("mutation_detected") else "OK"
+    return "ALERT" if rules.current().alerts(data_type).fired(result) else "OK"
 
-# Configuración de logging
-logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s - %(message)s")
-
-# Clase para métricas
-class MetricsMonitor:
-    def __init__(self):
-        self.records = []
-
-    def log_event(self, service_name: str, latency: float, status: str):
-        self.records.append({"service": service_name, "latency": latency, "status": status})
-
-    def to_dataframe(self):
-        return pd.DataFrame(self.records)
-
-metrics_monitor = MetricsMonitor()
 
 async def main():
+    # Eventos al registro binario; las gráficas se generan offline con src.metrics.report
+    event_log = MetricsEventLog(METRICS_LOG_DIR, METRICS_LOG_SEGMENT_BYTES) if METRICS_LOG_ENABLED else None
+    metrics_monitor = MetricsMonitor(event_log=event_log)
+
     genetico_service = GeneticoService(DATA_SOURCES["genetico"])
     bioquimico_service = BioquimicoService(DATA_SOURCES["bioquimico"])
     fisico_service = FisicoService(DATA_SOURCES["fisico"])
 
-    process_pool = ProcessPoolExecutor(max_workers=PROCESS_POOL_SIZE)
-
-    async def process_with_executor(service, data):
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(process_pool, service.analyze, data)
-
-    async def process_data(service):
-        while True:
-            data = await service.queue.get()
-            start = time.perf_counter()
-            result = await process_with_executor(service, data)
-            latency = time.perf_counter() - start
-            status = "ALERT" if "alert" in str(result).lower() else "OK"
-            metrics_monitor.log_event(service.__class__.__name__, latency, status)
-            service.handle_result(result)
-            service.queue.task_done()
-
-    tasks = [
-        asyncio.create_task(genetico_service.ingest_data()),
-        asyncio.create_task(process_data(genetico_service)),
-        asyncio.create_task(bioquimico_service.ingest_data()),
-        asyncio.create_task(process_data(bioquimico_service)),
-        asyncio.create_task(fisico_service.ingest_data()),
-        asyncio.create_task(process_data(fisico_service)),
-        asyncio.create_task(run_orchestration())
-    ]
-
-    await asyncio.gather(*tasks)
-
-    # Visualización de métricas
-    df = metrics_monitor.to_dataframe()
-    logging.info("\nMétricas registradas:\n%s", df)
-
-    # Gráfico de barras: latencia promedio por servicio
-    avg_latency = df.groupby("service")["latency"].mean()
-    avg_latency.plot(kind="bar", title="Latencia promedio por servicio", color="skyblue")
-    plt.ylabel("Segundos")
-    plt.tight_layout()
-    plt.savefig("avg_latency.png")
-
-    # Gráfico de pastel: distribución de estados
-    status_counts = df["status"].value_counts()
-    status_counts.plot(kind="pie", autopct="%1.1f%%", title="Distribución de estados")
-    plt.ylabel("")
-    plt.tight_layout()
-    plt.savefig("status_distribution.png")
+    # Workers persistentes: el lote viaja por memoria compartida, no el servicio
+    worker_pool = WorkerPool(PROCESS_POOL_SIZE, SHM_RING_BYTES)
+    await worker_pool.warm_up()
+
+    thread_pool = ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE)
+    router = ExecutionRouter(worker_pool, thread_pool, mode=EXECUTION_MODE, max_in_flight=MAX_WORKERS,
+                             hysteresis=ROUTER_HYSTERESIS, patience=ROUTER_PATIENCE)
+
+    async def process_batch(service, batch):
+        start = time.perf_counter()
+        results = await router.run(batch)
+        # Coste por muestra: el tiempo del lote repartido entre sus resultados
+        latency = (time.perf_counter() - start) / max(len(results), 1)
+        for result in results:
+            metrics_monitor.log_event(service.__class__.__name__, latency, result_status(service.data_type, result))
+        return results
+
+    # Las alertas se encolan desde el loop y se envían desde hilos propios
+    alert_dispatcher = AlertDispatcher()
+    alert_dispatcher.start()
+    notifier.set_dispatcher(alert_dispatcher)
+    # Las fuentes repiten sample_id: solo sale una alerta por clave y enfriamiento
+    alert_suppressor = AlertSuppressor()
+    notifier.set_suppressor(alert_suppressor)
+
+    services = [genetico_service, bioquimico_service, fisico_service]
+    for service in services:
+        metrics_monitor.register_gauge(f"queue.{service.data_type}", service.queue.stats)
+    metrics_monitor.register_gauge("router", router.stats)
+    metrics_monitor.register_gauge("alerts", alert_dispatcher.stats)
+    metrics_monitor.register_gauge("alerts.suppression", alert_suppressor.stats)
+
+    # Trazas por etapa de una fracción de las muestras: qué tramo explica la latencia
+    tracer = Tracer(TRACE_SAMPLE_RATE) if TRACE_SAMPLE_RATE > 0 else None
+    if tracer is not None:
+        metrics_monitor.register_gauge("tracing", tracer.stats)
+
+    # Líneas base EWMA por muestra: se restauran del último snapshot y se guardan periódicamente
+    detectors = {s.data_type: s.detector for s in services if getattr(s, "detector", None) is not None}
+    snapshot_paths = {}
+    snapshot_tasks = []
+    for data_type, detector in detectors.items():
+        metrics_monitor.register_gauge(f"rolling.{data_type}", detector.stats)
+        if ROLLING_SNAPSHOT_DIR:
+            path = Path(ROLLING_SNAPSHOT_DIR) / f"{data_type}.json"
+            snapshot_paths[data_type] = path
+            logging.info("Líneas base de %s restauradas: %d", data_type, detector.load(path))
+            snapshot_tasks.append(asyncio.create_task(
+                persist_periodically(detector, path, ROLLING_SNAPSHOT_SECONDS)))
+    publisher = asyncio.create_task(metrics_monitor.run()) if METRICS_ENABLED else None
+
+    # Tabla de reglas: se sondea el fichero y los workers se ponen al día por huella
+    logging.info("Tabla de reglas %s: %d reglas", RULES_FILE, len(rules.current()))
+    rules_watcher = asyncio.create_task(rules.watch_rules(RULES_RELOAD_SECONDS)) if RULES_RELOAD_SECONDS else None
+
+    try:
+        # Ingesta → análisis (normalizado por lotes) → manejo, con drenado ordenado ante SIGTERM
+        await run_orchestration(services, process_batch, tracer=tracer)
+    finally:
+        # Las trazas se exportan primero: si la orquestación falló es cuando más se necesitan
+        if tracer is not None:
+            try:
+                logging.info("Tramos de latencia (ms): %s", tracer.summary())
+                tracer.export(TRACE_FILE)
+            except (OSError, TypeError, ValueError) as e:
+                logging.error("No se pudieron exportar las trazas a %s: %s", TRACE_FILE, e)
+        if publisher:
+            publisher.cancel()
+        if rules_watcher:
+            rules_watcher.cancel()
+        for task in snapshot_tasks:
+            task.cancel()
+        for data_type, path in snapshot_paths.items():
+            try:
+                detectors[data_type].save(path)
+            except OSError as e:
+                logging.error("No se pudo guardar el snapshot de estadísticas en %s: %s", path, e)
+        logging.info("Rutas de ejecución: %s", router.stats())
+        notifier.set_suppressor(None)
+        notifier.set_dispatcher(None)
+        await alert_dispatcher.stop()
+        logging.info("Alertas: %s, supresión: %s", alert_dispatcher.stats(), alert_suppressor.stats())
+        thread_pool.shutdown(wait=True)
+        shutdown_io_executor()
+        shutdown_process_executor()
+        worker_pool.shutdown()
+        # El registro de eventos se vacía y se cierra también si la orquestación falla
+        totals = metrics_monitor.snapshot()["totals"]
+        metrics_monitor.close()
+
+    logging.info("\nMétricas registradas:\n%s", totals)
+    if event_log is not None:
+        logging.info("Informe y gráficas: python -m src.metrics.report %s", METRICS_LOG_DIR)
 
 if __name__ == "__main__":
+    # Un único QueueHandler; la escritura a stderr ocurre en el hilo del listener
+    log_listener = setup_logging()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        logging.info("Sistema detenido manualmente.")
\ No newline at end of file
+        logging.info("Sistema detenido manualmente.")
+    finally:
+        log_listener.stop()
\ No newline at end of file
@@ -1,4 +1,8 @@
 """
 Módulo de métricas y monitorización.
 """
-from .monitor import MetricsMonitor
\ No newline at end of file
+from src._lazy import install
+
+_LAZY = {"MetricsMonitor": ".monitor", "Tracer": ".tracing"}
+
+install(globals(), _LAZY)
@@ -0,0 +1,125 @@
+"""
+event_log.py
+Registro binario de eventos de métricas: registros de tamaño fijo en
+segmentos de solo-anexado, rotados por tamaño y legibles con mmap.
+"""
+import json
+import logging
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger("MetricsEventLog")
+
+# timestamp (s), latencia (s), id de servicio, id de estado; 24 bytes por registro
+RECORD = struct.Struct("<ddBB6x")
+EVENT_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("latency", "<f8"),
+    ("service", "u1"),
+    ("status", "u1"),
+    ("_pad", "V6"),
+])
+assert EVENT_DTYPE.itemsize == RECORD.size
+
+SEGMENT_PATTERN = "metrics-{:06d}.bin"
+LABELS_FILE = "labels.json"
+
+
+class MetricsEventLog:
+    """
+    Escritor del registro. Acumula eventos en memoria y los vuelca en bloque
+    ('flush_bytes'); al superar 'segment_bytes' abre un segmento nuevo.
+    Los nombres de servicio y estado se guardan como ids en labels.json.
+    """
+
+    def __init__(self, directory: Union[str, Path], segment_bytes: int = 64 * 1024 * 1024,
+                 flush_bytes: int = 64 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = max(segment_bytes - segment_bytes % RECORD.size, RECORD.size)
+        self.flush_bytes = flush_bytes
+        self.labels = load_labels(self.directory)
+        self._ids = {kind: {name: i for i, name in enumerate(names)} for kind, names in self.labels.items()}
+        self._buffer = bytearray()
+        segments = list_segments(self.directory)
+        self._segment_index = int(segments[-1].stem.split("-")[1]) if segments else 0
+        self._file = open(self._segment_path(), "ab")
+        self._written = self._file.tell()
+
+    def _segment_path(self) -> Path:
+        return self.directory / SEGMENT_PATTERN.format(self._segment_index)
+
+    def _label_id(self, kind: str, name: str) -> int:
+        ids = self._ids[kind]
+        label_id = ids.get(name)
+        if label_id is None:
+            if len(ids) >= 256:
+                raise ValueError(f"Demasiadas etiquetas de tipo {kind} para el registro binario")
+            label_id = ids[name] = len(ids)
+            self.labels[kind].append(name)
+            self._save_labels()
+        return label_id
+
+    def _save_labels(self) -> None:
+        tmp = self.directory / (LABELS_FILE + ".tmp")
+        tmp.write_text(json.dumps(self.labels))
+        os.replace(tmp, self.directory / LABELS_FILE)
+
+    def append(self, service: str, latency: float, status: str, timestamp: Optional[float] = None) -> None:
+        self._buffer += RECORD.pack(
+            time.time() if timestamp is None else timestamp,
+            latency,
+            self._label_id("services", service),
+            self._label_id("statuses", status),
+        )
+        if len(self._buffer) >= self.flush_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        pos = 0
+        while pos < len(self._buffer):
+            room = self.segment_bytes - self._written
+            if room <= 0:
+                self._rotate()
+                continue
+            end = min(len(self._buffer), pos + room)
+            self._file.write(self._buffer[pos:end])
+            self._written += end - pos
+            pos = end
+        self._buffer.clear()
+        self._file.flush()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._segment_index += 1
+        self._file = open(self._segment_path(), "ab")
+        self._written = 0
+        logger.info("Nuevo segmento de métricas: %s", self._segment_path().name)
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+
+def list_segments(directory: Union[str, Path]) -> List[Path]:
+    return sorted(Path(directory).glob("metrics-*.bin"))
+
+
+def load_labels(directory: Union[str, Path]) -> Dict[str, List[str]]:
+    path = Path(directory) / LABELS_FILE
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"services": [], "statuses": []}
+
+
+def map_segment(path: Union[str, Path]) -> np.ndarray:
+    """Proyecta un segmento en memoria como array estructurado de solo lectura."""
+    size = os.path.getsize(path) // RECORD.size
+    if size == 0:
+        return np.empty(0, dtype=EVENT_DTYPE)
+    return np.memmap(path, dtype=EVENT_DTYPE, mode="r", shape=(size,))
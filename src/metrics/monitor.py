@@ -1,68 +1,193 @@
+"""
+monitor.py
+Agregador de métricas en memoria constante: contadores por servicio,
+distribución de estados e histograma logarítmico de latencias (estilo HDR)
+para p50/p95/p99, con publicación de ventanas cada METRICS_INTERVAL segundos.
+"""
 import asyncio
+import collections
 import logging
+import math
 import time
-from typing import Dict, Any
-from src.utils.normalizer import normalize_data
-from src.metrics.monitor import MetricsMonitor
-from src.alerts.notifier import send_alert
-
-# Configuración del logger
-logger = logging.getLogger("GeneticoService")
-logger.setLevel(logging.INFO)
-handler = logging.StreamHandler()
-formatter = logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s")
-handler.setFormatter(formatter)
-logger.addHandler(handler)
-
-class GeneticoService:
-    def __init__(self, source: str):
-        self.source = source
-        self.queue = asyncio.Queue()
-        self.monitor = MetricsMonitor()
-        logger.info(f"GeneticoService inicializado con fuente: {self.source}")
-
-    async def ingest_data(self):
-        while True:
-            raw_data = await self.fetch_from_source()
-            normalized = normalize_data(raw_data, data_type="genetico")
-            await self.queue.put(normalized)
-            logger.info(f"Datos normalizados en cola: {normalized['sample_id']}")
-            await asyncio.sleep(0.1)
+from typing import Any, Callable, Dict, List, Optional
 
-    async def fetch_from_source(self) -> Dict[str, Any]:
-        return {"sample_id": "G123", "sequence": "ATCGTTAG", "quality": 0.98}
+from src.config.settings import METRICS_INTERVAL
+
+logger = logging.getLogger("MetricsMonitor")
+
+PERCENTILES = (50.0, 95.0, 99.0)
+
+
+class LatencyHistogram:
+    """
+    Histograma de buckets logarítmicos de ancho relativo fijo ('precision').
+    Memoria constante: el número de buckets depende solo del rango y la
+    precisión, nunca del número de muestras.
+    """
+    __slots__ = ("min_value", "max_value", "precision", "_log_base", "counts", "count", "total", "max_seen")
+
+    def __init__(self, min_value: float = 1e-6, max_value: float = 100.0, precision: float = 0.01):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.counts = [0] * (self._index(max_value) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max_seen = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_base) + 1
+
+    def _value(self, index: int) -> float:
+        if index == 0:
+            return self.min_value
+        # Punto medio geométrico del bucket
+        return self.min_value * math.exp((index - 0.5) * self._log_base)
+
+    def record(self, value: float) -> None:
+        index = min(self._index(value), len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max_seen:
+            self.max_seen = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for i, n in enumerate(other.counts):
+            if n:
+                self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max_seen = max(self.max_seen, other.max_seen)
+
+    def percentiles(self, quantiles=PERCENTILES) -> Dict[str, float]:
+        result = {f"p{q:g}": 0.0 for q in quantiles}
+        if not self.count:
+            return result
+        targets = sorted((max(1, math.ceil(q / 100.0 * self.count)), f"p{q:g}") for q in quantiles)
+        seen = 0
+        pending = iter(targets)
+        target, label = next(pending)
+        for index, n in enumerate(self.counts):
+            if not n:
+                continue
+            seen += n
+            while seen >= target:
+                result[label] = min(self._value(index), self.max_seen)
+                try:
+                    target, label = next(pending)
+                except StopIteration:
+                    return result
+        return result
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class ServiceStats:
+    """Contadores y latencias de un servicio."""
+    __slots__ = ("count", "statuses", "latency")
 
-    async def process_data(self):
-        while True:
-            data = await self.queue.get()
-            start_time = time.perf_counter()
-            result = self.analyze(data)
-            self.handle_result(result)
-            latency_ms = (time.perf_counter() - start_time) * 1000
-            self.monitor.record_event("GeneticoService", latency_ms, "OK" if result["confidence"] > 0.9 else "NORMAL")
-            self.queue.task_done()
-
-    def analyze(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        return {"sample_id": data["sample_id"], "mutation_detected": "TP53", "confidence": 0.95}
-
-    def handle_result(self, result: Dict[str, Any]):
-        if result["confidence"] > 0.9:
-            send_alert({
-                "sample_id": result["sample_id"],
-                "mutation": result["mutation_detected"],
-                "confidence": result["confidence"],
-                "message": "Mutación crítica detectada"
-            })
-        else:
-            logger.info(f"Resultado no crítico: {result}")
-    class MetricsMonitor:
     def __init__(self):
-        self.records = []
+        self.count = 0
+        self.statuses: Dict[str, int] = collections.Counter()
+        self.latency = LatencyHistogram()
+
+    def record(self, latency: float, status: str) -> None:
+        self.count += 1
+        self.statuses[status] += 1
+        self.latency.record(latency)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "statuses": dict(self.statuses),
+            "mean": self.latency.mean,
+            "max": self.latency.max_seen,
+            **self.latency.percentiles(),
+        }
+
+
+class MetricsMonitor:
+    """
+    Agregador de eventos por servicio. Mantiene un acumulado total y una
+    ventana que se reinicia en cada publicación; la memoria no crece con el
+    número de eventos registrados. Con 'event_log' cada evento se anexa
+    además al registro binario para el informe offline (src.metrics.report).
+    """
+
+    def __init__(self, interval: float = METRICS_INTERVAL, event_log=None):
+        self.interval = interval
+        self.event_log = event_log
+        self.totals: Dict[str, ServiceStats] = collections.defaultdict(ServiceStats)
+        self.window: Dict[str, ServiceStats] = collections.defaultdict(ServiceStats)
+        self.window_started = time.monotonic()
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+        self._subscribers: List[Callable[[Dict[str, Any]], None]] = []
 
-    def log_event(self, service_name: str, latency: float, status: str):
-        self.records.append({"service": service_name, "latency": latency, "status": status})
+    def log_event(self, service_name: str, latency: float, status: str) -> None:
+        self.totals[service_name].record(latency, status)
+        self.window[service_name].record(latency, status)
+        if self.event_log is not None:
+            self.event_log.append(service_name, latency, status)
 
-    def to_dataframe(self):
-        import pandas as pd
-        return pd.DataFrame(self.records)
-    
\ No newline at end of file
+    def register_gauge(self, name: str, func: Callable[[], Any]) -> None:
+        """Registra un valor que se lee en cada snapshot (colas, rutas, etapas...)."""
+        self._gauges[name] = func
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        self._subscribers.append(callback)
+
+    def snapshot(self, reset_window: bool = False) -> Dict[str, Any]:
+        now = time.monotonic()
+        elapsed = now - self.window_started
+        window = {
+            name: {**stats.summary(), "throughput": stats.count / elapsed if elapsed else 0.0}
+            for name, stats in self.window.items()
+        }
+        snapshot = {
+            "window_seconds": elapsed,
+            "window": window,
+            "totals": {name: stats.summary() for name, stats in self.totals.items()},
+            "gauges": {},
+        }
+        for name, func in self._gauges.items():
+            try:
+                snapshot["gauges"][name] = func()
+            except Exception as e:
+                logger.error("Error al leer la métrica %s: %s", name, e)
+        if reset_window:
+            self.window = collections.defaultdict(ServiceStats)
+            self.window_started = now
+        return snapshot
+
+    def publish(self) -> Dict[str, Any]:
+        """Cierra la ventana actual y la entrega a los suscriptores."""
+        snapshot = self.snapshot(reset_window=True)
+        if self.event_log is not None:
+            self.event_log.flush()
+        for name, stats in snapshot["window"].items():
+            logger.info("%s: %d eventos (%.1f/s) p50=%.2fms p95=%.2fms p99=%.2fms estados=%s",
+                        name, stats["count"], stats["throughput"], stats["p50"] * 1000,
+                        stats["p95"] * 1000, stats["p99"] * 1000, stats["statuses"])
+        for callback in self._subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error("Error en suscriptor de métricas: %s", e)
+        return snapshot
+
+    def close(self) -> None:
+        if self.event_log is not None:
+            self.event_log.close()
+
+    async def run(self, interval: Optional[float] = None) -> None:
+        """Publica una ventana cada 'interval' segundos hasta ser cancelado."""
+        interval = interval or self.interval
+        while True:
+            await asyncio.sleep(interval)
+            self.publish()
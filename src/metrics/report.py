@@ -0,0 +1,137 @@
+"""
+report.py
+Informe offline a partir del registro binario de métricas. Proyecta cada
+segmento con mmap, agrega por servicio con lecturas vectorizadas y genera
+las gráficas de latencia promedio y distribución de estados.
+
+Uso: python -m src.metrics.report [directorio] [--out DIRECTORIO]
+"""
+import argparse
+import logging
+import math
+from pathlib import Path
+from typing import Any, Dict, Union
+
+import numpy as np
+
+from src.config.settings import METRICS_LOG_DIR
+from src.metrics.event_log import list_segments, load_labels, map_segment
+from src.metrics.monitor import LatencyHistogram, PERCENTILES
+from src.utils.log_setup import setup_logging
+
+logger = logging.getLogger("MetricsReport")
+
+
+def aggregate(directory: Union[str, Path]) -> Dict[str, Dict[str, Any]]:
+    """
+    Recorre todos los segmentos y devuelve, por servicio, número de eventos,
+    latencia media/máxima, percentiles y conteo de estados. La memoria usada
+    no depende del tamaño total del registro: cada segmento se agrega y se
+    libera antes de pasar al siguiente.
+    """
+    labels = load_labels(directory)
+    n_services = len(labels["services"])
+    n_statuses = len(labels["statuses"])
+    template = LatencyHistogram()
+    n_buckets = len(template.counts)
+
+    counts = np.zeros(n_services, dtype=np.int64)
+    sums = np.zeros(n_services, dtype=np.float64)
+    maxima = np.zeros(n_services, dtype=np.float64)
+    statuses = np.zeros((n_services, n_statuses), dtype=np.int64)
+    buckets = np.zeros((n_services, n_buckets), dtype=np.int64)
+
+    for path in list_segments(directory):
+        events = map_segment(path)
+        if not events.size:
+            continue
+        service = events["service"].astype(np.intp)
+        latency = np.asarray(events["latency"])
+        counts += np.bincount(service, minlength=n_services)
+        sums += np.bincount(service, weights=latency, minlength=n_services)
+        np.maximum.at(maxima, service, latency)
+        statuses += np.bincount(service * n_statuses + events["status"],
+                                minlength=n_services * n_statuses).reshape(n_services, n_statuses)
+        buckets += np.bincount(service * n_buckets + _bucket_index(latency, template),
+                               minlength=n_services * n_buckets).reshape(n_services, n_buckets)
+        del events
+
+    report = {}
+    for i, name in enumerate(labels["services"]):
+        if not counts[i]:
+            continue
+        histogram = LatencyHistogram()
+        histogram.counts = buckets[i].tolist()
+        histogram.count = int(counts[i])
+        histogram.total = float(sums[i])
+        histogram.max_seen = float(maxima[i])
+        report[name] = {
+            "count": int(counts[i]),
+            "mean": histogram.mean,
+            "max": histogram.max_seen,
+            **histogram.percentiles(PERCENTILES),
+            "statuses": {status: int(n) for status, n in zip(labels["statuses"], statuses[i]) if n},
+        }
+    return report
+
+
+def _bucket_index(latency: np.ndarray, histogram: LatencyHistogram) -> np.ndarray:
+    """Versión vectorizada de LatencyHistogram._index."""
+    safe = np.maximum(latency, histogram.min_value)
+    index = np.floor(np.log(safe / histogram.min_value) / math.log1p(histogram.precision)).astype(np.intp) + 1
+    index[latency <= histogram.min_value] = 0
+    return np.minimum(index, len(histogram.counts) - 1)
+
+
+def plot(report: Dict[str, Dict[str, Any]], out_dir: Union[str, Path]) -> None:
+    """Genera avg_latency.png y status_distribution.png."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # Gráfico de barras: latencia promedio por servicio
+    plt.figure()
+    avg_latency = pd.Series({name: stats["mean"] for name, stats in report.items()})
+    avg_latency.plot(kind="bar", title="Latencia promedio por servicio", color="skyblue")
+    plt.ylabel("Segundos")
+    plt.tight_layout()
+    plt.savefig(out_dir / "avg_latency.png")
+
+    # Gráfico de pastel: distribución de estados
+    plt.figure()
+    status_counts = pd.DataFrame([stats["statuses"] for stats in report.values()]).fillna(0).sum()
+    status_counts.plot(kind="pie", autopct="%1.1f%%", title="Distribución de estados")
+    plt.ylabel("")
+    plt.tight_layout()
+    plt.savefig(out_dir / "status_distribution.png")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Informe de métricas a partir del registro binario")
+    parser.add_argument("directory", nargs="?", default=str(METRICS_LOG_DIR))
+    parser.add_argument("--out", default=".", help="Directorio de salida de las gráficas")
+    parser.add_argument("--no-plot", action="store_true", help="Solo imprime los agregados")
+    args = parser.parse_args(argv)
+
+    log_listener = setup_logging()
+    try:
+        report = aggregate(args.directory)
+        if not report:
+            logger.warning("No hay eventos en %s", args.directory)
+            return
+        for name, stats in report.items():
+            logger.info("%s: %d eventos, media=%.2fms p50=%.2fms p95=%.2fms p99=%.2fms estados=%s",
+                        name, stats["count"], stats["mean"] * 1000, stats["p50"] * 1000,
+                        stats["p95"] * 1000, stats["p99"] * 1000, stats["statuses"])
+        if not args.no_plot:
+            plot(report, args.out)
+    finally:
+        log_listener.stop()
+
+
+if __name__ == "__main__":
+    main()
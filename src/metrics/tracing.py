@@ -0,0 +1,228 @@
+"""
+tracing.py
+Trazas por etapa de una muestra de los registros: marcas de tiempo al leerse
+de la fuente (ingested), al entrar en la cola del servicio (enqueued), al
+salir de ella en un lote (dequeued), al entregarse el lote al pool
+(submitted), al empezar y terminar el análisis en el worker (worker_start,
+worker_end) y al terminar handle_result (handled).
+
+La decisión de muestreo se toma en la ingesta; un registro no muestreado no
+paga más que una comparación por etapa. La traza viaja con el registro bajo
+TRACE_KEY y con el lote en la variable de contexto current_batch, así el
+router la ve sin cambiar firmas. Todas las marcas usan time.perf_counter,
+que es un reloj monotónico del sistema y por tanto comparable entre el
+proceso principal y los workers.
+
+Las trazas completas se guardan en un buffer acotado y se exportan en el
+formato JSON de Chrome (chrome://tracing, Perfetto, speedscope).
+"""
+import collections
+import contextvars
+import heapq
+import json
+import logging
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.config.settings import TRACE_FILE, TRACE_MAX_SAMPLES, TRACE_SAMPLE_RATE
+
+logger = logging.getLogger("Tracing")
+
+# Clave reservada con la que la traza acompaña al registro y al resultado
+TRACE_KEY = "_trace"
+
+STAMPS = ("ingested", "enqueued", "dequeued", "submitted", "worker_start", "worker_end", "handled")
+
+# Tramo: nombre -> (marca inicial, marca final)
+SPANS = {
+    "ingest": ("ingested", "enqueued"),
+    "queue": ("enqueued", "dequeued"),
+    "dispatch": ("dequeued", "submitted"),
+    "transfer": ("submitted", "worker_start"),
+    "analyze": ("worker_start", "worker_end"),
+    "handle": ("worker_end", "handled"),
+    "total": ("ingested", "handled"),
+}
+
+# Tiempos del worker que vuelven con el resultado: (inicio, fin, pid)
+WorkerTiming = Tuple[float, float, int]
+
+
+class BatchTrace:
+    """Marcas compartidas por todas las muestras trazadas de un mismo lote."""
+    __slots__ = ("dequeued", "submitted", "worker_start", "worker_end", "size", "mode", "worker")
+
+    def __init__(self, dequeued: float, size: int):
+        self.dequeued = dequeued
+        self.submitted: Optional[float] = None
+        self.worker_start: Optional[float] = None
+        self.worker_end: Optional[float] = None
+        self.size = size
+        self.mode: Optional[str] = None
+        self.worker: Optional[int] = None
+
+    def record_worker(self, timing: WorkerTiming) -> None:
+        self.worker_start, self.worker_end, self.worker = timing
+
+
+class SampleTrace:
+    """Traza de un registro muestreado."""
+    __slots__ = ("trace_id", "stream", "sample_id", "ingested", "enqueued", "handled", "batch")
+
+    def __init__(self, trace_id: int, stream: str, sample_id: Any, ingested: float):
+        self.trace_id = trace_id
+        self.stream = stream
+        self.sample_id = sample_id
+        self.ingested = ingested
+        self.enqueued: Optional[float] = None
+        self.handled: Optional[float] = None
+        self.batch: Optional[BatchTrace] = None
+
+    def stamps(self) -> Dict[str, Optional[float]]:
+        batch = self.batch
+        return {
+            "ingested": self.ingested,
+            "enqueued": self.enqueued,
+            "dequeued": batch and batch.dequeued,
+            "submitted": batch and batch.submitted,
+            "worker_start": batch and batch.worker_start,
+            "worker_end": batch and batch.worker_end,
+            "handled": self.handled,
+        }
+
+
+# Lote en análisis en la tarea actual (lo fija la etapa de análisis, lo lee el router)
+current_batch: contextvars.ContextVar[Optional[BatchTrace]] = contextvars.ContextVar("current_batch", default=None)
+
+
+class Tracer:
+    """
+    Muestrea registros con probabilidad 'sample_rate' y conserva las últimas
+    'max_samples' trazas completas. summary() da percentiles por tramo y
+    export() escribe el fichero de trazas.
+    """
+
+    def __init__(self, sample_rate: float = TRACE_SAMPLE_RATE, max_samples: int = TRACE_MAX_SAMPLES,
+                 seed: Optional[int] = None):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate debe estar entre 0 y 1")
+        self.sample_rate = sample_rate
+        self._random = random.Random(seed).random
+        self._next_id = 0
+        self.origin = time.perf_counter()
+        self.completed: Deque[SampleTrace] = collections.deque(maxlen=max_samples)
+        self.started = 0
+        self.finished = 0
+
+    def sample(self, stream: str, sample_id: Any) -> Optional[SampleTrace]:
+        """Decide en la ingesta si el registro se traza; devuelve su traza o None."""
+        if self._random() >= self.sample_rate:
+            return None
+        self._next_id += 1
+        self.started += 1
+        return SampleTrace(self._next_id, stream, sample_id, time.perf_counter())
+
+    def finish(self, trace: SampleTrace) -> None:
+        trace.handled = time.perf_counter()
+        self.finished += 1
+        self.completed.append(trace)
+
+    # Análisis ----------------------------------------------------------------
+
+    def durations(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """Duraciones en segundos por flujo y tramo (solo trazas con ambas marcas)."""
+        rows: Dict[str, List[Dict[str, Optional[float]]]] = collections.defaultdict(list)
+        for trace in list(self.completed):
+            rows[trace.stream].append(trace.stamps())
+        result = {}
+        for stream, stamps in rows.items():
+            columns = {
+                name: np.array([np.nan if s[name] is None else s[name] for s in stamps], dtype=np.float64)
+                for name in STAMPS
+            }
+            spans = {}
+            for span, (begin, end) in SPANS.items():
+                values = columns[end] - columns[begin]
+                spans[span] = values[~np.isnan(values)]
+            result[stream] = spans
+        return result
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """count, p50, p99 y max en ms de cada tramo, por flujo."""
+        summary = {}
+        for stream, spans in self.durations().items():
+            summary[stream] = {}
+            for span, values in spans.items():
+                if not values.size:
+                    continue
+                p50, p99 = np.percentile(values, [50, 99]) * 1000
+                summary[stream][span] = {"count": int(values.size), "p50_ms": round(float(p50), 3),
+                                         "p99_ms": round(float(p99), 3),
+                                         "max_ms": round(float(values.max()) * 1000, 3)}
+        return summary
+
+    def stats(self) -> Dict[str, Any]:
+        return {"sample_rate": self.sample_rate, "started": self.started, "finished": self.finished,
+                "buffered": len(self.completed), "stages": self.summary()}
+
+    # Exportación -------------------------------------------------------------
+
+    def events(self) -> List[Dict[str, Any]]:
+        """
+        Eventos "X" (duración completa) del formato de trazas de Chrome. Cada
+        flujo es un proceso; las muestras se reparten en carriles (hilos) sin
+        solaparse, y dentro de cada una los tramos quedan anidados.
+        """
+        streams = sorted({trace.stream for trace in self.completed})
+        pids = {stream: i + 1 for i, stream in enumerate(streams)}
+        events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": stream}}
+            for stream, pid in pids.items()
+        ]
+        lanes: Dict[str, List[Tuple[float, int]]] = collections.defaultdict(list)
+        opened: Dict[str, int] = collections.Counter()
+        for trace in sorted(self.completed, key=lambda t: t.ingested):
+            # Carril libre más antiguo; si ninguno lo está, uno nuevo
+            busy = lanes[trace.stream]
+            if busy and busy[0][0] <= trace.ingested:
+                tid = heapq.heappop(busy)[1]
+            else:
+                opened[trace.stream] += 1
+                tid = opened[trace.stream]
+            heapq.heappush(busy, (trace.handled, tid))
+
+            stamps = trace.stamps()
+            pid = pids[trace.stream]
+            batch = trace.batch
+            args = {"sample_id": trace.sample_id, "trace_id": trace.trace_id}
+            if batch is not None:
+                args.update(batch=batch.size, mode=batch.mode, worker=batch.worker)
+            events.append(self._event(str(trace.sample_id), "sample", trace.ingested, trace.handled, pid, tid, args))
+            for span, (begin, end) in SPANS.items():
+                if span != "total" and stamps[begin] is not None and stamps[end] is not None:
+                    events.append(self._event(span, "stage", stamps[begin], stamps[end], pid, tid))
+        return events
+
+    def _event(self, name: str, category: str, begin: float, end: float, pid: int, tid: int,
+               args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        event = {"name": name, "cat": category, "ph": "X", "pid": pid, "tid": tid,
+                 "ts": round((begin - self.origin) * 1e6, 3), "dur": round(max(end - begin, 0.0) * 1e6, 3)}
+        if args:
+            event["args"] = args
+        return event
+
+    def export(self, path: Union[str, Path] = TRACE_FILE) -> int:
+        """Escribe las trazas en formato Chrome (atómico). Devuelve cuántas muestras incluye."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, f)
+        os.replace(tmp, path)
+        logger.info("Trazas exportadas a %s: %d muestras", path, len(self.completed))
+        return len(self.completed)
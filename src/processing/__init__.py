@@ -1,6 +1,27 @@
 """
 Módulos de procesamiento concurrente.
 """
-from .cpu_bound import factorial, heavy_matrix_multiplication, compute_primes
-from .io_bound import simulate_network_call, batch_network_calls
-from .orchestrator import run_orchestration
+from src._lazy import install
+
+_LAZY = {
+    "factorial": ".cpu_bound",
+    "heavy_matrix_multiplication": ".cpu_bound",
+    "compute_primes": ".cpu_bound",
+    "matmul": ".matmul",
+    "MotifScanner": ".motifs",
+    "primes_up_to": ".primes",
+    "iter_primes": ".primes",
+    "RollingStatsDetector": ".rolling_stats",
+    "simulate_network_call": ".io_bound",
+    "batch_network_calls": ".io_bound",
+    "iter_network_calls": ".io_bound",
+    "HTTPConnectionPool": ".network",
+    "read_file_async": ".io_bound",
+    "write_file_async": ".io_bound",
+    "copy_file_async": ".io_bound",
+    "iter_file_chunks": ".io_bound",
+    "BufferedFileWriter": ".io_bound",
+    "run_orchestration": ".orchestrator",
+}
+
+install(globals(), _LAZY)
@@ -0,0 +1,93 @@
+"""
+backpressure.py
+Colas acotadas con políticas de desbordamiento y telemetría de profundidad.
+"""
+import asyncio
+import time
+from typing import Any, Dict
+
+POLICIES = ("block", "drop_oldest", "drop_newest", "sample")
+
+
+class BoundedQueue(asyncio.Queue):
+    """
+    asyncio.Queue con tamaño máximo y política cuando está llena:
+      - block: el productor espera (se contabiliza el tiempo bloqueado)
+      - drop_oldest: se descarta el elemento más antiguo
+      - drop_newest: se descarta el elemento entrante
+      - sample: se conserva 1 de cada N entrantes, descartando el más antiguo
+    """
+
+    def __init__(self, maxsize: int, policy: str = "block", sample_n: int = 10):
+        if policy not in POLICIES:
+            raise ValueError(f"Política de cola no soportada: {policy}")
+        if maxsize <= 0:
+            raise ValueError("maxsize debe ser mayor que 0")
+        super().__init__(maxsize=maxsize)
+        self.policy = policy
+        self.sample_n = max(1, sample_n)
+        self.drops = 0
+        self.blocked_seconds = 0.0
+        self.high_water_mark = 0
+        self._overflow_seen = 0
+
+    async def put(self, item: Any) -> bool:
+        """Encola según la política. Devuelve False si el elemento se descartó."""
+        if self.full():
+            if self.policy == "block":
+                start = time.perf_counter()
+                await super().put(item)
+                self.blocked_seconds += time.perf_counter() - start
+                self._track_depth()
+                return True
+            return self._overflow(item)
+        self.put_nowait(item)
+        return True
+
+    def offer(self, item: Any) -> bool:
+        """
+        Encola sin esperar nunca. Con la cola llena aplica la política de
+        descarte; con "block" se descarta el entrante.
+        """
+        if not self.full():
+            self.put_nowait(item)
+            return True
+        if self.policy == "block":
+            self.drops += 1
+            return False
+        return self._overflow(item)
+
+    def put_nowait(self, item: Any) -> None:
+        super().put_nowait(item)
+        self._track_depth()
+
+    def _overflow(self, item: Any) -> bool:
+        if self.policy == "drop_newest":
+            self.drops += 1
+            return False
+        if self.policy == "sample":
+            self._overflow_seen += 1
+            if self._overflow_seen % self.sample_n:
+                self.drops += 1
+                return False
+        # drop_oldest, o la muestra elegida por 'sample': hacer sitio
+        self.get_nowait()
+        self.task_done()
+        self.drops += 1
+        self.put_nowait(item)
+        return True
+
+    def _track_depth(self) -> None:
+        depth = self.qsize()
+        if depth > self.high_water_mark:
+            self.high_water_mark = depth
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.qsize(),
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+            "drops": self.drops,
+            "blocked_seconds": self.blocked_seconds,
+            "high_water_mark": self.high_water_mark,
+        }
@@ -0,0 +1,34 @@
+"""
+batching.py
+Agrupación de muestras en micro-lotes antes de enviarlas al executor.
+"""
+import asyncio
+from typing import Any, List
+
+
+async def drain_batch(queue: asyncio.Queue, max_size: int, linger: float) -> List[Any]:
+    """
+    Espera la primera muestra de la cola y luego acumula hasta 'max_size'
+    elementos o hasta que pasen 'linger' segundos, lo que ocurra antes.
+    """
+    loop = asyncio.get_running_loop()
+    batch = [await queue.get()]
+    deadline = loop.time() + linger
+
+    while len(batch) < max_size:
+        # Vaciar primero lo que ya está disponible sin ceder el control
+        try:
+            batch.append(queue.get_nowait())
+            continue
+        except asyncio.QueueEmpty:
+            pass
+
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), remaining))
+        except asyncio.TimeoutError:
+            break
+
+    return batch
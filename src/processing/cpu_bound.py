@@ -2,47 +2,47 @@
 cpu_bound.py
 Funciones para simular tareas intensivas en CPU (multiproceso).
 """
-import math
 import logging
-from typing import List
+from typing import List, Optional
+
+import numpy as np
+
+from src.processing.factorials import factorial as _factorial
+from src.processing.matmul import Matrix, matmul
+from src.processing.primes import primes_up_to
 
 logger = logging.getLogger("CPUBound")
-logger.setLevel(logging.INFO)
-handler = logging.StreamHandler()
-formatter = logging.Formatter("[%(asctime)s] %(levelname)s - %(name)s - %(message)s")
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 def factorial(n: int) -> int:
-    """Calcula el factorial de n usando recursión (simulación de carga pesada)."""
-    if n <= 1:
-        return 1
-    return n * factorial(n - 1)
+    """
+    Calcula el factorial de n (1 si n <= 1) por división binaria, sin
+    recursión profunda, partiendo de factoriales ya calculados
+    (src.processing.factorials).
+    """
+    return _factorial(n)
 
-def heavy_matrix_multiplication(size: int) -> List[List[int]]:
-    """Simula multiplicación de matrices cuadradas de tamaño 'size'."""
-    logger.info(f"Iniciando multiplicación de matrices de tamaño {size}x{size}")
-    A = [[i + j for j in range(size)] for i in range(size)]
-    B = [[i * j for j in range(size)] for i in range(size)]
-    result = [[0 for _ in range(size)] for _ in range(size)]
-    for i in range(size):
-        for j in range(size):
-            for k in range(size):
-                result[i][j] += A[i][k] * B[k][j]
+def heavy_matrix_multiplication(size: int, A: Optional[Matrix] = None, B: Optional[Matrix] = None,
+                                backend: str = "auto") -> List[List[int]]:
+    """
+    Multiplica matrices cuadradas de tamaño 'size' con el motor de
+    src.processing.matmul. Sin A/B se usan las matrices de simulación
+    (A=i+j, B=i*j); 'backend' es "auto", "numpy", "blocked" o "parallel".
+    """
+    logger.info("Iniciando multiplicación de matrices de tamaño %sx%s", size, size)
+    if A is None:
+        A = np.add.outer(np.arange(size, dtype=np.int64), np.arange(size, dtype=np.int64))
+    if B is None:
+        B = np.multiply.outer(np.arange(size, dtype=np.int64), np.arange(size, dtype=np.int64))
+    result = matmul(A, B, backend=backend).tolist()
     logger.info("Multiplicación completada")
     return result
 
 def compute_primes(limit: int) -> List[int]:
-    """Calcula números primos hasta 'limit' (simulación CPU-bound)."""
-    logger.info(f"Calculando números primos hasta {limit}")
-    primes = []
-    for num in range(2, limit + 1):
-        is_prime = True
-        for i in range(2, int(math.sqrt(num)) + 1):
-            if num % i == 0:
-                is_prime = False
-                break
-        if is_prime:
-            primes.append(num)
+    """
+    Calcula números primos hasta 'limit' con la criba segmentada de
+    src.processing.primes (caché incremental compartida en el proceso).
+    """
+    logger.info("Calculando números primos hasta %s", limit)
+    primes = primes_up_to(limit).tolist()
     logger.info("Cálculo de primos completado")
-    return primes
\ No newline at end of file
+    return primes
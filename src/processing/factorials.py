@@ -0,0 +1,123 @@
+"""
+factorials.py
+Factorial iterativo de precisión arbitraria por división binaria: los
+factores se multiplican en un árbol equilibrado, de modo que las
+multiplicaciones grandes son entre números de tamaño parecido. Guarda una
+caché acotada de factoriales ya calculados (n! parte del mayor m! <= n
+disponible) y reparte el árbol entre el pool de procesos para n grandes.
+"""
+import bisect
+import collections
+import logging
+import threading
+from concurrent.futures import Executor
+from typing import Dict, List, Optional
+
+from src.config.settings import FACTORIAL_CACHE_SIZE, FACTORIAL_PARALLEL_MIN, PROCESS_POOL_SIZE
+from src.processing.process_pool import process_executor
+
+logger = logging.getLogger("Factorial")
+
+# Por debajo de este número de factores el bucle directo gana al árbol
+_LEAF = 16
+
+
+def range_product(lo: int, hi: int) -> int:
+    """Producto de los enteros en (lo, hi] por división binaria."""
+    if hi - lo <= _LEAF:
+        result = 1
+        for k in range(lo + 1, hi + 1):
+            result *= k
+        return result
+    mid = (lo + hi) // 2
+    return range_product(lo, mid) * range_product(mid, hi)
+
+
+def tree_product(values: List[int]) -> int:
+    """Producto de 'values' multiplicando por parejas, sin cadenas desequilibradas."""
+    if not values:
+        return 1
+    while len(values) > 1:
+        values = [values[i] * values[i + 1] if i + 1 < len(values) else values[i]
+                  for i in range(0, len(values), 2)]
+    return values[0]
+
+
+class FactorialEngine:
+    """
+    Calcula n! partiendo del mayor factorial en caché que no supere n. La
+    caché es LRU con 'cache_size' entradas; el tramo pendiente se reparte
+    entre procesos cuando tiene al menos 'parallel_min' factores.
+    """
+
+    def __init__(self, cache_size: int = FACTORIAL_CACHE_SIZE, parallel_min: int = FACTORIAL_PARALLEL_MIN,
+                 executor: Optional[Executor] = None):
+        self.cache_size = cache_size
+        self.parallel_min = parallel_min
+        self.executor = executor
+        self._cache: "collections.OrderedDict[int, int]" = collections.OrderedDict()
+        self._keys: List[int] = []  # claves de la caché ordenadas, para bisect
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def factorial(self, n: int) -> int:
+        if n <= 1:
+            return 1
+        with self._lock:
+            base, start = self._checkpoint(n)
+        if start == n:
+            return base
+        result = base * self._range_product(start, n)
+        with self._lock:
+            self._store(n, result)
+        return result
+
+    def _checkpoint(self, n: int):
+        index = bisect.bisect_right(self._keys, n)
+        if index == 0:
+            self.misses += 1
+            return 1, 1
+        m = self._keys[index - 1]
+        self.hits += 1
+        self._cache.move_to_end(m)
+        return self._cache[m], m
+
+    def _store(self, n: int, value: int) -> None:
+        if self.cache_size <= 0:
+            return
+        if n in self._cache:
+            self._cache.move_to_end(n)
+            return
+        self._cache[n] = value
+        bisect.insort(self._keys, n)
+        while len(self._cache) > self.cache_size:
+            evicted, _ = self._cache.popitem(last=False)
+            self._keys.remove(evicted)
+
+    def _range_product(self, lo: int, hi: int) -> int:
+        parallel = self.executor is not None or PROCESS_POOL_SIZE > 1
+        if not parallel or hi - lo < self.parallel_min:
+            return range_product(lo, hi)
+        executor = self.executor or process_executor()
+        parts = max(2, PROCESS_POOL_SIZE)
+        bounds = [lo + (hi - lo) * i // parts for i in range(parts + 1)]
+        logger.debug("Producto (%d, %d] repartido en %d procesos", lo, hi, parts)
+        return tree_product(list(executor.map(range_product, bounds[:-1], bounds[1:])))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._keys.clear()
+
+
+_engine = FactorialEngine()
+
+
+def factorial(n: int) -> int:
+    """n! con la caché de factoriales del proceso."""
+    return _engine.factorial(n)
@@ -1,38 +1,290 @@
 """
 io_bound.py
-Funciones para simular tareas I/O-bound (asyncio y ThreadPoolExecutor).
+Funciones para tareas I/O-bound (asyncio y ThreadPoolExecutor): E/S de
+ficheros por bloques en un pool de hilos propio, lecturas con mmap, copias
+sin pasar por espacio de usuario, escritura con búfer y volcado agrupado,
+y llamadas de red concurrentes acotadas (src.processing.network).
 """
 import asyncio
 import logging
-from typing import List
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterable, List, Optional, TypeVar, Union
+
+from src.config.settings import IO_CHUNK_BYTES, IO_MMAP_THRESHOLD, IO_WRITE_BUFFER, THREAD_POOL_SIZE
+from src.processing.network import CallResult, ConnectionPool, SimulatedPool, gather_calls, iter_calls
 
 # Configuración del logger
 logger = logging.getLogger("IOBound")
-logger.setLevel(logging.INFO)
-handler = logging.StreamHandler()
-formatter = logging.Formatter("[%(asctime)s] %(levelname)s - %(name)s - %(message)s")
-handler.setFormatter(formatter)
-logger.addHandler(handler)
-
-async def simulate_network_call(url: str) -> str:
-    """Simula una llamada de red asíncrona."""
-    logger.info(f"Simulando llamada a {url}")
-    await asyncio.sleep(1)  # Simula latencia
-    return f"Respuesta simulada de {url}"
-
-async def read_file_async(file_path: str) -> str:
-    """Lee un archivo de forma asíncrona (simulación)."""
-    logger.info(f"Leyendo archivo: {file_path}")
-    await asyncio.sleep(0.5)
-    return f"Contenido simulado de {file_path}"
-
-async def write_file_async(file_path: str, content: str) -> None:
-    """Escribe contenido en un archivo de forma asíncrona (simulación)."""
-    logger.info(f"Escribiendo en archivo: {file_path}")
-    await asyncio.sleep(0.5)
-    logger.info("Escritura completada")
-
-async def batch_network_calls(urls: List[str]) -> List[str]:
-    """Realiza múltiples llamadas de red concurrentes usando asyncio.gather."""
-    tasks = [simulate_network_call(url) for url in urls]
-    return await asyncio.gather(*tasks)
\ No newline at end of file
+
+T = TypeVar("T")
+PathLike = Union[str, os.PathLike]
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_simulated_pool: Optional[SimulatedPool] = None
+
+
+def io_executor() -> ThreadPoolExecutor:
+    """Pool de hilos de E/S (THREAD_POOL_SIZE), creado en el primer uso."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE, thread_name_prefix="io")
+        return _executor
+
+
+def shutdown_io_executor() -> None:
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def run_io(func: Callable[..., T], *args) -> T:
+    """Ejecuta una llamada bloqueante de E/S en el pool de hilos de E/S."""
+    return await asyncio.get_running_loop().run_in_executor(io_executor(), func, *args)
+
+
+async def simulate_network_call(url: str, pool: Optional[ConnectionPool] = None) -> str:
+    """
+    Llamada de red asíncrona a través de un pool de conexiones. Sin 'pool'
+    se usa el pool simulado (1 s de latencia y respuesta fija).
+    """
+    logger.debug("Llamada a %s", url)
+    return await (pool or _default_pool()).request(url)
+
+
+def _default_pool() -> ConnectionPool:
+    global _simulated_pool
+    if _simulated_pool is None:
+        _simulated_pool = SimulatedPool()
+    return _simulated_pool
+
+
+async def read_file_async(file_path: PathLike, encoding: Optional[str] = "utf-8") -> Union[str, bytes]:
+    """Lee un archivo completo sin bloquear el loop (bytes si encoding es None)."""
+    logger.debug("Leyendo archivo: %s", file_path)
+    data = await run_io(_read_all, file_path)
+    return data if encoding is None else data.decode(encoding)
+
+
+def _read_all(file_path: PathLike) -> bytes:
+    size = os.path.getsize(file_path)
+    # mmap no admite ficheros vacíos (aunque IO_MMAP_THRESHOLD sea 0)
+    if size > 0 and size >= IO_MMAP_THRESHOLD:
+        # Ficheros grandes: una sola copia desde la caché de páginas
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[:]
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+async def iter_file_chunks(file_path: PathLike, chunk_size: int = IO_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """
+    Itera el fichero en bloques de 'chunk_size' bytes; cada lectura ocurre en
+    el pool de E/S, así que la memoria usada no depende del tamaño del fichero.
+    """
+    f = await run_io(open, file_path, "rb")
+    try:
+        while True:
+            chunk = await run_io(f.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        f.close()
+
+
+async def iter_file_mmap(file_path: PathLike, chunk_size: int = IO_CHUNK_BYTES) -> AsyncIterator[memoryview]:
+    """
+    Como iter_file_chunks pero sin copias: cada bloque es un memoryview de
+    solo lectura sobre el mmap, válido hasta el siguiente paso. Las páginas
+    se precargan en el pool de E/S para que el loop no sufra fallos de página.
+    """
+    f = await run_io(open, file_path, "rb")
+    try:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    finally:
+        f.close()
+    try:
+        if hasattr(mm, "madvise"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        view = memoryview(mm)
+        try:
+            for start in range(0, len(mm), chunk_size):
+                end = min(start + chunk_size, len(mm))
+                await run_io(_prefetch, mm, start, end)
+                chunk = view[start:end]
+                try:
+                    yield chunk
+                finally:
+                    chunk.release()
+        finally:
+            view.release()
+    finally:
+        mm.close()
+
+
+def _prefetch(mm: mmap.mmap, start: int, end: int) -> None:
+    if hasattr(mm, "madvise"):
+        aligned = start - start % mmap.PAGESIZE
+        mm.madvise(mmap.MADV_WILLNEED, aligned, end - aligned)
+    else:
+        # Tocar una posición por página carga el bloque en memoria
+        for offset in range(start, end, mmap.PAGESIZE):
+            mm[offset]
+
+
+async def write_file_async(file_path: PathLike, content: Union[str, bytes],
+                           chunk_size: int = IO_CHUNK_BYTES) -> None:
+    """Escribe contenido en un archivo por bloques, fuera del loop."""
+    logger.debug("Escribiendo en archivo: %s", file_path)
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    await run_io(_write_all, file_path, data, chunk_size)
+    logger.debug("Escritura completada: %s", file_path)
+
+
+def _write_all(file_path: PathLike, data: bytes, chunk_size: int) -> None:
+    view = memoryview(data)
+    with open(file_path, "wb") as f:
+        for start in range(0, len(view), chunk_size):
+            f.write(view[start:start + chunk_size])
+
+
+async def copy_file_async(src: PathLike, dst: PathLike) -> int:
+    """
+    Copia un fichero dentro del kernel (copy_file_range o sendfile) cuando la
+    plataforma lo permite; si no, por bloques. Devuelve los bytes copiados.
+    """
+    return await run_io(_copy_file, src, dst)
+
+
+def _copy_file(src: PathLike, dst: PathLike) -> int:
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        size = os.fstat(fin.fileno()).st_size
+        copied = 0
+        for copy in (_copy_file_range, _sendfile):
+            if copied >= size:
+                break
+            try:
+                # Cada método sigue donde se quedó el anterior (si terminó antes de tiempo)
+                copied = copy(fin.fileno(), fout.fileno(), copied, size)
+            except (AttributeError, OSError) as e:
+                # Sin soporte (plataforma, sistema de ficheros): siguiente método
+                logger.debug("%s no disponible: %s", copy.__name__, e)
+        # Lo que quede (o todo, sin copia en el kernel) por bloques
+        fin.seek(copied)
+        fout.seek(copied)
+        fout.truncate()
+        while chunk := fin.read(IO_CHUNK_BYTES):
+            fout.write(chunk)
+            copied += len(chunk)
+        return copied
+
+
+def _copy_file_range(fd_in: int, fd_out: int, offset: int, size: int) -> int:
+    """Copia [offset, size) con offsets explícitos; devuelve hasta dónde llegó."""
+    while offset < size:
+        n = os.copy_file_range(fd_in, fd_out, size - offset, offset, offset)
+        if n == 0:
+            break
+        offset += n
+    return offset
+
+
+def _sendfile(fd_in: int, fd_out: int, offset: int, size: int) -> int:
+    """Como _copy_file_range; sendfile escribe en la posición actual de fd_out."""
+    os.lseek(fd_out, offset, os.SEEK_SET)
+    while offset < size:
+        n = os.sendfile(fd_out, fd_in, offset, size - offset)
+        if n == 0:
+            break
+        offset += n
+    return offset
+
+
+class BufferedFileWriter:
+    """
+    Escritor asíncrono con búfer: write() solo copia a memoria y, al superar
+    'buffer_size', el bloque acumulado se vuelca en una única escritura en el
+    pool de E/S. Mientras un volcado está en curso las escrituras siguientes
+    se agrupan para el próximo, de modo que muchos productores comparten
+    pocas llamadas al sistema.
+    """
+
+    def __init__(self, file_path: PathLike, buffer_size: int = IO_WRITE_BUFFER, append: bool = False,
+                 fsync: bool = False):
+        self.file_path = file_path
+        self.buffer_size = buffer_size
+        self.mode = "ab" if append else "wb"
+        self.fsync = fsync
+        self._file = None
+        self._buffer = bytearray()
+        self._flush_lock = asyncio.Lock()
+        self.bytes_written = 0
+        self.flushes = 0
+
+    async def __aenter__(self) -> "BufferedFileWriter":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def write(self, data: Union[str, bytes]) -> None:
+        self._buffer += data.encode("utf-8") if isinstance(data, str) else data
+        if len(self._buffer) >= self.buffer_size:
+            # Con un volcado en curso se sigue agrupando, salvo que el búfer
+            # crezca demasiado: entonces el productor espera (backpressure)
+            if not self._flush_lock.locked() or len(self._buffer) >= 4 * self.buffer_size:
+                await self.flush()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            block, self._buffer = self._buffer, bytearray()
+            if self._file is None:
+                self._file = await run_io(open, self.file_path, self.mode)
+            await run_io(self._file.write, block)
+            self.bytes_written += len(block)
+            self.flushes += 1
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._file is not None:
+            await run_io(self._sync_and_close, self._file)
+            self._file = None
+
+    def _sync_and_close(self, f) -> None:
+        if self.fsync:
+            f.flush()
+            os.fsync(f.fileno())
+        f.close()
+
+
+def iter_network_calls(urls: Iterable[str], pool: Optional[ConnectionPool] = None,
+                       **limits) -> AsyncIterator[CallResult]:
+    """
+    Fan-out acotado: entrega cada CallResult en cuanto termina. 'limits'
+    acepta max_concurrency, per_host, call_timeout y deadline (ver
+    src.processing.network.iter_calls; por defecto los NETWORK_* de settings).
+    """
+    return iter_calls(urls, pool or _default_pool(), **limits)
+
+
+async def batch_network_calls(urls: List[str], pool: Optional[ConnectionPool] = None, **limits) -> List[str]:
+    """
+    Realiza múltiples llamadas de red con concurrencia acotada y devuelve las
+    respuestas en el orden de 'urls'. Si alguna falla se propaga su error.
+    """
+    results = await gather_calls(urls, pool or _default_pool(), **limits)
+    for result in results:
+        if result.error is not None:
+            raise result.error
+    return [result.result for result in results]
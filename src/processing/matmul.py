@@ -0,0 +1,158 @@
+"""
+matmul.py
+Motor de multiplicación de matrices: NumPy por defecto, versión por bloques
+en Python puro como respaldo (enteros sin límite de tamaño) y ejecución por
+teselas en el pool de procesos con entradas y salida en memoria compartida.
+"""
+import logging
+from concurrent.futures import Executor
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.config.settings import MATMUL_BLOCK, MATMUL_PARALLEL_MIN, MATMUL_TILE, PROCESS_POOL_SIZE
+from src.processing.process_pool import process_executor
+from src.processing.shm_ring import attach
+
+logger = logging.getLogger("MatMul")
+
+BACKENDS = ("auto", "numpy", "blocked", "parallel")
+
+Matrix = Union[np.ndarray, Sequence[Sequence[float]]]
+
+_INT64_MAX = np.iinfo(np.int64).max
+# Enteros hasta 2**53 son exactos en float64: se multiplican con BLAS
+_FLOAT_EXACT_MAX = 2 ** 53
+
+
+def matmul(A: Matrix, B: Matrix, backend: str = "auto", executor: Optional[Executor] = None,
+           tile: int = MATMUL_TILE, block: int = MATMUL_BLOCK) -> np.ndarray:
+    """
+    Devuelve A @ B. Con backend "auto" se usa NumPy y, a partir de
+    MATMUL_PARALLEL_MIN filas, teselas en paralelo. Los enteros se calculan
+    en float64 (BLAS) si el resultado es exacto, si no en int64 y, si tampoco
+    caben, en Python puro para no desbordar.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de matmul no soportado: {backend}")
+    a, b = _as_matrix(A), _as_matrix(B)
+    if a.shape[1] != b.shape[0]:
+        raise ValueError(f"Dimensiones incompatibles: {a.shape} x {b.shape}")
+
+    compute, dtype = _dtypes(a, b)
+    if backend == "blocked" or dtype == object:
+        return np.array(blocked_matmul(a.tolist(), b.tolist(), block), dtype=dtype).reshape(a.shape[0], b.shape[1])
+    a, b = a.astype(compute, copy=False), b.astype(compute, copy=False)
+    if backend == "parallel" or (backend == "auto" and a.shape[0] >= MATMUL_PARALLEL_MIN and PROCESS_POOL_SIZE > 1):
+        result = parallel_matmul(a, b, executor or process_executor(), tile)
+    else:
+        result = a @ b
+    return result.astype(dtype, copy=False)
+
+
+def _as_matrix(M: Matrix) -> np.ndarray:
+    m = np.asarray(M)
+    if m.ndim != 2:
+        raise ValueError(f"Se esperaba una matriz 2D, no {m.ndim}D")
+    return m
+
+
+def _dtypes(a: np.ndarray, b: np.ndarray):
+    """(tipo de cálculo, tipo del resultado)."""
+    if a.dtype == object or b.dtype == object:
+        return object, object
+    if a.dtype.kind in "biu" and b.dtype.kind in "biu":
+        # Cota de cualquier suma parcial: k * max|a| * max|b|
+        bound = a.shape[1] * _max_abs(a) * _max_abs(b)
+        if bound <= _FLOAT_EXACT_MAX:
+            return np.float64, np.int64
+        return (np.int64, np.int64) if bound <= _INT64_MAX else (object, object)
+    dtype = np.result_type(a.dtype, b.dtype, np.float64)
+    return dtype, dtype
+
+
+def _max_abs(m: np.ndarray) -> int:
+    # En enteros de Python: np.abs desborda con el mínimo de int64
+    if not m.size:
+        return 0
+    return max(abs(int(m.min())), abs(int(m.max())))
+
+
+def blocked_matmul(A: List[List], B: List[List], block: int = MATMUL_BLOCK) -> List[List]:
+    """
+    Multiplicación por bloques en Python puro, orden i-k-j: la fila de B y
+    la de C se recorren de forma contigua y cada bloque de B se reutiliza
+    para 'block' filas de A mientras sigue en caché.
+    """
+    n, k, m = len(A), len(B), len(B[0]) if B else 0
+    C = [[0] * m for _ in range(n)]
+    for i0 in range(0, n, block):
+        for k0 in range(0, k, block):
+            for j0 in range(0, m, block):
+                j1 = min(j0 + block, m)
+                B_rows = [row[j0:j1] for row in B[k0:k0 + block]]
+                for i in range(i0, min(i0 + block, n)):
+                    A_row = A[i]
+                    acc = C[i][j0:j1]
+                    for offset, B_row in enumerate(B_rows):
+                        a = A_row[k0 + offset]
+                        if a:
+                            acc = [c + a * b for c, b in zip(acc, B_row)]
+                    C[i][j0:j1] = acc
+    return C
+
+
+def parallel_matmul(a: np.ndarray, b: np.ndarray, executor: Executor, tile: int = MATMUL_TILE) -> np.ndarray:
+    """
+    Reparte C en teselas de 'tile' x 'tile' entre los procesos. A, B y C
+    viven en memoria compartida: cada tarea solo recibe nombres y límites,
+    y escribe su tesela directamente en C.
+    """
+    n, m = a.shape[0], b.shape[1]
+    logger.debug("Multiplicación %dx%d por %dx%d en teselas de %d", n, a.shape[1], b.shape[0], m, tile)
+    segments = [_to_shared(a), _to_shared(b), _empty_shared((n, m), a.dtype)]
+    try:
+        (shm_a, _), (shm_b, _), (shm_c, c) = segments
+        tiles = [(i0, min(i0 + tile, n), j0, min(j0 + tile, m))
+                 for i0 in range(0, n, tile) for j0 in range(0, m, tile)]
+        futures = [
+            executor.submit(_matmul_tile, shm_a.name, a.shape, shm_b.name, b.shape, shm_c.name, a.dtype.str, bounds)
+            for bounds in tiles
+        ]
+        for future in futures:
+            future.result()
+        return c.copy()
+    finally:
+        for shm, view in segments:
+            del view
+            shm.close()
+            shm.unlink()
+
+
+def _to_shared(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    shm, view = _empty_shared(array.shape, array.dtype)
+    view[...] = array
+    return shm, view
+
+
+def _empty_shared(shape: Tuple[int, int], dtype) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    dtype = np.dtype(dtype)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, shape[0] * shape[1] * dtype.itemsize))
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _matmul_tile(a_name: str, a_shape, b_name: str, b_shape, c_name: str, dtype: str,
+                 bounds: Tuple[int, int, int, int]) -> None:
+    """Tarea de un worker: C[i0:i1, j0:j1] = A[i0:i1, :] @ B[:, j0:j1]."""
+    i0, i1, j0, j1 = bounds
+    segments = [attach(a_name), attach(b_name), attach(c_name)]
+    try:
+        a = np.ndarray(a_shape, dtype=dtype, buffer=segments[0].buf)
+        b = np.ndarray(b_shape, dtype=dtype, buffer=segments[1].buf)
+        c = np.ndarray((a_shape[0], b_shape[1]), dtype=dtype, buffer=segments[2].buf)
+        np.matmul(a[i0:i1], b[:, j0:j1], out=c[i0:i1, j0:j1])
+        del a, b, c
+    finally:
+        for shm in segments:
+            shm.close()
@@ -0,0 +1,147 @@
+"""
+motifs.py
+Escáner de motivos genéticos: el panel se compila una vez en un autómata
+Aho-Corasick (DFA completo sobre A/C/G/T) y cada lote se recorre en una sola
+pasada sobre las secuencias empaquetadas a 2 bits. Las secuencias se trocean
+en carriles solapados que avanzan a la vez con NumPy, así que el coste por
+base no depende de cuántas secuencias ni de lo largas que sean.
+"""
+import collections
+import functools
+import logging
+from typing import List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.config.settings import MOTIF_BOTH_STRANDS, MOTIF_PANEL, MOTIF_SCAN_WINDOW
+from src.utils.packed_sequence import AMBIGUOUS, PackedSequenceColumn, encode_ascii
+
+logger = logging.getLogger("Motifs")
+
+Panel = Mapping[str, Union[str, Sequence[str]]]
+
+
+class MotifScanner:
+    """
+    Autómata Aho-Corasick del panel. 'delta' es la tabla de transición
+    (estados x 5; la columna AMBIGUOUS vuelve a la raíz) y 'output' marca,
+    con un bit por motivo, qué motivos terminan en cada estado.
+    """
+
+    def __init__(self, panel: Panel, both_strands: bool = MOTIF_BOTH_STRANDS, window: int = MOTIF_SCAN_WINDOW):
+        if not panel:
+            raise ValueError("El panel de motivos está vacío")
+        self.names: List[str] = list(panel)
+        self.window = window
+        patterns = []
+        for index, motifs in enumerate(panel.values()):
+            for motif in [motifs] if isinstance(motifs, str) else motifs:
+                codes = encode_ascii(np.frombuffer(motif.encode("ascii"), dtype=np.uint8))
+                if not codes.size or (codes == AMBIGUOUS).any():
+                    raise ValueError(f"Motivo inválido en {self.names[index]}: {motif!r}")
+                patterns.append((codes.tolist(), index))
+                if both_strands:
+                    patterns.append(((3 - codes[::-1]).tolist(), index))
+        self.max_length = max(len(codes) for codes, _ in patterns)
+        self.delta, self.output = self._compile(patterns, len(self.names))
+        logger.debug("Panel compilado: %d motivos, %d patrones, %d estados",
+                     len(self.names), len(patterns), len(self.delta))
+
+    @staticmethod
+    def _compile(patterns: List[Tuple[List[int], int]], n_motifs: int) -> Tuple[np.ndarray, np.ndarray]:
+        goto: List[List[int]] = [[-1] * 4]
+        outputs: List[int] = [0]
+        for codes, index in patterns:
+            state = 0
+            for code in codes:
+                if goto[state][code] < 0:
+                    goto[state][code] = len(goto)
+                    goto.append([-1] * 4)
+                    outputs.append(0)
+                state = goto[state][code]
+            outputs[state] |= 1 << index
+
+        # BFS: enlaces de fallo resueltos directamente en la tabla (DFA completo)
+        delta = np.zeros((len(goto), AMBIGUOUS + 1), dtype=np.int32)
+        fail = [0] * len(goto)
+        pending = collections.deque()
+        for code in range(4):
+            child = goto[0][code]
+            delta[0, code] = max(child, 0)
+            if child > 0:
+                pending.append(child)
+        while pending:
+            state = pending.popleft()
+            outputs[state] |= outputs[fail[state]]
+            for code in range(4):
+                child = goto[state][code]
+                if child < 0:
+                    delta[state, code] = delta[fail[state], code]
+                else:
+                    fail[child] = int(delta[fail[state], code])
+                    delta[state, code] = child
+                    pending.append(child)
+
+        # Máscaras de bits en palabras de 64 bits (paneles de cualquier tamaño)
+        words = -(-n_motifs // 64)
+        output = np.zeros((len(goto), words), dtype=np.uint64)
+        for state, mask in enumerate(outputs):
+            for word in range(words):
+                output[state, word] = (mask >> (64 * word)) & 0xFFFFFFFFFFFFFFFF
+        return delta, output
+
+    def scan(self, sequences: PackedSequenceColumn) -> np.ndarray:
+        """Matriz booleana (secuencias x motivos): qué motivos aparecen en cada secuencia."""
+        n = len(sequences)
+        found = np.zeros((n, len(self.names)), dtype=bool)
+        codes = sequences.codes()
+        if not codes.size:
+            return found
+
+        # Carriles de 'window' bases más un solape de max_length - 1, para no
+        # perder coincidencias que cruzan el borde entre carriles
+        lengths = sequences.lengths()
+        starts = sequences.offsets[:-1] - sequences.offsets[0]
+        lanes_per_seq = -(-lengths // self.window)
+        owner = np.repeat(np.arange(n), lanes_per_seq)
+        first_lane = np.cumsum(lanes_per_seq) - lanes_per_seq
+        lane_offset = (np.arange(owner.size) - first_lane[owner]) * self.window
+        lane_start = starts[owner] + lane_offset
+        lane_end = starts[owner] + np.minimum(lane_offset + self.window + self.max_length - 1, lengths[owner])
+        span = int((lane_end - lane_start).max())
+
+        steps = np.arange(span)[:, None]
+        positions = lane_start[None, :] + steps
+        matrix = np.where(positions < lane_end[None, :], codes[np.minimum(positions, codes.size - 1)], AMBIGUOUS)
+        matrix = matrix.astype(np.uint8, copy=False)
+
+        flat_delta = self.delta.ravel()
+        width = self.delta.shape[1]
+        states = np.zeros(owner.size, dtype=np.intp)
+        hits = np.zeros((owner.size, self.output.shape[1]), dtype=np.uint64)
+        for step in matrix:
+            states = flat_delta[states * width + step]
+            hits |= self.output[states]
+
+        # De carriles a secuencias y de bits a columnas por motivo
+        per_seq = np.zeros((n, hits.shape[1]), dtype=np.uint64)
+        np.bitwise_or.at(per_seq, owner, hits)
+        for index in range(len(self.names)):
+            word, bit = divmod(index, 64)
+            found[:, index] = (per_seq[:, word] >> np.uint64(bit)) & np.uint64(1) == 1
+        return found
+
+    def scan_strings(self, sequences: Sequence[str]) -> np.ndarray:
+        return self.scan(PackedSequenceColumn.from_strings(sequences))
+
+
+@functools.lru_cache(maxsize=8)
+def _compiled(key: Tuple[Tuple[str, Tuple[str, ...]], ...], both_strands: bool) -> MotifScanner:
+    return MotifScanner(dict(key), both_strands)
+
+
+def get_scanner(panel: Panel = MOTIF_PANEL, both_strands: bool = MOTIF_BOTH_STRANDS) -> MotifScanner:
+    """Escáner del panel, compilado una sola vez por proceso."""
+    key = tuple((name, (motifs,) if isinstance(motifs, str) else tuple(motifs)) for name, motifs in panel.items())
+    return _compiled(key, both_strands)
+
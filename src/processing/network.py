@@ -0,0 +1,279 @@
+"""
+network.py
+Llamadas de red concurrentes: pools de conexiones reutilizables (simulado y
+HTTP keep-alive sobre asyncio) y un fan-out con límite global y por host,
+plazos por llamada y globales, y resultados entregados según terminan.
+"""
+import asyncio
+import collections
+import logging
+import time
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.config.settings import (
+    NETWORK_CALL_TIMEOUT,
+    NETWORK_DEADLINE,
+    NETWORK_MAX_CONCURRENCY,
+    NETWORK_PER_HOST_LIMIT,
+    NETWORK_POOL_MAX_IDLE,
+)
+
+logger = logging.getLogger("Network")
+
+HostKey = Tuple[str, str, int]
+
+
+class NetworkError(Exception):
+    """Respuesta de error o protocolo inesperado."""
+
+
+class CallResult(NamedTuple):
+    url: str
+    result: Any
+    error: Optional[BaseException]
+    elapsed: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def host_key(url: str) -> HostKey:
+    parts = urlsplit(url)
+    scheme = parts.scheme or "http"
+    port = parts.port or (443 if scheme == "https" else 80)
+    return scheme, parts.hostname or "", port
+
+
+class ConnectionPool:
+    """Interfaz de los pools: request(url) devuelve el cuerpo de la respuesta."""
+
+    async def request(self, url: str) -> str:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class SimulatedPool(ConnectionPool):
+    """Sin red: espera 'latency' segundos y devuelve una respuesta fija."""
+
+    def __init__(self, latency: float = 1.0):
+        self.latency = latency
+        self.requests = 0
+
+    async def request(self, url: str) -> str:
+        self.requests += 1
+        await asyncio.sleep(self.latency)  # Simula latencia
+        return f"Respuesta simulada de {url}"
+
+
+class HTTPConnectionPool(ConnectionPool):
+    """
+    GET sobre HTTP/1.1 con conexiones persistentes por host (hasta
+    'max_idle' inactivas por host). Una conexión reutilizada que el servidor
+    ya cerró se reabre y la petición se repite una vez.
+    """
+
+    def __init__(self, max_idle: int = NETWORK_POOL_MAX_IDLE):
+        self.max_idle = max_idle
+        self._idle: Dict[HostKey, Deque[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = \
+            collections.defaultdict(collections.deque)
+        self.opened = 0
+        self.requests = 0
+
+    async def _connect(self, key: HostKey):
+        scheme, host, port = key
+        self.opened += 1
+        return await asyncio.open_connection(host, port, ssl=True if scheme == "https" else None)
+
+    async def request(self, url: str) -> str:
+        key = host_key(url)
+        parts = urlsplit(url)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        idle = self._idle[key]
+        conn, reused = (idle.pop(), True) if idle else (await self._connect(key), False)
+        try:
+            try:
+                status, body, keep_alive = await self._exchange(conn, key, target)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not reused:
+                    raise
+                conn[1].close()
+                conn = await self._connect(key)
+                status, body, keep_alive = await self._exchange(conn, key, target)
+        except BaseException:
+            # Incluye la cancelación por plazo: la conexión queda a medias
+            conn[1].close()
+            raise
+        self.requests += 1
+        if keep_alive and len(idle) < self.max_idle:
+            idle.append(conn)
+        else:
+            conn[1].close()
+        if status >= 400:
+            raise NetworkError(f"HTTP {status} en {url}")
+        return body.decode("utf-8", errors="replace")
+
+    @staticmethod
+    async def _exchange(conn, key: HostKey, target: str) -> Tuple[int, bytes, bool]:
+        reader, writer = conn
+        host = key[1] if key[2] in (80, 443) else f"{key[1]}:{key[2]}"
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode("ascii"))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("El servidor cerró la conexión")
+        try:
+            version, status = status_line.split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise NetworkError(f"Línea de estado inválida: {status_line!r}")
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == b"HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = bytearray()
+            while size := int((await reader.readline()).split(b";")[0], 16):
+                body += await reader.readexactly(size)
+                await reader.readline()
+            while await reader.readline() not in (b"\r\n", b"\n", b""):
+                pass  # trailers
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body, keep_alive = await reader.read(), False
+        return status, bytes(body), keep_alive
+
+    async def close(self) -> None:
+        for idle in self._idle.values():
+            while idle:
+                _, writer = idle.pop()
+                writer.close()
+        self._idle.clear()
+
+
+async def iter_calls(urls: Iterable[str], pool: ConnectionPool,
+                     max_concurrency: int = NETWORK_MAX_CONCURRENCY,
+                     per_host: int = NETWORK_PER_HOST_LIMIT,
+                     call_timeout: Optional[float] = NETWORK_CALL_TIMEOUT,
+                     deadline: Optional[float] = NETWORK_DEADLINE or None) -> AsyncIterator[CallResult]:
+    """
+    Lanza como mucho 'max_concurrency' llamadas a la vez (y 'per_host' por
+    host) y entrega cada CallResult en cuanto termina. Solo existen
+    'max_concurrency' tareas, no una por URL, y una tarea solo toma una URL
+    cuyo host tiene hueco: las de hosts saturados esperan en la cola de su
+    host sin ocupar capacidad global. Al vencer 'deadline' las llamadas en
+    curso y las pendientes se entregan con asyncio.TimeoutError.
+    """
+    loop = asyncio.get_running_loop()
+    ends_at = loop.time() + deadline if deadline else None
+    pending = iter(enumerate(urls))
+    started: Dict[int, str] = {}
+    results: asyncio.Queue = asyncio.Queue()
+    # URLs leídas cuyo host estaba lleno, por host y en orden de llegada
+    waiting: Dict[HostKey, Deque[Tuple[int, str]]] = {}
+    active: Dict[HostKey, int] = collections.Counter()
+    freed = asyncio.Condition()
+
+    def take() -> Optional[Tuple[int, str, HostKey]]:
+        # La URL más antigua de un host con hueco; None si no hay ninguna
+        ready = [key for key, queue in waiting.items() if active[key] < per_host]
+        if ready:
+            key = min(ready, key=lambda k: waiting[k][0][0])
+            index, url = waiting[key].popleft()
+            if not waiting[key]:
+                del waiting[key]
+            return index, url, key
+        for index, url in pending:
+            try:
+                key = host_key(url)
+            except ValueError as e:
+                results.put_nowait(CallResult(url, None, e, 0.0))
+                continue
+            if active[key] < per_host:
+                return index, url, key
+            waiting.setdefault(key, collections.deque()).append((index, url))
+        return None
+
+    async def call(url: str) -> CallResult:
+        start = time.perf_counter()
+        try:
+            timeout = call_timeout
+            if ends_at is not None:
+                remaining = ends_at - loop.time()
+                timeout = remaining if timeout is None else min(timeout, remaining)
+            result = await asyncio.wait_for(pool.request(url), timeout)
+            return CallResult(url, result, None, time.perf_counter() - start)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return CallResult(url, None, e, time.perf_counter() - start)
+
+    async def worker() -> None:
+        while True:
+            job = take()
+            if job is None:
+                if not waiting:
+                    return
+                # Todos los hosts con URLs pendientes están llenos
+                async with freed:
+                    await freed.wait()
+                continue
+            index, url, key = job
+            started[index] = url
+            active[key] += 1
+            results.put_nowait(await call(url))
+            active[key] -= 1
+            del started[index]
+            async with freed:
+                freed.notify_all()
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, max_concurrency))]
+    done = asyncio.ensure_future(asyncio.gather(*workers))
+    try:
+        while True:
+            getter = asyncio.ensure_future(results.get())
+            timeout = None if ends_at is None else max(ends_at - loop.time(), 0)
+            finished, _ = await asyncio.wait({getter, done}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if getter in finished:
+                yield getter.result()
+                continue
+            getter.cancel()
+            if done in finished and results.empty():
+                done.result()
+                return
+            if not finished:
+                break  # Plazo global agotado
+        # Lo que quedó en curso o sin empezar se entrega como timeout
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        while not results.empty():
+            yield results.get_nowait()
+        queued = sorted(item for queue in waiting.values() for item in queue)
+        leftovers = list(started.values()) + [url for _, url in queued] + [url for _, url in pending]
+        logger.warning("Plazo global de %.1fs agotado con %d llamadas sin terminar", deadline, len(leftovers))
+        for url in leftovers:
+            yield CallResult(url, None, asyncio.TimeoutError(f"Plazo global agotado: {url}"), 0.0)
+    finally:
+        for task in workers:
+            task.cancel()
+        done.cancel()
+        await asyncio.gather(done, *workers, return_exceptions=True)
+
+
+async def gather_calls(urls: List[str], pool: ConnectionPool, **limits) -> List[CallResult]:
+    """Todos los resultados en el orden de 'urls'."""
+    position = {}
+    for index, url in enumerate(urls):
+        position.setdefault(url, []).append(index)
+    ordered: List[Optional[CallResult]] = [None] * len(urls)
+    async for result in iter_calls(urls, pool, **limits):
+        ordered[position[result.url].pop(0)] = result
+    return ordered
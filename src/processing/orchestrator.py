@@ -1,38 +1,354 @@
 """
-io_bound.py
-Funciones para simular tareas I/O-bound (asyncio y ThreadPoolExecutor).
+orchestrator.py
+Planificador del pipeline ingesta → análisis → manejo (la normalización se
+hace por lotes al empezar el análisis).
+Cada etapa tiene su propia cola de entrada y límite de concurrencia; el
+orquestador gestiona el arranque, la pausa, el drenado ordenado ante SIGTERM
+y la cancelación con plazo.
 """
 import asyncio
 import logging
-from typing import List
-
-# Configuración del logger
-logger = logging.getLogger("IOBound")
-logger.setLevel(logging.INFO)
-handler = logging.StreamHandler()
-formatter = logging.Formatter("[%(asctime)s] %(levelname)s - %(name)s - %(message)s")
-handler.setFormatter(formatter)
-logger.addHandler(handler)
-
-async def simulate_network_call(url: str) -> str:
-    """Simula una llamada de red asíncrona."""
-    logger.info(f"Simulando llamada a {url}")
-    await asyncio.sleep(1)  # Simula latencia
-    return f"Respuesta simulada de {url}"
-
-async def read_file_async(file_path: str) -> str:
-    """Lee un archivo de forma asíncrona (simulación)."""
-    logger.info(f"Leyendo archivo: {file_path}")
-    await asyncio.sleep(0.5)
-    return f"Contenido simulado de {file_path}"
-
-async def write_file_async(file_path: str, content: str) -> None:
-    """Escribe contenido en un archivo de forma asíncrona (simulación)."""
-    logger.info(f"Escribiendo en archivo: {file_path}")
-    await asyncio.sleep(0.5)
-    logger.info("Escritura completada")
-
-async def batch_network_calls(urls: List[str]) -> List[str]:
-    """Realiza múltiples llamadas de red concurrentes usando asyncio.gather."""
-    tasks = [simulate_network_call(url) for url in urls]
-    return await asyncio.gather(*tasks)
\ No newline at end of file
+import signal
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from src.config.settings import (
+    BATCH_LINGER_MS,
+    BATCH_SIZE,
+    INGEST_INTERVAL,
+    REPLAY_MODE,
+    REPLAY_RATE,
+    SHUTDOWN_DEADLINE,
+    STAGE_CONCURRENCY,
+)
+from src.metrics.tracing import TRACE_KEY, BatchTrace, Tracer, current_batch
+from src.processing.backpressure import BoundedQueue
+from src.processing.batching import drain_batch
+from src.sources.pacing import Pacer
+from src.utils.normalizer import normalize_items
+from src.utils.record_batch import RecordBatch
+
+logger = logging.getLogger("Orchestrator")
+
+
+class Stage:
+    """Etapa del pipeline: función asíncrona, cola de entrada y workers."""
+
+    def __init__(self, name: str, func: Callable[..., Awaitable[Any]], concurrency: int = 1,
+                 inbox: Optional[asyncio.Queue] = None, batch_size: int = 1, linger: float = 0.0):
+        if concurrency <= 0:
+            raise ValueError(f"La concurrencia de la etapa {name} debe ser mayor que 0")
+        self.name = name
+        self.func = func
+        self.concurrency = concurrency
+        self.inbox = inbox
+        self.batch_size = batch_size
+        self.linger = linger
+        self.next: Optional["Stage"] = None
+        self.processed = 0
+        self.errors = 0
+        self.tasks: List[asyncio.Task] = []
+
+    @property
+    def is_source(self) -> bool:
+        return self.inbox is None
+
+
+class Pipeline:
+    """
+    Cadena lineal de etapas. La primera es la fuente (sin cola de entrada):
+    su función devuelve el siguiente elemento o None cuando se agota.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stages: List[Stage] = []
+        self._running = asyncio.Event()
+        self._running.set()
+        self._stopping = False
+        self.sources_done = asyncio.Event()
+        self.started_at: Optional[float] = None
+        self._sources_watcher: Optional[asyncio.Task] = None
+
+    def source(self, name: str, func: Callable[[], Awaitable[Any]], concurrency: int = 1) -> "Pipeline":
+        if self.stages:
+            raise ValueError("La fuente debe ser la primera etapa del pipeline")
+        self.stages.append(Stage(name, func, concurrency))
+        return self
+
+    def stage(self, name: str, func: Callable[[Any], Awaitable[Any]], concurrency: int = 1,
+              inbox: Optional[asyncio.Queue] = None, batch_size: int = 1, linger: float = 0.0,
+              maxsize: int = 1000) -> "Pipeline":
+        if not self.stages:
+            raise ValueError("El pipeline necesita una fuente antes de otras etapas")
+        stage = Stage(name, func, concurrency, inbox or BoundedQueue(maxsize), batch_size, linger)
+        self.stages[-1].next = stage
+        self.stages.append(stage)
+        return self
+
+    # Ciclo de vida ---------------------------------------------------------
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        for stage in self.stages:
+            worker = self._source_worker if stage.is_source else self._stage_worker
+            stage.tasks = [
+                asyncio.create_task(worker(stage), name=f"{self.name}.{stage.name}.{i}")
+                for i in range(stage.concurrency)
+            ]
+        sources = self.stages[0].tasks
+        self._sources_watcher = asyncio.create_task(self._watch_sources(sources), name=f"{self.name}.sources")
+        logger.info("Pipeline %s iniciado: %s", self.name,
+                    " → ".join(f"{s.name}({s.concurrency})" for s in self.stages))
+
+    def pause(self) -> None:
+        self._running.clear()
+
+    def resume(self) -> None:
+        self._running.set()
+
+    async def drain(self) -> None:
+        """Detiene la ingesta y espera a que cada cola quede vacía en orden."""
+        self._stopping = True
+        self.resume()
+        source = self.stages[0]
+        for task in source.tasks:
+            task.cancel()
+        await asyncio.gather(*source.tasks, return_exceptions=True)
+        await self._stop_watcher()
+        for stage in self.stages[1:]:
+            await stage.inbox.join()
+            await self._cancel_stage(stage)
+
+    async def cancel(self) -> None:
+        """Cancela todas las etapas de inmediato."""
+        self._stopping = True
+        await self._stop_watcher(cancel=True)
+        for stage in self.stages:
+            await self._cancel_stage(stage)
+
+    async def stop(self, deadline: float) -> bool:
+        """Drena con un plazo máximo; si se agota, cancela. Devuelve True si drenó."""
+        try:
+            await asyncio.wait_for(self.drain(), deadline)
+            return True
+        except asyncio.TimeoutError:
+            pending = sum(s.inbox.qsize() for s in self.stages[1:])
+            logger.warning("Pipeline %s no drenó en %.1fs; se cancelan %d elementos pendientes",
+                           self.name, deadline, pending)
+            await self.cancel()
+            return False
+
+    @staticmethod
+    async def _cancel_stage(stage: Stage) -> None:
+        for task in stage.tasks:
+            task.cancel()
+        await asyncio.gather(*stage.tasks, return_exceptions=True)
+
+    async def _stop_watcher(self, cancel: bool = False) -> None:
+        watcher = self._sources_watcher
+        if watcher is None:
+            return
+        if cancel:
+            watcher.cancel()
+        outcome, = await asyncio.gather(watcher, return_exceptions=True)
+        if isinstance(outcome, Exception):
+            logger.error("Error vigilando las fuentes de %s: %s", self.name, outcome)
+
+    async def _watch_sources(self, sources: List[asyncio.Task]) -> None:
+        await asyncio.gather(*sources, return_exceptions=True)
+        self.sources_done.set()
+
+    # Workers ---------------------------------------------------------------
+
+    async def _source_worker(self, stage: Stage) -> None:
+        while not self._stopping:
+            await self._running.wait()
+            try:
+                item = await stage.func()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                stage.errors += 1
+                logger.exception("Error en la etapa %s.%s", self.name, stage.name)
+                continue
+            if item is None:
+                return
+            stage.processed += 1
+            await self._emit(stage, item)
+
+    async def _stage_worker(self, stage: Stage) -> None:
+        while True:
+            if stage.batch_size > 1:
+                items = await drain_batch(stage.inbox, stage.batch_size, stage.linger)
+            else:
+                items = [await stage.inbox.get()]
+            try:
+                await self._running.wait()
+                output = await stage.func(items if stage.batch_size > 1 else items[0])
+                stage.processed += len(items)
+                # Se emite antes de task_done para que join() implique entrega
+                await self._emit(stage, output)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                stage.errors += len(items)
+                logger.exception("Error en la etapa %s.%s", self.name, stage.name)
+            finally:
+                for _ in items:
+                    stage.inbox.task_done()
+
+    @staticmethod
+    async def _emit(stage: Stage, item: Any) -> None:
+        if stage.next is not None and item is not None:
+            await stage.next.inbox.put(item)
+
+    # Métricas --------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        return {
+            stage.name: {
+                "processed": stage.processed,
+                "errors": stage.errors,
+                "throughput": stage.processed / elapsed if elapsed else 0.0,
+                "depth": stage.inbox.qsize() if stage.inbox else 0,
+                "concurrency": stage.concurrency,
+            }
+            for stage in self.stages
+        }
+
+
+def build_service_pipeline(service, analyze: Callable[[Any, RecordBatch], Awaitable[List[Dict[str, Any]]]],
+                           handle: Optional[Callable[[Any, Dict[str, Any]], None]] = None,
+                           concurrency: Optional[Dict[str, int]] = None,
+                           batch_size: int = BATCH_SIZE, linger: float = BATCH_LINGER_MS / 1000,
+                           pacer: Optional[Pacer] = None, tracer: Optional[Tracer] = None) -> Pipeline:
+    """
+    Declara el pipeline estándar de un servicio. La cola del servicio es la
+    entrada de la etapa de análisis, así conserva su política de backpressure.
+    Los registros se normalizan por lotes al salir de esa cola
+    (normalize_batch): los valores fuera de rango se resumen una vez por
+    lote y las filas con valores no numéricos se descartan sin perder el
+    resto del lote. Con 'tracer' cada etapa marca los registros muestreados
+    en la ingesta.
+    """
+    concurrency = {**STAGE_CONCURRENCY, **(concurrency or {})}
+    data_type = service.data_type
+    handle = handle or (lambda svc, result: svc.handle_result(result))
+    # En replay (REPLAY_MODE fast/rate) la fuente no espera INGEST_INTERVAL
+    pacer = pacer or Pacer(REPLAY_MODE, INGEST_INTERVAL[data_type], REPLAY_RATE)
+
+    async def ingest():
+        await pacer.wait()
+        raw = await service.fetch_from_source()
+        if tracer is not None and raw is not None:
+            trace = tracer.sample(data_type, raw.get("sample_id"))
+            if trace is not None:
+                raw[TRACE_KEY] = trace
+                # El registro sale de aquí directo a la cola del servicio
+                trace.enqueued = time.perf_counter()
+        return raw
+
+    async def analyze_stage(items):
+        dequeued = time.perf_counter()
+        if not isinstance(items, list):
+            items = [items]  # batch_size 1
+        traced = _pop_traces(items) if tracer is not None else []
+        batch, masks = normalize_items(items, data_type)
+        keep = masks["coerced"]
+        if not keep.all():
+            batch = batch.select(keep)
+            rows = keep.cumsum() - 1
+            traced = [(int(rows[row]), trace) for row, trace in traced if keep[row]]
+        if not len(batch):
+            return None
+        if not traced:
+            return await analyze(service, batch)
+        batch_trace = BatchTrace(dequeued, len(batch))
+        token = current_batch.set(batch_trace)
+        try:
+            results = await analyze(service, batch)
+        finally:
+            current_batch.reset(token)
+        for row, trace in traced:
+            trace.batch = batch_trace
+            results[row][TRACE_KEY] = trace
+        return results
+
+    def _pop_traces(items):
+        # (fila del lote, traza) de los registros muestreados
+        traced, row = [], 0
+        for item in items:
+            if isinstance(item, RecordBatch):
+                row += len(item)
+                continue
+            trace = item.pop(TRACE_KEY, None)
+            if trace is not None:
+                traced.append((row, trace))
+            row += 1
+        return traced
+
+    async def handle_stage(results):
+        for result in results:
+            trace = result.pop(TRACE_KEY, None) if tracer is not None else None
+            handle(service, result)
+            if trace is not None:
+                tracer.finish(trace)
+
+    return (
+        Pipeline(data_type)
+        .source("ingest", ingest, concurrency["ingest"])
+        .stage("analyze", analyze_stage, concurrency["analyze"], inbox=service.queue,
+               batch_size=batch_size, linger=linger)
+        .stage("handle", handle_stage, concurrency["handle"])
+    )
+
+
+async def run_orchestration(services: Sequence[Any],
+                            analyze: Callable[[Any, RecordBatch], Awaitable[List[Dict[str, Any]]]],
+                            handle: Optional[Callable[[Any, Dict[str, Any]], None]] = None,
+                            stop_event: Optional[asyncio.Event] = None,
+                            shutdown_deadline: float = SHUTDOWN_DEADLINE,
+                            pacing: Optional[Callable[[str], Pacer]] = None,
+                            tracer: Optional[Tracer] = None) -> List[Pipeline]:
+    """
+    Arranca un pipeline por servicio y lo mantiene hasta recibir SIGTERM/SIGINT
+    (o 'stop_event'), o hasta que todas las fuentes se agoten. Después drena
+    las colas en orden y cancela lo que quede al vencer el plazo. 'pacing'
+    crea el ritmo de ingesta de cada flujo (por defecto, REPLAY_MODE) y
+    'tracer' activa las trazas por etapa.
+    """
+    loop = asyncio.get_running_loop()
+    stop_event = stop_event or asyncio.Event()
+    pipelines = [build_service_pipeline(service, analyze, handle, pacer=pacing(service.data_type) if pacing else None,
+                                        tracer=tracer)
+                 for service in services]
+
+    installed = []
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+            installed.append(sig)
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass  # Plataformas o hilos sin soporte de señales en el loop
+
+    for pipeline in pipelines:
+        pipeline.start()
+
+    sources_done = asyncio.ensure_future(asyncio.gather(*(p.sources_done.wait() for p in pipelines)))
+    stop_requested = asyncio.ensure_future(stop_event.wait())
+    try:
+        await asyncio.wait({sources_done, stop_requested}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        sources_done.cancel()
+        stop_requested.cancel()
+        await asyncio.gather(sources_done, stop_requested, return_exceptions=True)
+        logger.info("Drenando pipelines (plazo %.1fs)", shutdown_deadline)
+        await asyncio.gather(*(p.stop(shutdown_deadline) for p in pipelines))
+        for sig in installed:
+            loop.remove_signal_handler(sig)
+        for pipeline in pipelines:
+            logger.info("Rendimiento por etapa de %s: %s", pipeline.name, pipeline.stats())
+
+    return pipelines
@@ -0,0 +1,149 @@
+"""
+primes.py
+Criba de Eratóstenes segmentada: solo impares, segmentos que caben en caché
+repartidos entre el pool de procesos para rangos grandes, resultados en un
+array de NumPy y una caché que crece por incrementos (pedir primos hasta
+10**8 después de 10**7 solo criba el tramo nuevo).
+"""
+import logging
+import math
+import threading
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.config.settings import PROCESS_POOL_SIZE, SIEVE_PARALLEL_MIN, SIEVE_SEGMENT
+from src.processing.process_pool import process_executor
+
+logger = logging.getLogger("Primes")
+
+PRIME_DTYPE = np.int64
+
+
+def sieve_segment(lo: int, hi: int, base_primes: np.ndarray) -> np.ndarray:
+    """
+    Primos en [lo, hi). 'base_primes' debe contener los primos impares hasta
+    isqrt(hi - 1). Solo se representan los impares: un byte por cada dos números.
+    """
+    lo = max(lo, 2)
+    if hi <= lo:
+        return np.empty(0, dtype=PRIME_DTYPE)
+    first = lo | 1
+    count = (hi - first + 1) // 2
+    is_prime = np.ones(max(count, 0), dtype=np.bool_)
+    for p in base_primes.tolist():
+        start = p * p
+        if start >= hi:
+            break
+        if start < first:
+            start = -(-first // p) * p
+            if not start & 1:
+                start += p
+        is_prime[(start - first) // 2::p] = False
+    primes = first + 2 * np.flatnonzero(is_prime).astype(PRIME_DTYPE)
+    if lo == 2:
+        primes = np.concatenate((np.array([2], dtype=PRIME_DTYPE), primes))
+    return primes
+
+
+class PrimeSieve:
+    """
+    Caché creciente de primos. primes_up_to(limit) solo criba (limit_actual,
+    limit]; los segmentos se reparten entre procesos cuando el tramo nuevo
+    supera 'parallel_min' números. Segura entre hilos.
+    """
+
+    def __init__(self, segment: int = SIEVE_SEGMENT, parallel_min: int = SIEVE_PARALLEL_MIN,
+                 executor: Optional[Executor] = None):
+        self.segment = segment
+        self.parallel_min = parallel_min
+        self.executor = executor
+        self._primes = np.empty(0, dtype=PRIME_DTYPE)
+        self._limit = 1
+        self._lock = threading.RLock()
+
+    @property
+    def limit(self) -> int:
+        """Mayor número ya cribado."""
+        return self._limit
+
+    def __len__(self) -> int:
+        return len(self._primes)
+
+    def primes_up_to(self, limit: int) -> np.ndarray:
+        """Primos <= limit (vista de solo lectura sobre la caché)."""
+        if limit > self._limit:
+            self._extend(limit)
+        primes = self._primes
+        view = primes[:np.searchsorted(primes, limit, side="right")]
+        view.flags.writeable = False
+        return view
+
+    def iter_primes(self, limit: Optional[int] = None) -> Iterator[int]:
+        """
+        Generador de primos <= limit (sin límite si es None). Lo ya cribado
+        sale de la caché; el resto se criba segmento a segmento sin guardarlo,
+        así que la memoria no crece con 'limit'.
+        """
+        covered = self._limit if limit is None else min(limit, self._limit)
+        cached = self.primes_up_to(covered)
+        for start in range(0, len(cached), self.segment):
+            yield from cached[start:start + self.segment].tolist()
+        lo = covered + 1
+        while limit is None or lo <= limit:
+            hi = lo + self.segment if limit is None else min(lo + self.segment, limit + 1)
+            yield from sieve_segment(lo, hi, self._base_primes(hi - 1)).tolist()
+            lo = hi
+
+    def _base_primes(self, limit: int) -> np.ndarray:
+        # Primos impares hasta isqrt(limit), también desde la caché
+        base = self.primes_up_to(math.isqrt(limit))
+        return base[1:] if len(base) else base
+
+    def _extend(self, limit: int) -> None:
+        with self._lock:
+            if limit <= self._limit:
+                return
+            base = self._base_primes(limit)
+            ranges = _segments(self._limit + 1, limit + 1, self.segment)
+            parallel = self.executor is not None or PROCESS_POOL_SIZE > 1
+            if parallel and len(ranges) > 1 and limit - self._limit >= self.parallel_min:
+                executor = self.executor or process_executor()
+                logger.debug("Criba de %d a %d en %d segmentos paralelos", self._limit + 1, limit, len(ranges))
+                chunks = list(executor.map(sieve_segment, *zip(*ranges), [base] * len(ranges)))
+            else:
+                chunks = [sieve_segment(lo, hi, base) for lo, hi in ranges]
+            self._primes = np.concatenate([self._primes] + chunks)
+            self._limit = limit
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Guarda la caché (.npz) para reutilizarla en otro proceso."""
+        with self._lock:
+            np.savez(path, primes=self._primes, limit=self._limit)
+
+    def load(self, path: Union[str, Path]) -> None:
+        """Carga una caché guardada con save() si cubre más que la actual."""
+        with np.load(path) as data:
+            primes, limit = data["primes"].astype(PRIME_DTYPE), int(data["limit"])
+        with self._lock:
+            if limit > self._limit:
+                self._primes, self._limit = primes, limit
+
+
+def _segments(lo: int, hi: int, size: int) -> List[Tuple[int, int]]:
+    return [(start, min(start + size, hi)) for start in range(lo, hi, size)]
+
+
+_sieve = PrimeSieve()
+
+
+def primes_up_to(limit: int) -> np.ndarray:
+    """Primos <= limit como array de NumPy, con la caché del proceso."""
+    return _sieve.primes_up_to(limit)
+
+
+def iter_primes(limit: Optional[int] = None) -> Iterator[int]:
+    """Generador de primos <= limit con la caché del proceso."""
+    return _sieve.iter_primes(limit)
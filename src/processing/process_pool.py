@@ -0,0 +1,30 @@
+"""
+process_pool.py
+Pool de procesos compartido por los núcleos CPU-bound (matmul, criba,
+factorial), creado en el primer uso con PROCESS_POOL_SIZE procesos.
+"""
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from src.config.settings import PROCESS_POOL_SIZE
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def process_executor() -> ProcessPoolExecutor:
+    """Pool de procesos para los núcleos CPU-bound, creado en el primer uso."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=PROCESS_POOL_SIZE)
+        return _executor
+
+
+def shutdown_process_executor() -> None:
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
@@ -0,0 +1,218 @@
+"""
+rolling_stats.py
+Detector con estado por sample_id: media y varianza EWMA actualizadas en
+O(1) por lectura (sin ventanas ni historial), alarmas por z-score y por
+cambio brusco entre lecturas consecutivas. El almacén está acotado (LRU más
+TTL) y puede guardarse y restaurarse para no perder las líneas base al
+reiniciar el proceso.
+"""
+import asyncio
+import collections
+import json
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+from src.config.settings import (
+    ROLLING_ALPHA,
+    ROLLING_MAX_ENTRIES,
+    ROLLING_TTL_SECONDS,
+    ROLLING_WARMUP,
+    ROLLING_Z_THRESHOLD,
+)
+from src.processing.io_bound import run_io
+
+logger = logging.getLogger("RollingStats")
+
+# 2: contador de observaciones por campo (antes, uno por muestra)
+SNAPSHOT_VERSION = 2
+
+
+class _Baseline:
+    """Estado de una muestra: última vez vista y, por campo, lecturas válidas, media, varianza y último valor."""
+    __slots__ = ("count", "seen", "mean", "var", "last")
+
+    def __init__(self, fields: int, seen: float):
+        self.count = [0] * fields
+        self.seen = seen
+        self.mean = [0.0] * fields
+        self.var = [0.0] * fields
+        self.last = [0.0] * fields
+
+
+class RollingStatsDetector:
+    """
+    'fields' asocia cada campo a sus límites: 'max_step' (cambio máximo entre
+    lecturas consecutivas; 0 lo desactiva) y 'min_std' (suelo de la
+    desviación típica, para que una serie constante no dispare el z-score
+    con ruido mínimo). Las alarmas de un campo solo se evalúan tras 'warmup'
+    lecturas válidas; un valor no finito (NaN de una conversión fallida) no
+    se compara ni entra en la línea base.
+    """
+
+    def __init__(self, fields: Mapping[str, Mapping[str, float]], alpha: float = ROLLING_ALPHA,
+                 z_threshold: float = ROLLING_Z_THRESHOLD, warmup: int = ROLLING_WARMUP,
+                 max_entries: int = ROLLING_MAX_ENTRIES, ttl: float = ROLLING_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha debe estar en (0, 1]")
+        self.fields = list(fields)
+        self.max_step = [float(fields[f].get("max_step", 0.0)) for f in self.fields]
+        self.min_std = [float(fields[f].get("min_std", 0.0)) for f in self.fields]
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.warmup = warmup
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "collections.OrderedDict[str, _Baseline]" = collections.OrderedDict()
+        self.updates = 0
+        self.alarms = 0
+        self.evicted = 0
+        self.expired = 0
+
+    def observe(self, sample_id: str, values: Mapping[str, float]) -> Dict[str, Any]:
+        """
+        Compara la lectura con la línea base de la muestra y la incorpora.
+        Devuelve {"zscores": {campo: z}, "alarms": ["campo:zscore" | "campo:step", ...]}.
+        """
+        now = self.clock()
+        baseline = self._entries.get(sample_id)
+        if baseline is not None and self.ttl > 0 and now - baseline.seen > self.ttl:
+            del self._entries[sample_id]  # Línea base caducada: se empieza de cero
+            baseline = None
+            self.expired += 1
+        if baseline is None:
+            baseline = _Baseline(len(self.fields), now)
+            self._entries[sample_id] = baseline
+            self._evict(now)
+        else:
+            self._entries.move_to_end(sample_id)
+
+        zscores: Dict[str, float] = {}
+        alarms: List[str] = []
+        alpha = self.alpha
+        for i, field in enumerate(self.fields):
+            x = float(values[field])
+            if not math.isfinite(x):
+                continue
+            count = baseline.count[i]
+            if count == 0:
+                baseline.mean[i] = x
+            else:
+                diff = x - baseline.mean[i]
+                std = max(math.sqrt(baseline.var[i]), self.min_std[i])
+                z = diff / std if std > 0 else (0.0 if diff == 0 else math.copysign(math.inf, diff))
+                zscores[field] = z
+                if count >= self.warmup:
+                    if abs(z) > self.z_threshold:
+                        alarms.append(f"{field}:zscore")
+                    if self.max_step[i] and abs(x - baseline.last[i]) > self.max_step[i]:
+                        alarms.append(f"{field}:step")
+                # EWMA de media y varianza (actualización incremental)
+                incr = alpha * diff
+                baseline.mean[i] += incr
+                baseline.var[i] = (1.0 - alpha) * (baseline.var[i] + diff * incr)
+            baseline.last[i] = x
+            baseline.count[i] = count + 1
+        baseline.seen = now
+        self.updates += 1
+        self.alarms += bool(alarms)
+        return {"zscores": zscores, "alarms": alarms}
+
+    def _evict(self, now: float) -> None:
+        # El orden LRU es también el de última lectura: las caducadas están al principio
+        while self._entries and self.ttl > 0:
+            oldest = next(iter(self._entries.values()))
+            if now - oldest.seen <= self.ttl:
+                break
+            self._entries.popitem(last=False)
+            self.expired += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def baseline(self, sample_id: str) -> Optional[Dict[str, Dict[str, float]]]:
+        """Media y desviación típica actuales por campo, o None si no hay línea base."""
+        baseline = self._entries.get(sample_id)
+        if baseline is None:
+            return None
+        return {field: {"mean": baseline.mean[i], "std": math.sqrt(baseline.var[i])}
+                for i, field in enumerate(self.fields)}
+
+    # Persistencia ----------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Estado serializable; las marcas de tiempo se guardan como antigüedad
+        más la hora de guardado, para descontar el tiempo sin proceso al restaurar.
+        """
+        now = self.clock()
+        return {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": time.time(),
+            "fields": self.fields,
+            "alpha": self.alpha,
+            "entries": [
+                [sample_id, list(b.count), now - b.seen, list(b.mean), list(b.var), list(b.last)]
+                for sample_id, b in self._entries.items()
+            ],
+        }
+
+    def restore(self, snapshot: Mapping[str, Any]) -> int:
+        """Carga un snapshot de los mismos campos. Devuelve cuántas líneas base se restauraron."""
+        if snapshot.get("version") != SNAPSHOT_VERSION or list(snapshot.get("fields", [])) != self.fields:
+            logger.warning("Snapshot de estadísticas incompatible (versión %s, campos %s); se ignora",
+                           snapshot.get("version"), snapshot.get("fields"))
+            return 0
+        now = self.clock()
+        downtime = max(0.0, time.time() - snapshot.get("saved_at", time.time()))
+        self._entries.clear()
+        for sample_id, count, age, mean, var, last in snapshot["entries"]:
+            baseline = _Baseline(len(self.fields), now - age - downtime)
+            baseline.count, baseline.mean = list(count), list(mean)
+            baseline.var, baseline.last = list(var), list(last)
+            self._entries[sample_id] = baseline
+        self._evict(now)
+        return len(self._entries)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Escribe el snapshot en JSON de forma atómica (fichero temporal y rename)."""
+        write_snapshot(path, self.snapshot())
+
+    def load(self, path: Union[str, Path]) -> int:
+        path = Path(path)
+        if not path.exists():
+            return 0
+        with open(path, encoding="utf-8") as f:
+            return self.restore(json.load(f))
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "updates": self.updates, "alarms": self.alarms,
+                "evicted": self.evicted, "expired": self.expired}
+
+
+def write_snapshot(path: Union[str, Path], snapshot: Mapping[str, Any]) -> None:
+    """Escritura atómica de un snapshot ya capturado (puede hacerse en otro hilo)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp, path)
+
+
+async def persist_periodically(detector: RollingStatsDetector, path: Union[str, Path], interval: float) -> None:
+    """Guarda el snapshot cada 'interval' segundos; la escritura ocurre en el pool de E/S."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_io(write_snapshot, path, detector.snapshot())
+        except OSError as e:
+            logger.error("No se pudo guardar el snapshot de estadísticas en %s: %s", path, e)
@@ -0,0 +1,149 @@
+"""
+router.py
+Enrutado adaptativo de lotes entre ejecución inline, hilos o procesos según
+el coste observado de cada servicio y tamaño de lote.
+"""
+import asyncio
+import collections
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.metrics import tracing
+from src.processing.workers import WorkerPool, analyze_pickled
+from src.utils.record_batch import RecordBatch
+
+logger = logging.getLogger("ExecutionRouter")
+
+MODES = ("inline", "thread", "process")
+
+RouteKey = Tuple[str, int]
+
+
+class _RouteState:
+    """Coste EWMA por modo y estado de histéresis de una ruta."""
+    __slots__ = ("mode", "cost", "samples", "candidate", "streak", "decisions")
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.cost = {m: 0.0 for m in MODES}
+        self.samples = {m: 0 for m in MODES}
+        self.candidate: Optional[str] = None
+        self.streak = 0
+        self.decisions = 0
+
+
+class ExecutionRouter:
+    """
+    Elige, por (flujo, tamaño de lote), dónde ejecutar el análisis. Mide el
+    tiempo real de cada modo con una media exponencial y solo cambia de modo
+    cuando otro es mejor por un margen 'hysteresis' durante 'patience'
+    decisiones seguidas. Con mode distinto de "adaptive" la ruta es fija.
+    """
+
+    def __init__(self, worker_pool: WorkerPool, thread_pool: ThreadPoolExecutor,
+                 mode: str = "adaptive", max_in_flight: int = 4,
+                 hysteresis: float = 0.2, patience: int = 5, explore_every: int = 200,
+                 min_samples: int = 3, alpha: float = 0.2, default_mode: str = "process"):
+        if mode != "adaptive" and mode not in MODES:
+            raise ValueError(f"Modo de ejecución no soportado: {mode}")
+        self.worker_pool = worker_pool
+        self.thread_pool = thread_pool
+        self.mode = mode
+        self.hysteresis = hysteresis
+        self.patience = patience
+        self.explore_every = explore_every
+        self.min_samples = min_samples
+        self.alpha = alpha
+        self.default_mode = default_mode
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._routes: Dict[RouteKey, _RouteState] = {}
+        self.routed: Dict[Tuple[str, str], int] = collections.Counter()
+        self.switches = 0
+
+    @staticmethod
+    def route_key(batch: RecordBatch) -> RouteKey:
+        """Agrupa tamaños de lote en potencias de dos."""
+        return batch.data_type, 1 << max(len(batch) - 1, 0).bit_length()
+
+    def choose(self, key: RouteKey) -> str:
+        if self.mode != "adaptive":
+            return self.mode
+        state = self._routes.get(key)
+        if state is None:
+            state = self._routes[key] = _RouteState(self.default_mode)
+        state.decisions += 1
+
+        # Exploración inicial y periódica de los modos menos medidos
+        unexplored = [m for m in MODES if state.samples[m] < self.min_samples]
+        if unexplored:
+            return unexplored[0]
+        if state.decisions % self.explore_every == 0:
+            return min((m for m in MODES if m != state.mode), key=lambda m: state.samples[m])
+
+        best = min(MODES, key=lambda m: state.cost[m])
+        if best != state.mode and state.cost[best] < state.cost[state.mode] * (1 - self.hysteresis):
+            if state.candidate == best:
+                state.streak += 1
+            else:
+                state.candidate, state.streak = best, 1
+            if state.streak >= self.patience:
+                logger.info("Ruta %s/%d cambia de %s a %s (%.3f ms -> %.3f ms)",
+                            key[0], key[1], state.mode, best,
+                            state.cost[state.mode] * 1000, state.cost[best] * 1000)
+                state.mode, state.candidate, state.streak = best, None, 0
+                self.switches += 1
+        else:
+            state.candidate, state.streak = None, 0
+        return state.mode
+
+    def observe(self, key: RouteKey, mode: str, elapsed: float) -> None:
+        state = self._routes.get(key)
+        if state is None:
+            return
+        if state.samples[mode] == 0:
+            state.cost[mode] = elapsed
+        else:
+            state.cost[mode] += self.alpha * (elapsed - state.cost[mode])
+        state.samples[mode] += 1
+
+    async def run(self, batch: RecordBatch) -> List[Dict[str, Any]]:
+        key = self.route_key(batch)
+        mode = self.choose(key)
+        # Lote con muestras trazadas: se marca la entrega y el worker devuelve sus tiempos
+        trace = tracing.current_batch.get()
+        timed = trace is not None
+        async with self._in_flight:
+            start = time.perf_counter()
+            if timed:
+                trace.submitted, trace.mode = start, mode
+            if mode == "inline":
+                output = analyze_pickled(batch, None, timed)
+            elif mode == "thread":
+                loop = asyncio.get_running_loop()
+                output = await loop.run_in_executor(self.thread_pool, analyze_pickled, batch, None, timed)
+            elif timed:
+                output = await self.worker_pool.submit(batch, timed=True)
+            else:
+                output = await self.worker_pool.submit(batch)
+            self.observe(key, mode, time.perf_counter() - start)
+        self.routed[(batch.data_type, mode)] += 1
+        if timed:
+            results, timing = output
+            trace.record_worker(timing)
+            return results
+        return output
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "switches": self.switches,
+            "routed": {f"{data_type}:{mode}": n for (data_type, mode), n in self.routed.items()},
+            "routes": {
+                f"{data_type}/{size}": {
+                    "mode": state.mode,
+                    "cost_ms": {m: round(c * 1000, 4) for m, c in state.cost.items() if state.samples[m]},
+                }
+                for (data_type, size), state in self._routes.items()
+            },
+        }
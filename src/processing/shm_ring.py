@@ -0,0 +1,89 @@
+"""
+shm_ring.py
+Buffer circular sobre multiprocessing.shared_memory para pasar lotes a los
+workers como (offset, longitud) en lugar de un payload serializado.
+"""
+import collections
+from multiprocessing import shared_memory
+from typing import Deque, Dict, List, Optional
+
+ALIGNMENT = 64
+
+
+class SharedRingBuffer:
+    """
+    Reserva regiones contiguas en orden circular. Las regiones pueden
+    liberarse en cualquier orden; el espacio se recupera cuando se libera la
+    más antigua. Solo debe usarse desde el proceso (y hilo) que lo crea.
+    """
+
+    def __init__(self, size: int, name: Optional[str] = None):
+        self.shm = shared_memory.SharedMemory(create=True, size=size, name=name)
+        self.size = self.shm.size
+        self._live: Deque[List[int]] = collections.deque()  # [offset, tamaño, liberado]
+        self._by_offset: Dict[int, List[int]] = {}
+        self._tail = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def buf(self) -> memoryview:
+        return self.shm.buf
+
+    @property
+    def used(self) -> int:
+        return sum(entry[1] for entry in self._live)
+
+    def allocate(self, nbytes: int) -> Optional[int]:
+        """Devuelve el offset reservado o None si no hay espacio contiguo."""
+        nbytes = (nbytes + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+        if nbytes == 0 or nbytes > self.size:
+            return None
+
+        if not self._live:
+            self._tail = 0
+            offset = 0
+        else:
+            head = self._live[0][0]
+            if self._tail > head:
+                # Sin vuelta: espacio al final o, si no cabe, al principio
+                if self._tail + nbytes <= self.size:
+                    offset = self._tail
+                elif nbytes < head:
+                    offset = 0
+                else:
+                    return None
+            elif self._tail + nbytes < head:
+                offset = self._tail
+            else:
+                return None
+
+        entry = [offset, nbytes, False]
+        self._live.append(entry)
+        self._by_offset[offset] = entry
+        self._tail = offset + nbytes
+        return offset
+
+    def release(self, offset: int) -> None:
+        entry = self._by_offset.pop(offset)
+        entry[2] = True
+        while self._live and self._live[0][2]:
+            self._live.popleft()
+
+    def close(self) -> None:
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Abre un segmento creado por el proceso padre. Los workers del pool
+    comparten su resource_tracker, así que el registro duplicado es inocuo
+    y el segmento se elimina una sola vez desde SharedRingBuffer.close().
+    """
+    return shared_memory.SharedMemory(name=name)
@@ -0,0 +1,139 @@
+"""
+workers.py
+Workers de análisis sin estado: el estado por proceso (umbrales, tablas de
+análisis, segmento de memoria compartida) se prepara una sola vez con el
+initializer del pool y los lotes llegan como offsets dentro del anillo.
+Cada lote lleva la huella de la tabla de reglas vigente: si cambió, el
+worker la recarga sin reiniciar el pool. Con 'timed' el worker devuelve
+además cuándo empezó y terminó el análisis (para las trazas por etapa).
+"""
+import asyncio
+import functools
+import logging
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from src.config import rules
+from src.config.settings import ANALYSIS_THRESHOLDS
+from src.metrics.tracing import WorkerTiming
+from src.processing.shm_ring import SharedRingBuffer, attach
+from src.services.bioquimico_service import analyze_bioquimico_batch
+from src.services.fisico_service import analyze_fisico_batch
+from src.services.genetico_service import analyze_genetico_batch
+from src.utils.record_batch import RecordBatch
+
+logger = logging.getLogger("Workers")
+
+ANALYZERS: Dict[str, Callable[..., List[Dict[str, Any]]]] = {
+    "genetico": analyze_genetico_batch,
+    "bioquimico": analyze_bioquimico_batch,
+    "fisico": analyze_fisico_batch,
+}
+
+Results = List[Dict[str, Any]]
+WorkerOutput = Union[Results, Tuple[Results, WorkerTiming]]
+
+# Estado propio de cada proceso worker
+_STATE: Dict[str, Any] = {}
+
+
+def init_worker(ring_name: Optional[str], thresholds: Dict[str, Dict[str, Any]]) -> None:
+    """Initializer del pool: fija los analizadores y abre el anillo compartido."""
+    # Las señales de parada las gestiona el proceso principal, que drena el
+    # pipeline y luego cierra el pool; un worker muerto rompería el drenado.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    _init_state(ring_name, thresholds)
+
+
+def _init_state(ring_name: Optional[str], thresholds: Dict[str, Dict[str, Any]]) -> None:
+    _STATE["analyzers"] = {
+        data_type: functools.partial(func, **thresholds.get(data_type, {}))
+        for data_type, func in ANALYZERS.items()
+    }
+    _STATE["ring"] = attach(ring_name) if ring_name else None
+
+
+def _analyzer(data_type: str) -> Callable[[RecordBatch], List[Dict[str, Any]]]:
+    if "analyzers" not in _STATE:
+        # Ejecución inline o en hilos dentro del proceso principal
+        _init_state(None, ANALYSIS_THRESHOLDS)
+    return _STATE["analyzers"][data_type]
+
+
+def analyze_shared(offset: int, rules_digest: Optional[str] = None, timed: bool = False) -> WorkerOutput:
+    """Analiza el lote escrito en el anillo compartido a partir de 'offset'."""
+    start = time.perf_counter()
+    rules.ensure(rules_digest)
+    batch = RecordBatch.from_buffer(_STATE["ring"].buf, offset)
+    return _run(batch, start, timed)
+
+
+def analyze_pickled(batch: RecordBatch, rules_digest: Optional[str] = None, timed: bool = False) -> WorkerOutput:
+    """Camino alternativo cuando el lote no cabe en el anillo (y ejecución inline o en hilos)."""
+    start = time.perf_counter()
+    rules.ensure(rules_digest)
+    return _run(batch, start, timed)
+
+
+def _run(batch: RecordBatch, start: float, timed: bool) -> WorkerOutput:
+    results = _analyzer(batch.data_type)(batch)
+    if timed:
+        return results, (start, time.perf_counter(), os.getpid())
+    return results
+
+
+def _warm_up() -> bool:
+    return "analyzers" in _STATE
+
+
+class WorkerPool:
+    """
+    ProcessPoolExecutor con workers persistentes y transporte de lotes por
+    memoria compartida. Debe usarse desde un único event loop.
+    """
+
+    def __init__(self, max_workers: int, ring_bytes: int,
+                 thresholds: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.ring = SharedRingBuffer(ring_bytes) if ring_bytes > 0 else None
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=init_worker,
+            initargs=(self.ring.name if self.ring else None, thresholds or ANALYSIS_THRESHOLDS),
+        )
+        self.max_workers = max_workers
+        self.shared_batches = 0
+        self.pickled_batches = 0
+
+    async def warm_up(self) -> None:
+        """Arranca todos los workers antes de que llegue el primer lote."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _warm_up)
+                               for _ in range(self.max_workers)))
+
+    async def submit(self, batch: RecordBatch, timed: bool = False) -> WorkerOutput:
+        loop = asyncio.get_running_loop()
+        digest = rules.current().digest
+        offset = self.ring.allocate(batch.nbytes) if self.ring else None
+        if offset is None:
+            self.pickled_batches += 1
+            return await loop.run_in_executor(self.executor, analyze_pickled, batch, digest, timed)
+
+        try:
+            batch.write_into(self.ring.buf, offset)
+            future = self.executor.submit(analyze_shared, offset, digest, timed)
+        except BaseException:
+            self.ring.release(offset)
+            raise
+        # La región se libera cuando el worker termina, aunque se cancele la espera
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self.ring.release, offset))
+        self.shared_batches += 1
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+        if self.ring:
+            self.ring.close()
@@ -1,6 +1,12 @@
 """
 Servicios para análisis de datos biológicos.
 """
-from .genetico_service import GeneticoService
-from .bioquimico_service import BioquimicoService
-from .fisico_service import FisicoService
\ No newline at end of file
+from src._lazy import install
+
+_LAZY = {
+    "GeneticoService": ".genetico_service",
+    "BioquimicoService": ".bioquimico_service",
+    "FisicoService": ".fisico_service",
+}
+
+install(globals(), _LAZY)
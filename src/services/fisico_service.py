@@ -1,75 +1,82 @@
 # src/services/fisico_service.py
 
-import asyncio
 import logging
-from typing import Dict, Any
-from src.utils.normalizer import normalize_data
+from typing import Dict, Any, List, Optional, Sequence, Union
+from src.alerts import notifier
+from src.config import rules
+from src.utils.record_batch import RecordBatch
+from src.processing.backpressure import BoundedQueue
+from src.sources.adapters import open_source
+from src.processing.rolling_stats import RollingStatsDetector
+from src.config.settings import QUEUE_MAXSIZE, QUEUE_POLICY, QUEUE_SAMPLE_N, ROLLING_FIELDS
 
 # Configurar logger
 logger = logging.getLogger("FisicoService")
-logger.setLevel(logging.INFO)
 
-handler = logging.StreamHandler()
-formatter = logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s")
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+
+def analyze_fisico_batch(batch: RecordBatch, table: Optional[rules.RuleTable] = None) -> List[Dict[str, Any]]:
+    """
+    Análisis vectorizado y sin estado de un lote. No depende de la instancia
+    del servicio, por lo que un worker puede ejecutarlo sin serializarla.
+    Cada regla de alerta del flujo añade un indicador con su nombre
+    (p. ej. "temperature_alert"); todas se evalúan a la vez sobre el lote.
+    """
+    flags = (table or rules.current()).alerts("fisico").flags(batch.columns)
+    names = list(flags)
+    return [
+        {"sample_id": sample_id, **dict(zip(names, fired)), "temperature": t_value, "pressure": p_value}
+        for sample_id, t_value, p_value, *fired in zip(
+            batch.column("sample_id").to_list(), batch.column("temperature").tolist(),
+            batch.column("pressure").tolist(), *flags.values()
+        )
+    ]
+
 
 class FisicoService:
+    data_type = "fisico"
+
     def __init__(self, source: str):
         self.source = source
-        self.queue = asyncio.Queue()
-        logger.info(f"FisicoService inicializado con fuente: {self.source}")
-
-    async def ingest_data(self):
-        """
-        Simula la ingesta de datos físicos desde una fuente asíncrona.
-        """
-        while True:
-            raw_data = await self.fetch_from_source()
-            logger.debug(f"Datos crudos recibidos: {raw_data}")
-            normalized = normalize_data(raw_data, data_type="fisico")
-            await self.queue.put(normalized)
-            logger.info(f"Datos normalizados en cola: {normalized['sample_id']}")
-            await asyncio.sleep(0.3)  # Simula latencia
+        self.reader = open_source(source, self.data_type)
+        self.queue = BoundedQueue(QUEUE_MAXSIZE[self.data_type], QUEUE_POLICY, QUEUE_SAMPLE_N)
+        # Líneas base por sample_id; el manejo de resultados ocurre en el proceso principal
+        self.detector = RollingStatsDetector(ROLLING_FIELDS[self.data_type])
+        logger.info("FisicoService inicializado con fuente: %s", self.source)
 
-    async def fetch_from_source(self) -> Dict[str, Any]:
+    async def fetch_from_source(self) -> Optional[Dict[str, Any]]:
         """
-        Simula la obtención de datos físicos.
+        Obtiene la siguiente muestra de datos físicos de la fuente
+        configurada, o None si la fuente (un fichero) se ha agotado.
         """
-        return {
-            "sample_id": "F789",
-            "temperature": 36.7,
-            "pressure": 101.3
-        }
-
-    async def process_data(self):
-        """
-        Procesa datos normalizados desde la cola.
-        """
-        while True:
-            data = await self.queue.get()
-            logger.info(f"Procesando muestra: {data['sample_id']}")
-            result = self.analyze(data)
-            self.handle_result(result)
-            self.queue.task_done()
+        return await self.reader.read()
 
     def analyze(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analiza parámetros físicos.
         """
-        result = {
-            "sample_id": data["sample_id"],
-            "temperature_alert": data["temperature"] < 35.0 or data["temperature"] > 38.0,
-            "pressure_alert": data["pressure"] < 98.0 or data["pressure"] > 105.0
-        }
-        logger.debug(f"Resultado del análisis: {result}")
+        result = analyze_fisico_batch(RecordBatch.from_records([data], self.data_type))[0]
+        logger.debug("Resultado del análisis: %s", result)
         return result
 
+    def analyze_batch(self, records: Union[RecordBatch, Sequence[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Analiza un lote de muestras en una sola llamada (una tarea de executor por lote).
+        Acepta un RecordBatch columnar o una lista de registros normalizados.
+        """
+        return analyze_fisico_batch(RecordBatch.coerce(records, self.data_type))
+
     def handle_result(self, result: Dict[str, Any]):
         """
-        Maneja el resultado del análisis.
+        Maneja el resultado del análisis: reglas de la tabla (una alerta por
+        tipo) y desviación respecto a la línea base de la muestra (EWMA).
         """
-        if result["temperature_alert"] or result["pressure_alert"]:
-            logger.warning(f"[ALERTA] Parámetros físicos fuera de rango: {result}")
-        else:
-            logger.info(f"Resultado normal: {result}")
\ No newline at end of file
+        result.update(self.detector.observe(result["sample_id"], result))
+        fired = rules.current().alerts(self.data_type).fired(result)
+        for rule in fired:
+            event = notifier.alert_event("fisico", result, rule.alert, rule.message, rule.severity)
+            notifier.send_alert(event)
+        if result["alarms"]:
+            event = notifier.alert_event("fisico", result, "desviacion", "Desviación física detectada")
+            notifier.send_alert(event)
+        if not (fired or result["alarms"]):
+            logger.info("Resultado normal: %s", result)
\ No newline at end of file
@@ -1,78 +1,83 @@
 # src/services/genetico_service.py
 
-import asyncio
 import logging
-from typing import Dict, Any
-from src.utils.normalizer import normalize_data
+from typing import Dict, Any, List, Optional, Sequence, Union
+import numpy as np
+from src.alerts import notifier
+from src.utils.record_batch import RecordBatch
+from src.processing.backpressure import BoundedQueue
+from src.sources.adapters import open_source
+from src.processing.motifs import Panel, get_scanner
+from src.config.settings import QUEUE_MAXSIZE, QUEUE_POLICY, QUEUE_SAMPLE_N, ANALYSIS_THRESHOLDS
 
 # Configurar logger
 logger = logging.getLogger("GeneticoService")
-logger.setLevel(logging.INFO)
 
-# Puedes configurar el handler en main.py para centralizarlo
-handler = logging.StreamHandler()
-formatter = logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s")
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+MOTIF_PANEL = ANALYSIS_THRESHOLDS["genetico"]["panel"]
+
+
+def analyze_genetico_batch(batch: RecordBatch, panel: Panel = MOTIF_PANEL) -> List[Dict[str, Any]]:
+    """
+    Análisis vectorizado y sin estado de un lote. No depende de la instancia
+    del servicio, por lo que un worker puede ejecutarlo sin serializarla.
+    Busca los motivos del panel en todas las secuencias en una sola pasada;
+    'mutation_detected' es el primer motivo del panel encontrado (None si no
+    hay ninguno) y la confianza es la calidad de la muestra.
+    """
+    scanner = get_scanner(panel)
+    found = scanner.scan(batch.column("sequence"))
+    detected = found.any(axis=1)
+    confidence = np.where(detected, np.clip(batch.column("quality"), 0.0, 1.0), 0.0).tolist()
+    first = found.argmax(axis=1).tolist()
+    names = scanner.names
+    return [
+        {
+            "sample_id": sample_id,
+            "mutation_detected": names[first[i]] if detected[i] else None,
+            "motifs": [names[j] for j in np.flatnonzero(found[i])] if detected[i] else [],
+            "confidence": confidence[i],
+        }
+        for i, sample_id in enumerate(batch.column("sample_id").to_list())
+    ]
+
 
 class GeneticoService:
+    data_type = "genetico"
+
     def __init__(self, source: str):
         self.source = source
-        self.queue = asyncio.Queue()
-        logger.info(f"GeneticoService inicializado con fuente: {self.source}")
-
-    async def ingest_data(self):
-        """
-        Simula la ingesta de datos genéticos desde una fuente asíncrona.
-        """
-        while True:
-            raw_data = await self.fetch_from_source()
-            logger.debug(f"Datos crudos recibidos: {raw_data}")
-            normalized = normalize_data(raw_data, data_type="genetico")
-            await self.queue.put(normalized)
-            logger.info(f"Datos normalizados en cola: {normalized['sample_id']}")
-            await asyncio.sleep(0.1)
+        self.reader = open_source(source, self.data_type)
+        self.queue = BoundedQueue(QUEUE_MAXSIZE[self.data_type], QUEUE_POLICY, QUEUE_SAMPLE_N)
+        logger.info("GeneticoService inicializado con fuente: %s", self.source)
 
-    async def fetch_from_source(self) -> Dict[str, Any]:
+    async def fetch_from_source(self) -> Optional[Dict[str, Any]]:
         """
-        Simula la obtención de datos genéticos.
+        Obtiene la siguiente muestra de datos genéticos de la fuente
+        configurada, o None si la fuente (un fichero) se ha agotado.
         """
-        # Simulación de datos
-        return {
-            "sample_id": "G123",
-            "sequence": "ATCGTTAG",
-            "quality": 0.98
-        }
-
-    async def process_data(self):
-        """
-        Procesa datos normalizados desde la cola.
-        """
-        while True:
-            data = await self.queue.get()
-            logger.info(f"Procesando muestra: {data['sample_id']}")
-            result = self.analyze(data)
-            self.handle_result(result)
-            self.queue.task_done()
+        return await self.reader.read()
 
     def analyze(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analiza la secuencia genética.
         """
-        # Lógica de análisis genético (placeholder)
-        result = {
-            "sample_id": data["sample_id"],
-            "mutation_detected": "TP53",
-            "confidence": 0.95
-        }
-        logger.debug(f"Resultado del análisis: {result}")
+        result = analyze_genetico_batch(RecordBatch.from_records([data], self.data_type))[0]
+        logger.debug("Resultado del análisis: %s", result)
         return result
 
+    def analyze_batch(self, records: Union[RecordBatch, Sequence[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Analiza un lote de muestras en una sola llamada (una tarea de executor por lote).
+        Acepta un RecordBatch columnar o una lista de registros normalizados.
+        """
+        return analyze_genetico_batch(RecordBatch.coerce(records, self.data_type))
+
     def handle_result(self, result: Dict[str, Any]):
         """
         Maneja el resultado del análisis.
         """
-        if result["confidence"] > 0.9:
-            logger.warning(f"[ALERTA] Mutación crítica detectada: {result}")
+        if result["mutation_detected"] and result["confidence"] > 0.9:
+            event = notifier.alert_event("genetico", result, "mutacion", "Mutación crítica detectada")
+            notifier.send_alert(event)
         else:
-            logger.info(f"Resultado no crítico: {result}")
\ No newline at end of file
+            logger.info("Resultado no crítico: %s", result)
\ No newline at end of file
@@ -0,0 +1,12 @@
+"""
+Fuentes de datos de los servicios y ritmo de ingesta/replay.
+"""
+from src._lazy import install
+
+_LAZY = {
+    "open_source": ".adapters",
+    "write_binary": ".adapters",
+    "Pacer": ".pacing",
+}
+
+install(globals(), _LAZY)
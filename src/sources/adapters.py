@@ -0,0 +1,279 @@
+"""
+adapters.py
+Fuentes de datos intercambiables para los servicios: flujo simulado,
+carga sintética, ficheros NDJSON y CSV leídos por bloques y ficheros
+binarios de registros de ancho fijo proyectados con mmap. Todas exponen read(), que devuelve el
+siguiente registro o None cuando la fuente se agota.
+"""
+import collections
+import csv
+import io
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from src.config.settings import SOURCE_CHUNK_BYTES, SOURCE_CHUNK_RECORDS, SYNTHETIC_LIMIT
+from src.processing.io_bound import run_io
+from src.sources.synthetic import SyntheticGenerator
+
+logger = logging.getLogger("Sources")
+
+Record = Dict[str, Any]
+
+# Muestras del flujo simulado (DATA_SOURCES sin fichero detrás)
+SIMULATED_SAMPLES: Dict[str, Record] = {
+    "genetico": {"sample_id": "G123", "sequence": "ATCGTTAG", "quality": 0.98},
+    "bioquimico": {"sample_id": "B456", "ph": 7.4, "enzyme_activity": 120.5},
+    "fisico": {"sample_id": "F789", "temperature": 36.7, "pressure": 101.3},
+}
+
+# Registros binarios de ancho fijo por flujo (cadenas ASCII rellenas con ceros)
+BINARY_LAYOUTS: Dict[str, np.dtype] = {
+    "genetico": np.dtype([("sample_id", "S16"), ("sequence", "S256"), ("quality", "<f8")]),
+    "bioquimico": np.dtype([("sample_id", "S16"), ("ph", "<f8"), ("enzyme_activity", "<f8")]),
+    "fisico": np.dtype([("sample_id", "S16"), ("temperature", "<f8"), ("pressure", "<f8")]),
+}
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+CSV_SUFFIXES = (".csv",)
+BINARY_SUFFIXES = (".bin", ".dat")
+SYNTHETIC_URI = "synthetic"
+
+
+class Source:
+    """
+    Base de las fuentes: mantiene un búfer de registros y lo rellena por
+    bloques con _fill(), que devuelve una lista vacía al llegar al final.
+    """
+
+    def __init__(self, data_type: str):
+        self.data_type = data_type
+        self.records_read = 0
+        self._buffer: Deque[Record] = collections.deque()
+        self._exhausted = False
+
+    async def read(self) -> Optional[Record]:
+        if not self._buffer and not self._exhausted:
+            chunk = await self._fill()
+            if chunk:
+                self._buffer.extend(chunk)
+            else:
+                self._exhausted = True
+                self.close()
+        if not self._buffer:
+            return None
+        self.records_read += 1
+        return self._buffer.popleft()
+
+    async def _fill(self) -> List[Record]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SimulatedSource(Source):
+    """Flujo infinito con la muestra fija de cada tipo (comportamiento original)."""
+
+    async def read(self) -> Optional[Record]:
+        self.records_read += 1
+        return dict(SIMULATED_SAMPLES[self.data_type])
+
+
+class SyntheticSource(Source):
+    """
+    Carga sintética (src.sources.synthetic) en bloques de 'chunk_records'
+    registros; se agota tras 'limit' registros (0: infinita). Los demás
+    argumentos se pasan a SyntheticGenerator.
+    """
+
+    def __init__(self, data_type: str, limit: int = SYNTHETIC_LIMIT, chunk_records: int = SOURCE_CHUNK_RECORDS,
+                 **generator_options):
+        super().__init__(data_type)
+        self.generator = SyntheticGenerator(data_type, **generator_options)
+        self.limit = limit
+        self.chunk_records = chunk_records
+
+    async def _fill(self) -> List[Record]:
+        remaining = self.chunk_records
+        if self.limit:
+            remaining = min(remaining, self.limit - self.generator.generated)
+        if remaining <= 0:
+            return []
+        # La generación (NumPy y construcción de dicts) ocurre en un hilo
+        return await run_io(self.generator.chunk, remaining)
+
+
+class _FileSource(Source):
+    """Fichero de texto leído por bloques de 'chunk_bytes' en el pool de E/S."""
+
+    def __init__(self, path: Union[str, Path], data_type: str, chunk_bytes: int = SOURCE_CHUNK_BYTES):
+        super().__init__(data_type)
+        self.path = Path(path)
+        self.chunk_bytes = chunk_bytes
+        self._file = None
+        self._tail = b""
+
+    async def _fill(self) -> List[Record]:
+        # Lectura y parseo en el pool de E/S; un bloque puede no tener
+        # registros completos (línea muy larga), así que se sigue leyendo
+        while True:
+            records, eof = await run_io(self._read_chunk)
+            if records or eof:
+                return records
+
+    def _read_chunk(self):
+        if self._file is None:
+            self._file = open(self.path, "rb")
+            self._start()
+        data = self._file.read(self.chunk_bytes)
+        eof = not data
+        data = self._tail + data
+        if eof:
+            lines, self._tail = data.splitlines(), b""
+        else:
+            cut = data.rfind(b"\n") + 1
+            lines, self._tail = data[:cut].splitlines(), data[cut:]
+        return self._parse([line for line in lines if line.strip()]), eof
+
+    def _start(self) -> None:
+        pass
+
+    def _parse(self, lines: List[bytes]) -> List[Record]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class NDJSONSource(_FileSource):
+    """Un objeto JSON por línea."""
+
+    def _parse(self, lines: List[bytes]) -> List[Record]:
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                logger.error("Línea NDJSON inválida en %s: %s", self.path, e)
+        return records
+
+
+class CSVSource(_FileSource):
+    """CSV con cabecera y una fila por línea; los valores llegan como texto."""
+
+    def __init__(self, path: Union[str, Path], data_type: str, chunk_bytes: int = SOURCE_CHUNK_BYTES):
+        super().__init__(path, data_type, chunk_bytes)
+        self._fields: Optional[List[str]] = None
+
+    def _start(self) -> None:
+        header = self._file.readline().decode("utf-8")
+        self._fields = next(csv.reader([header]))
+
+    def _parse(self, lines: List[bytes]) -> List[Record]:
+        text = io.StringIO(b"\n".join(lines).decode("utf-8"))
+        return list(csv.DictReader(text, fieldnames=self._fields))
+
+
+class BinarySource(Source):
+    """
+    Registros de ancho fijo (BINARY_LAYOUTS) proyectados con mmap: cada
+    bloque es una vista de 'chunk_records' registros sin copiar el fichero.
+    """
+
+    def __init__(self, path: Union[str, Path], data_type: str, chunk_records: int = SOURCE_CHUNK_RECORDS):
+        super().__init__(data_type)
+        self.path = Path(path)
+        self.layout = BINARY_LAYOUTS[data_type]
+        self.chunk_records = chunk_records
+        self._mmap: Optional[mmap.mmap] = None
+        self._records: Optional[np.ndarray] = None
+        self._position = 0
+
+    async def _fill(self) -> List[Record]:
+        # Los fallos de página del mmap y la decodificación ocurren en un hilo
+        return await run_io(self._next_chunk)
+
+    def _next_chunk(self) -> List[Record]:
+        if self._records is None:
+            self._open()
+        chunk = self._records[self._position:self._position + self.chunk_records]
+        self._position += len(chunk)
+        return _decode_records(chunk)
+
+    def _open(self) -> None:
+        size = os.path.getsize(self.path)
+        if size % self.layout.itemsize:
+            logger.warning("%s no es múltiplo de %d bytes; se ignora el último registro incompleto",
+                           self.path, self.layout.itemsize)
+        count = size // self.layout.itemsize
+        if count == 0:
+            self._records = np.empty(0, dtype=self.layout)
+            return
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._records = np.frombuffer(self._mmap, dtype=self.layout, count=count)
+
+    def close(self) -> None:
+        # La vista de NumPy debe soltarse antes de cerrar el mmap
+        self._records = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+def _decode_records(chunk: np.ndarray) -> List[Record]:
+    columns = {}
+    for name in chunk.dtype.names:
+        values = chunk[name]
+        if values.dtype.kind == "S":
+            columns[name] = [v.decode("ascii") for v in values.tolist()]
+        else:
+            columns[name] = values.tolist()
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def write_binary(path: Union[str, Path], records: Iterable[Record], data_type: str) -> int:
+    """Escribe registros en el formato de ancho fijo de BinarySource. Devuelve cuántos."""
+    layout = BINARY_LAYOUTS[data_type]
+    rows = [tuple(record[name] for name in layout.names) for record in records]
+    # NumPy trunca sin avisar las cadenas que no caben en su campo
+    for index, name in enumerate(layout.names):
+        field = layout.fields[name][0]
+        if field.kind == "S":
+            for row in rows:
+                if len(str(row[index]).encode("ascii")) > field.itemsize:
+                    raise ValueError(f"El campo {name} de {data_type} admite {field.itemsize} bytes: "
+                                     f"{row[index]!r:.40} no cabe")
+    array = np.array(rows, dtype=layout)
+    with open(path, "wb") as f:
+        f.write(array.tobytes())
+    return len(array)
+
+
+def open_source(uri: str, data_type: str) -> Source:
+    """
+    Elige el adaptador según la extensión del fichero. "synthetic" es la
+    carga sintética; un valor que no es un fichero (p. ej. el
+    "stream/genetico" por defecto) es el flujo simulado.
+    """
+    if uri == SYNTHETIC_URI:
+        return SyntheticSource(data_type)
+    path = Path(uri)
+    suffix = path.suffix.lower()
+    if suffix in NDJSON_SUFFIXES:
+        return NDJSONSource(path, data_type)
+    if suffix in CSV_SUFFIXES:
+        return CSVSource(path, data_type)
+    if suffix in BINARY_SUFFIXES:
+        return BinarySource(path, data_type)
+    if path.is_file():
+        raise ValueError(f"Formato de fuente no soportado: {uri}")
+    return SimulatedSource(data_type)
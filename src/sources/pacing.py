@@ -0,0 +1,44 @@
+"""
+pacing.py
+Ritmo de ingesta: en vivo (un intervalo fijo entre muestras, como el flujo
+original), replay a máxima velocidad o replay a un ritmo objetivo.
+"""
+import asyncio
+import time
+from typing import Optional
+
+PACING_MODES = ("live", "fast", "rate")
+
+
+class Pacer:
+    """
+    wait() se llama antes de cada muestra:
+      - live: duerme 'interval' segundos
+      - fast: no espera; solo cede el loop para que las etapas siguientes
+        avancen (el límite lo pone el backpressure de las colas)
+      - rate: mantiene 'rate' muestras/s respecto al inicio, sin acumular deriva
+    """
+
+    def __init__(self, mode: str = "live", interval: float = 0.0, rate: float = 0.0):
+        if mode not in PACING_MODES:
+            raise ValueError(f"Modo de ritmo no soportado: {mode}")
+        if mode == "rate" and rate <= 0:
+            raise ValueError("El modo rate necesita un ritmo mayor que 0")
+        self.mode = mode
+        self.interval = interval
+        self.rate = rate
+        self.count = 0
+        self._started: Optional[float] = None
+
+    async def wait(self) -> None:
+        if self.mode == "live":
+            await asyncio.sleep(self.interval)
+        elif self.mode == "fast":
+            await asyncio.sleep(0)
+        else:
+            now = time.perf_counter()
+            if self._started is None:
+                self._started = now
+            delay = self._started + self.count / self.rate - now
+            await asyncio.sleep(max(delay, 0.0))
+        self.count += 1
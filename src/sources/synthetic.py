@@ -0,0 +1,100 @@
+"""
+synthetic.py
+Generador de carga sintética: registros con valores de distribución normal
+por campo, un conjunto acotado de sample_id (así las líneas base por muestra
+se reutilizan) y una proporción configurable de anomalías. Las anomalías se
+construyen a partir de la tabla de reglas (un valor fuera de los límites de
+una regla de alerta del flujo) y, en genético, insertando un motivo del
+panel en la secuencia. Todo se genera por bloques con NumPy.
+"""
+import math
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from src.config import rules
+from src.config.settings import (
+    MOTIF_PANEL,
+    SYNTHETIC_ANOMALY_RATIO,
+    SYNTHETIC_DISTRIBUTIONS,
+    SYNTHETIC_SAMPLES,
+    SYNTHETIC_SEED,
+    SYNTHETIC_SEQUENCE_LENGTH,
+)
+
+Record = Dict[str, Any]
+
+_BASES = np.frombuffer(b"ACGT", dtype=np.uint8)
+_PREFIX = {"genetico": "G", "bioquimico": "B", "fisico": "F"}
+
+
+class SyntheticGenerator:
+    """
+    chunk(n) devuelve n registros crudos del flujo, como los que entrega
+    cualquier fuente. Con la misma semilla la secuencia es reproducible.
+    """
+
+    def __init__(self, data_type: str, seed: int = SYNTHETIC_SEED,
+                 anomaly_ratio: float = SYNTHETIC_ANOMALY_RATIO, samples: int = SYNTHETIC_SAMPLES,
+                 sequence_length: int = SYNTHETIC_SEQUENCE_LENGTH,
+                 distributions: Optional[Mapping[str, Tuple[float, float]]] = None):
+        if data_type not in _PREFIX:
+            raise ValueError(f"Tipo de dato no soportado: {data_type}")
+        self.data_type = data_type
+        self.anomaly_ratio = anomaly_ratio
+        self.samples = samples
+        self.sequence_length = sequence_length
+        self.distributions = dict(distributions or SYNTHETIC_DISTRIBUTIONS[data_type])
+        self.rng = np.random.default_rng(seed)
+        self.generated = 0
+        self.anomalies = 0
+
+    def chunk(self, n: int) -> List[Record]:
+        rng = self.rng
+        ids = rng.integers(self.samples, size=n)
+        prefix = _PREFIX[self.data_type]
+        columns: Dict[str, List[Any]] = {"sample_id": [f"{prefix}{i:06d}" for i in ids.tolist()]}
+        values = {field: rng.normal(mean, std, n) for field, (mean, std) in self.distributions.items()}
+        anomalous = np.flatnonzero(rng.random(n) < self.anomaly_ratio)
+
+        if self.data_type == "genetico":
+            values["quality"] = np.clip(values["quality"], 0.0, 1.0)
+            columns["sequence"] = self._sequences(n, anomalous)
+        else:
+            self._out_of_range(values, anomalous)
+        for field, column in values.items():
+            columns[field] = column.tolist()
+
+        self.generated += n
+        self.anomalies += anomalous.size
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+    def _sequences(self, n: int, anomalous: np.ndarray) -> List[str]:
+        rng = self.rng
+        length = self.sequence_length
+        codes = _BASES[rng.integers(4, size=(n, length))]
+        motifs = [m if isinstance(m, str) else m[0] for m in MOTIF_PANEL.values()]
+        for row, choice in zip(anomalous.tolist(), rng.integers(len(motifs), size=anomalous.size).tolist()):
+            motif = np.frombuffer(motifs[choice][:length].upper().encode("ascii"), dtype=np.uint8)
+            start = int(rng.integers(length - motif.size + 1))
+            codes[row, start:start + motif.size] = motif
+        raw = codes.tobytes().decode("ascii")
+        return [raw[i * length:(i + 1) * length] for i in range(n)]
+
+    def _out_of_range(self, values: Dict[str, np.ndarray], anomalous: np.ndarray) -> None:
+        # Cada anomalía incumple una regla de alerta al azar, por arriba o por abajo
+        candidates = [r for r in rules.current().alerts(self.data_type)
+                      if r.field in values and (math.isfinite(r.low) or math.isfinite(r.high))]
+        if not candidates or not anomalous.size:
+            return
+        rng = self.rng
+        picks = rng.integers(len(candidates), size=anomalous.size)
+        above = rng.random(anomalous.size) < 0.5
+        excess = rng.uniform(0.05, 0.5, anomalous.size)
+        for row, pick, up, extra in zip(anomalous.tolist(), picks.tolist(), above.tolist(), excess.tolist()):
+            rule = candidates[pick]
+            width = rule.high - rule.low if math.isfinite(rule.high - rule.low) else 1.0
+            if up and math.isfinite(rule.high) or not math.isfinite(rule.low):
+                values[rule.field][row] = rule.high + extra * width
+            else:
+                values[rule.field][row] = rule.low - extra * width
@@ -1,4 +1,14 @@
 """
 Funciones utilitarias.
 """
-from .normalizer import normalize_data
\ No newline at end of file
+from src._lazy import install
+
+_LAZY = {
+    "normalize_data": ".normalizer",
+    "normalize_batch": ".normalizer",
+    "normalize_items": ".normalizer",
+    "RecordBatch": ".record_batch",
+    "setup_logging": ".log_setup",
+}
+
+install(globals(), _LAZY)
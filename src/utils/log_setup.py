@@ -0,0 +1,114 @@
+"""
+log_setup.py
+Configuración centralizada del logging: los módulos solo emiten registros y
+un QueueListener los escribe desde su propio hilo, fuera del event loop.
+Las líneas por muestra (INFO/DEBUG) se muestrean o se limitan por logger.
+"""
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from typing import Dict, Iterable, Optional, TextIO
+
+from src.config.settings import LOG_LEVEL, LOG_RATE_LIMIT, LOG_SAMPLE_N
+
+LOG_FORMAT = "[%(asctime)s] %(levelname)s - %(name)s - %(message)s"
+
+# Loggers que escriben una o más líneas por muestra procesada
+PER_RECORD_LOGGERS = ("GeneticoService", "BioquimicoService", "FisicoService", "Normalizer")
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Deja pasar 1 de cada N registros por plantilla de mensaje (el primero
+    siempre pasa). Los avisos y errores no se muestrean nunca.
+    """
+
+    def __init__(self, every_n: int, max_level: int = logging.WARNING):
+        super().__init__()
+        self.every_n = max(1, every_n)
+        self.max_level = max_level
+        self.dropped = 0
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.max_level or self.every_n == 1:
+            return True
+        # Con formato %, record.msg es la plantilla: cada línea se muestrea aparte
+        key = str(record.msg)
+        with self._lock:
+            seen = self._seen.get(key, 0)
+            self._seen[key] = seen + 1
+        if seen % self.every_n:
+            self.dropped += 1
+            return False
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket por logger: como mucho 'rate' registros por segundo con
+    ráfagas de hasta 'burst'. Los avisos y errores no se limitan.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, max_level: int = logging.WARNING):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst or max(rate, 1.0)
+        self.max_level = max_level
+        self.dropped = 0
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.max_level:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+        self.dropped += 1
+        return False
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler del sistema; se distingue para poder reinstalarlo."""
+
+
+def setup_logging(level: str = LOG_LEVEL, sample_n: int = LOG_SAMPLE_N, rate_limit: float = LOG_RATE_LIMIT,
+                  per_record_loggers: Iterable[str] = PER_RECORD_LOGGERS,
+                  stream: Optional[TextIO] = None) -> logging.handlers.QueueListener:
+    """
+    Instala un único QueueHandler en el logger raíz y arranca el listener que
+    escribe en 'stream' (stderr por defecto). Devuelve el listener; hay que
+    llamar a stop() al terminar para vaciar la cola.
+    """
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, _QueueHandler):
+            root.removeHandler(handler)
+
+    log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    root.addHandler(_QueueHandler(log_queue))
+    root.setLevel(level)
+
+    for name in per_record_loggers:
+        logger = logging.getLogger(name)
+        for old in [f for f in logger.filters if isinstance(f, (SamplingFilter, RateLimitFilter))]:
+            logger.removeFilter(old)
+        if sample_n > 1:
+            logger.addFilter(SamplingFilter(sample_n))
+        if rate_limit > 0:
+            logger.addFilter(RateLimitFilter(rate_limit))
+
+    listener.start()
+    return listener
@@ -1,59 +1,179 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.config import rules
+from src.utils.packed_sequence import PackedSequenceColumn
+from src.utils.record_batch import RecordBatch, SCHEMAS, SEQUENCE, STRING, StringColumn
 
 # Configurar logger
 logger = logging.getLogger("Normalizer")
-logger.setLevel(logging.INFO)
-
-handler = logging.StreamHandler()
-formatter = logging.Formatter("[%(asctime)s] %(levelname)s - %(name)s - %(message)s")
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 def normalize_data(raw_data: Dict[str, Any], data_type: str) -> Dict[str, Any]:
     """
     Normaliza datos crudos según el tipo de flujo (genético, bioquímico, físico).
-    Valida rangos y registra errores si los datos son inconsistentes.
+    Valida rangos con las reglas de validación de la tabla de reglas y
+    registra errores si los datos son inconsistentes.
     """
     normalized = {"sample_id": raw_data.get("sample_id", "UNKNOWN")}
 
     try:
         if data_type == "genetico":
-            sequence = raw_data.get("sequence", "").upper()
+            # Sin copia en mayúsculas: el empaquetado a 2 bits ya ignora la caja
+            sequence = raw_data.get("sequence", "")
             quality = float(raw_data.get("quality", 0.0))
-
-            # Validación de calidad
-            if not (0.0 <= quality <= 1.0):
-                logger.error(f"Calidad fuera de rango: {quality} (sample_id={normalized['sample_id']})")
-
             normalized.update({"sequence": sequence, "quality": quality})
 
         elif data_type == "bioquimico":
             ph = float(raw_data.get("ph", 7.0))
             enzyme_activity = float(raw_data.get("enzyme_activity", 0.0))
-
-            # Validación de pH (rango fisiológico aproximado)
-            if not (6.5 <= ph <= 8.0):
-                logger.warning(f"pH fuera de rango: {ph} (sample_id={normalized['sample_id']})")
-
             normalized.update({"ph": ph, "enzyme_activity": enzyme_activity})
 
         elif data_type == "fisico":
             temperature = float(raw_data.get("temperature", 0.0))
             pressure = float(raw_data.get("pressure", 0.0))
-
-            # Validación de temperatura y presión (rangos típicos)
-            if not (30.0 <= temperature <= 40.0):
-                logger.warning(f"Temperatura fuera de rango: {temperature} (sample_id={normalized['sample_id']})")
-            if not (90.0 <= pressure <= 110.0):
-                logger.warning(f"Presión fuera de rango: {pressure} (sample_id={normalized['sample_id']})")
-
             normalized.update({"temperature": temperature, "pressure": pressure})
 
         else:
             raise ValueError(f"Tipo de dato no soportado: {data_type}")
 
+        for rule in rules.current().validation(data_type).check(normalized):
+            logger.log(rule.level, "%s: %s (sample_id=%s)", rule.message, normalized[rule.field],
+                       normalized['sample_id'])
+
     except (ValueError, TypeError) as e:
-        logger.error(f"Error al normalizar datos: {e} (raw_data={raw_data})")
+        logger.error("Error al normalizar datos: %s (raw_data=%s)", e, raw_data)
+
+    return normalized
+
+
+# Valores por defecto de los campos numéricos (los mismos que normalize_data)
+DEFAULTS: Dict[str, float] = {
+    "quality": 0.0,
+    "ph": 7.0,
+    "enzyme_activity": 0.0,
+    "temperature": 0.0,
+    "pressure": 0.0,
+}
+
+# Número de sample_id de ejemplo incluidos en cada resumen
+SUMMARY_EXAMPLES = 3
+
+
+def normalize_batch(
+    batch: Union[RecordBatch, Sequence[Dict[str, Any]]], data_type: str
+) -> Tuple[RecordBatch, Dict[str, np.ndarray]]:
+    """
+    Normaliza un lote completo en una sola pasada vectorizada.
+    Devuelve el lote columnar y máscaras booleanas de validez por campo
+    (más la máscara global "valid"). Todas las reglas de validación del
+    flujo se evalúan en una sola pasada; los valores fuera de rango se
+    reportan con un único resumen por regla y lote en vez de una línea por
+    registro.
+    """
+    if data_type not in SCHEMAS:
+        raise ValueError(f"Tipo de dato no soportado: {data_type}")
+
+    if isinstance(batch, RecordBatch):
+        columns = dict(batch.columns)
+        coerced_ok = np.ones(len(batch), dtype=bool)
+    else:
+        columns, coerced_ok = _coerce_records(batch, data_type)
+
+    result = RecordBatch(data_type, columns)
+    ruleset = rules.current().validation(data_type)
+    violations = ruleset.violations(columns)
+    masks = {"coerced": coerced_ok}
+    valid = coerced_ok.copy()
+    for field, indices in ruleset.by_field.items():
+        # NaN (valor no convertible) tampoco es válido para el campo
+        masks[field] = ~violations[:, indices].any(axis=1) & ~np.isnan(columns[field])
+        valid &= masks[field]
+    masks["valid"] = valid
+
+    if not valid.all():
+        _report_invalid(result, masks, ruleset, violations)
+    return result, masks
+
+
+def normalize_items(
+    items: Union[RecordBatch, Sequence[Any]], data_type: str
+) -> Tuple[RecordBatch, Dict[str, np.ndarray]]:
+    """
+    normalize_batch sobre lo que se extrae de una cola: registros crudos,
+    lotes o una mezcla de ambos (como RecordBatch.coerce). Las máscaras
+    cubren todas las filas en el orden de 'items'.
+    """
+    if isinstance(items, RecordBatch):
+        return normalize_batch(items, data_type)
+    parts: List[Union[RecordBatch, List[Dict[str, Any]]]] = []
+    pending: List[Dict[str, Any]] = []
+    for item in items:
+        if isinstance(item, RecordBatch):
+            if pending:
+                parts.append(pending)
+                pending = []
+            parts.append(item)
+        else:
+            pending.append(item)
+    if pending or not parts:
+        parts.append(pending)
+    if len(parts) == 1:
+        return normalize_batch(parts[0], data_type)
+    normalized = [normalize_batch(part, data_type) for part in parts]
+    batch = RecordBatch.concat([b for b, _ in normalized])
+    masks = {name: np.concatenate([m[name] for _, m in normalized]) for name in normalized[0][1]}
+    return batch, masks
+
+
+def _coerce_records(records: Sequence[Dict[str, Any]], data_type: str) -> Tuple[Dict[str, Any], np.ndarray]:
+    """Convierte los campos de registros crudos a columnas tipadas."""
+    coerced_ok = np.ones(len(records), dtype=bool)
+    columns: Dict[str, Any] = {}
+    for name, kind in SCHEMAS[data_type]:
+        if kind == STRING:
+            default = "UNKNOWN" if name == "sample_id" else ""
+            columns[name] = StringColumn.from_strings(r.get(name, default) for r in records)
+            continue
+        if kind == SEQUENCE:
+            columns[name] = PackedSequenceColumn.from_strings(r.get(name, "") for r in records)
+            continue
+        raw = np.array([r.get(name, DEFAULTS[name]) for r in records], dtype=object)
+        try:
+            values = raw.astype(kind)
+        except (ValueError, TypeError):
+            # Camino lento solo cuando hay valores no numéricos en el lote
+            values = np.array([_to_float(v) for v in raw], dtype=kind)
+        coerced_ok &= ~np.isnan(values)
+        columns[name] = values
+    return columns, coerced_ok
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return float("nan")
+
+
+def _report_invalid(batch: RecordBatch, masks: Dict[str, np.ndarray], ruleset: rules.RuleSet,
+                    violations: np.ndarray) -> None:
+    """Emite un resumen agregado por cada regla de validación que falla en el lote."""
+    data_type = batch.data_type
+    sample_ids = batch.column("sample_id")
+    total = len(batch)
+
+    bad = np.flatnonzero(~masks["coerced"])
+    if bad.size:
+        examples = [sample_ids[int(i)] for i in bad[:SUMMARY_EXAMPLES]]
+        logger.error("Lote %s: %d/%d muestras con valores no numéricos (ej.: %s)",
+                     data_type, bad.size, total, ", ".join(examples))
 
-    return normalized
\ No newline at end of file
+    for index, rule in enumerate(ruleset):
+        bad = np.flatnonzero(violations[:, index] & masks["coerced"])
+        if not bad.size:
+            continue
+        examples = [sample_ids[int(i)] for i in bad[:SUMMARY_EXAMPLES]]
+        logger.log(rule.level, "Lote %s: %d/%d muestras con %s [%s, %s] (ej.: %s)",
+                   data_type, bad.size, total, rule.message, rule.low, rule.high, ", ".join(examples))
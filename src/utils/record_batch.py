@@ -0,0 +1,296 @@
+"""
+record_batch.py
+Lotes columnares (struct-of-arrays) para transportar muestras entre la cola,
+el executor y los servicios sin un diccionario por muestra.
+"""
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.utils.packed_sequence import PackedSequenceColumn
+
+STRING = "str"
+SEQUENCE = "seq2"  # ADN empaquetado a 2 bits por base (PackedSequenceColumn)
+
+# Esquema de columnas por tipo de flujo: (nombre, tipo)
+SCHEMAS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "genetico": (("sample_id", STRING), ("sequence", SEQUENCE), ("quality", "float64")),
+    "bioquimico": (("sample_id", STRING), ("ph", "float64"), ("enzyme_activity", "float64")),
+    "fisico": (("sample_id", STRING), ("temperature", "float64"), ("pressure", "float64")),
+}
+
+# Cabecera del formato plano: índice de flujo y número de filas
+_HEADER = struct.Struct("<BxxxxxxxQ")
+_DATA_TYPES = tuple(SCHEMAS)
+
+
+def _align8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+class StringColumn:
+    """
+    Columna de texto compacta: bytes UTF-8 contiguos más un array de offsets.
+    El corte comparte el buffer original; solo se compacta al serializar.
+    """
+    __slots__ = ("offsets", "data")
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+
+    @classmethod
+    def from_strings(cls, values: Iterable[str]) -> "StringColumn":
+        encoded = [str(v).encode("utf-8") for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(offsets, data)
+
+    @classmethod
+    def concat(cls, columns: Sequence["StringColumn"]) -> "StringColumn":
+        compacted = [c.compact() for c in columns]
+        sizes = [c.data.size for c in compacted]
+        bases = np.concatenate(([0], np.cumsum(sizes[:-1], dtype=np.int64))) if sizes else []
+        offsets = [np.zeros(1, dtype=np.int64)]
+        for col, base in zip(compacted, bases):
+            offsets.append(col.offsets[1:] + base)
+        data = np.concatenate([c.data for c in compacted]) if compacted else np.empty(0, np.uint8)
+        return cls(np.concatenate(offsets), data)
+
+    def compact(self) -> "StringColumn":
+        """Devuelve una columna cuyo buffer contiene solo las filas visibles."""
+        start, stop = int(self.offsets[0]), int(self.offsets[-1])
+        if start == 0 and stop == self.data.size:
+            return self
+        return StringColumn(self.offsets - start, self.data[start:stop])
+
+    def __len__(self) -> int:
+        return self.offsets.size - 1
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, "StringColumn"]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Solo se admiten cortes contiguos")
+            stop = max(start, stop)
+            return StringColumn(self.offsets[start:stop + 1], self.data)
+        if index < 0:
+            index += len(self)
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_list())
+
+    def to_list(self) -> List[str]:
+        raw = self.data.tobytes()
+        bounds = self.offsets.tolist()
+        return [raw[bounds[i]:bounds[i + 1]].decode("utf-8") for i in range(len(bounds) - 1)]
+
+    def __getstate__(self):
+        col = self.compact()
+        return col.offsets, col.data
+
+    def __setstate__(self, state):
+        self.offsets, self.data = state
+
+
+Column = Union[np.ndarray, StringColumn, PackedSequenceColumn]
+_OBJECT_COLUMNS = (StringColumn, PackedSequenceColumn)
+
+
+class RecordBatch:
+    """
+    Lote columnar de muestras de un mismo flujo. Cada campo del esquema es
+    un array NumPy (o una StringColumn para texto y una PackedSequenceColumn
+    para secuencias) de la misma longitud.
+    """
+    __slots__ = ("data_type", "columns")
+
+    def __init__(self, data_type: str, columns: Dict[str, Column]):
+        if data_type not in SCHEMAS:
+            raise ValueError(f"Tipo de dato no soportado: {data_type}")
+        self.data_type = data_type
+        self.columns = columns
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]], data_type: str) -> "RecordBatch":
+        """Construye un lote a partir de registros ya normalizados."""
+        if data_type not in SCHEMAS:
+            raise ValueError(f"Tipo de dato no soportado: {data_type}")
+        columns: Dict[str, Column] = {}
+        for name, kind in SCHEMAS[data_type]:
+            if kind == STRING:
+                columns[name] = StringColumn.from_strings(r[name] for r in records)
+            elif kind == SEQUENCE:
+                columns[name] = PackedSequenceColumn.from_strings(r[name] for r in records)
+            else:
+                columns[name] = np.fromiter((r[name] for r in records), dtype=kind, count=len(records))
+        return cls(data_type, columns)
+
+    @classmethod
+    def concat(cls, batches: Sequence["RecordBatch"]) -> "RecordBatch":
+        if not batches:
+            raise ValueError("No hay lotes que concatenar")
+        data_type = batches[0].data_type
+        if any(b.data_type != data_type for b in batches):
+            raise ValueError("No se pueden concatenar lotes de flujos distintos")
+        if len(batches) == 1:
+            return batches[0]
+        columns: Dict[str, Column] = {}
+        for name, kind in SCHEMAS[data_type]:
+            parts = [b.columns[name] for b in batches]
+            if kind == STRING:
+                columns[name] = StringColumn.concat(parts)
+            elif kind == SEQUENCE:
+                columns[name] = PackedSequenceColumn.concat(parts)
+            else:
+                columns[name] = np.concatenate(parts)
+        return cls(data_type, columns)
+
+    @classmethod
+    def coerce(cls, items: Union["RecordBatch", Sequence[Any]], data_type: str) -> "RecordBatch":
+        """
+        Acepta un RecordBatch, una lista de registros o una mezcla de ambos
+        (lo que se extrae de una cola) y devuelve un único lote.
+        """
+        if isinstance(items, RecordBatch):
+            return items
+        batches: List[RecordBatch] = []
+        pending: List[Dict[str, Any]] = []
+        for item in items:
+            if isinstance(item, RecordBatch):
+                if pending:
+                    batches.append(cls.from_records(pending, data_type))
+                    pending = []
+                batches.append(item)
+            else:
+                pending.append(item)
+        if pending or not batches:
+            batches.append(cls.from_records(pending, data_type))
+        return cls.concat(batches)
+
+    def select(self, mask: np.ndarray) -> "RecordBatch":
+        """Filas donde 'mask' es True, por tramos contiguos (sin copia si no falta ninguna)."""
+        keep = np.flatnonzero(mask)
+        if keep.size == len(self):
+            return self
+        if not keep.size:
+            return self[0:0]
+        runs = np.split(keep, np.flatnonzero(np.diff(keep) != 1) + 1)
+        return RecordBatch.concat([self[int(run[0]):int(run[-1]) + 1] for run in runs])
+
+    def column(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        first = SCHEMAS[self.data_type][0][0]
+        return len(self.columns[first])
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], "RecordBatch"]:
+        if isinstance(index, slice):
+            return RecordBatch(self.data_type, {n: c[index] for n, c in self.columns.items()})
+        return {n: (c[index] if isinstance(c, _OBJECT_COLUMNS) else c[index].item())
+                for n, c in self.columns.items()}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.to_records())
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        names = list(self.columns)
+        values = [c.to_list() if isinstance(c, _OBJECT_COLUMNS) else c.tolist()
+                  for c in self.columns.values()]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    @property
+    def nbytes(self) -> int:
+        """Tamaño en bytes del formato plano (ver write_into)."""
+        rows = len(self)
+        size = _HEADER.size
+        for name, kind in SCHEMAS[self.data_type]:
+            column = self.columns[name]
+            if kind == STRING:
+                column = column.compact()
+                size += (rows + 1) * 8 + _align8(column.data.size)
+            elif kind == SEQUENCE:
+                column = column.compact()
+                size += (rows + 1) * 8 + 8 + column.ambiguous.size * 8 + _align8(column.data.size)
+            else:
+                size += rows * np.dtype(kind).itemsize
+        return size
+
+    def write_into(self, buf: memoryview, offset: int = 0) -> int:
+        """
+        Escribe el lote en un buffer plano (p. ej. memoria compartida) sin
+        pasar por pickle. Devuelve el número de bytes escritos.
+        """
+        rows = len(self)
+        _HEADER.pack_into(buf, offset, _DATA_TYPES.index(self.data_type), rows)
+        pos = offset + _HEADER.size
+        for name, kind in SCHEMAS[self.data_type]:
+            column = self.columns[name]
+            if kind == STRING:
+                column = column.compact()
+                target = np.frombuffer(buf, dtype=np.int64, count=rows + 1, offset=pos)
+                target[:] = column.offsets
+                pos += (rows + 1) * 8
+                buf[pos:pos + column.data.size] = column.data.tobytes()
+                pos += _align8(column.data.size)
+            elif kind == SEQUENCE:
+                # offsets, nº de posiciones ambiguas, posiciones y bases empaquetadas
+                column = column.compact()
+                ambiguous = column.ambiguous.size
+                target = np.frombuffer(buf, dtype=np.int64, count=rows + 2 + ambiguous, offset=pos)
+                target[:rows + 1] = column.offsets
+                target[rows + 1] = ambiguous
+                target[rows + 2:] = column.ambiguous
+                pos += target.nbytes
+                buf[pos:pos + column.data.size] = column.data.tobytes()
+                pos += _align8(column.data.size)
+            else:
+                target = np.frombuffer(buf, dtype=kind, count=rows, offset=pos)
+                target[:] = column
+                pos += target.nbytes
+        return pos - offset
+
+    @classmethod
+    def from_buffer(cls, buf: memoryview, offset: int = 0) -> "RecordBatch":
+        """
+        Reconstruye un lote escrito con write_into. Las columnas son vistas
+        sobre 'buf': solo son válidas mientras el buffer no se reutilice.
+        """
+        type_index, rows = _HEADER.unpack_from(buf, offset)
+        data_type = _DATA_TYPES[type_index]
+        pos = offset + _HEADER.size
+        columns: Dict[str, Column] = {}
+        for name, kind in SCHEMAS[data_type]:
+            if kind == STRING:
+                offsets = np.frombuffer(buf, dtype=np.int64, count=rows + 1, offset=pos)
+                pos += (rows + 1) * 8
+                size = int(offsets[-1])
+                columns[name] = StringColumn(offsets, np.frombuffer(buf, dtype=np.uint8, count=size, offset=pos))
+                pos += _align8(size)
+            elif kind == SEQUENCE:
+                offsets = np.frombuffer(buf, dtype=np.int64, count=rows + 2, offset=pos)
+                ambiguous = int(offsets[-1])
+                positions = np.frombuffer(buf, dtype=np.int64, count=ambiguous, offset=pos + (rows + 2) * 8)
+                pos += (rows + 2 + ambiguous) * 8
+                size = -(-int(offsets[rows]) // 4)
+                data = np.frombuffer(buf, dtype=np.uint8, count=size, offset=pos)
+                columns[name] = PackedSequenceColumn(offsets[:rows + 1], data, positions)
+                pos += _align8(size)
+            else:
+                columns[name] = np.frombuffer(buf, dtype=kind, count=rows, offset=pos)
+                pos += columns[name].nbytes
+        return cls(data_type, columns)
+
+    def __getstate__(self):
+        return self.data_type, self.columns
+
+    def __setstate__(self, state):
+        self.data_type, self.columns = state
+
+    def __repr__(self) -> str:
+        return f"RecordBatch(data_type={self.data_type!r}, rows={len(self)})"
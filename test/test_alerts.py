@@ -1,5 +1,13 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
+from src.alerts import notifier
+from src.alerts.dispatcher import AlertDispatcher, SMTPConnectionPool
 from src.alerts.notifier import send_alert
+from src.alerts.suppression import AlertSuppressor
+from src.alerts.webhook import CircuitBreaker, WebhookClient, WebhookError
 from src.config import settings
 
 def test_send_alert_log(monkeypatch, caplog):
@@ -19,4 +27,330 @@ def test_send_alert_invalid_channel(monkeypatch, caplog):
     event = {"sample_id": "G123", "message": "Evento crítico"}
     with caplog.at_level("ERROR"):
         send_alert(event)
-    assert "Canal de alerta no soportado" in caplog.text
\ No newline at end of file
+    assert "Canal de alerta no soportado" in caplog.text
+
+# -------------------------
+# Dispatcher asíncrono contra un servidor SMTP local
+# -------------------------
+
+
+class FakeSMTPServer:
+    """Servidor SMTP mínimo: cuenta conexiones y guarda los mensajes recibidos."""
+
+    def __init__(self):
+        self.connections = 0
+        self.messages = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        writer.write(b"220 localhost ESMTP\r\n")
+        while line := await reader.readline():
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                writer.write(b"250 localhost\r\n")
+            elif command == "DATA":
+                writer.write(b"354 fin con .\r\n")
+                await writer.drain()
+                body = []
+                while (data := await reader.readline()) != b".\r\n":
+                    body.append(data.decode())
+                self.messages.append("".join(body))
+                writer.write(b"250 OK\r\n")
+            elif command == "QUIT":
+                writer.write(b"221 adios\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_reuses_smtp_connections():
+    smtp = FakeSMTPServer()
+    port = await smtp.start()
+    dispatcher = AlertDispatcher(pool_size=2, channel="email",
+                                 smtp_pool=SMTPConnectionPool("127.0.0.1", port, size=2))
+    dispatcher.start()
+
+    for i in range(10):
+        assert dispatcher.submit({"sample_id": f"G{i}", "message": "Mutación crítica detectada"})
+    await dispatcher.stop()
+    await smtp.close()
+
+    assert len(smtp.messages) == 10
+    assert smtp.connections <= 2
+    assert dispatcher.stats()["sent"] == 10
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_digest_folds_window_into_one_message():
+    smtp = FakeSMTPServer()
+    port = await smtp.start()
+    dispatcher = AlertDispatcher(digest_seconds=0.2, channel="email",
+                                 smtp_pool=SMTPConnectionPool("127.0.0.1", port, size=1))
+    dispatcher.start()
+
+    for i in range(5):
+        dispatcher.submit({"sample_id": f"B{i}", "message": "Anomalía bioquímica detectada"})
+    await dispatcher.stop()
+    await smtp.close()
+
+    assert len(smtp.messages) == 1
+    assert "Resumen de 5 alertas" in smtp.messages[0]
+    assert dispatcher.stats()["messages"] == 1
+
+
+@pytest.mark.asyncio
+async def test_send_alert_does_not_block_with_dispatcher(monkeypatch):
+    dispatcher = AlertDispatcher(maxsize=2, channel="log")
+    monkeypatch.setattr("src.alerts.notifier._dispatcher", dispatcher)
+
+    for i in range(5):
+        send_alert({"sample_id": f"F{i}", "message": "Parámetros físicos fuera de rango"})
+
+    # Sin arrancar los envíos: la cola acotada descarta las más antiguas
+    assert dispatcher.queue.qsize() == 2
+    assert dispatcher.queue.drops == 3
+
+
+# -------------------------
+# Supresión de alertas repetidas
+# -------------------------
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _event(sample_id="G123", alert_type="mutacion"):
+    return {"service": "genetico", "sample_id": sample_id, "type": alert_type,
+            "message": "Mutación crítica detectada"}
+
+
+def test_suppressor_folds_suppressed_count_into_next_alert():
+    clock = FakeClock()
+    suppressor = AlertSuppressor(cooldowns={"mutacion": 10.0}, clock=clock)
+
+    assert suppressor.check(_event()) is not None
+    for _ in range(99):
+        clock.now += 0.1
+        assert suppressor.check(_event()) is None
+
+    clock.now = 10.0
+    event = suppressor.check(_event())
+    assert event["suppressed"] == 99
+    assert suppressor.stats()["suppressed"] == 99
+
+
+def test_suppressor_keys_by_sample_and_type():
+    suppressor = AlertSuppressor(default_cooldown=60.0, clock=FakeClock())
+
+    assert suppressor.check(_event("G1")) is not None
+    assert suppressor.check(_event("G2")) is not None
+    assert suppressor.check(_event("G1", "otro")) is not None
+    assert suppressor.check(_event("G1")) is None
+
+
+def test_suppressor_memory_is_bounded():
+    clock = FakeClock()
+    suppressor = AlertSuppressor(default_cooldown=60.0, max_entries=100, clock=clock)
+
+    for i in range(1000):
+        suppressor.check(_event(f"G{i}"))
+
+    assert len(suppressor) == 100
+    # Las caducadas se retiran antes de expulsar entradas vivas
+    clock.now = 120.0
+    suppressor.check(_event("nuevo"))
+    assert len(suppressor) == 1
+
+
+def test_suppressor_emits_pending_count_of_evicted_key():
+    suppressor = AlertSuppressor(default_cooldown=60.0, max_entries=2, clock=FakeClock())
+    suppressor.check(_event("G1"))
+    for _ in range(5):
+        assert suppressor.check(_event("G1")) is None
+    suppressor.check(_event("G2"))
+    suppressor.check(_event("G2"))
+
+    # G1 es la menos usada: se expulsa con sus 5 suprimidas pendientes
+    assert suppressor.check(_event("G3")) is not None
+    evicted = suppressor.take_evicted()
+    assert [(e["sample_id"], e["suppressed"]) for e in evicted] == [("G1", 5)]
+    assert suppressor.take_evicted() == []
+
+
+def test_send_alert_applies_suppressor(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "ALERT_CHANNEL", "log")
+    monkeypatch.setattr("src.alerts.notifier._suppressor", AlertSuppressor(default_cooldown=60.0))
+
+    with caplog.at_level("WARNING"):
+        for _ in range(10):
+            send_alert(_event())
+    assert caplog.text.count("[ALERTA]") == 1
+
+
+# -------------------------
+# Canal webhook contra un servidor HTTP local
+# -------------------------
+
+
+class FakeWebhookServer(ThreadingHTTPServer):
+    """Servidor HTTP/1.1 keep-alive que guarda los lotes recibidos."""
+
+    def __init__(self, fail_first=0, status=503):
+        self.batches = []
+        self.connections = 0
+        self.fail_first = fail_first
+        self.status = status
+        super().__init__(("127.0.0.1", 0), _WebhookHandler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/alertas"
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.server.fail_first > 0:
+            self.server.fail_first -= 1
+            status = self.server.status
+        else:
+            self.server.batches.append(json.loads(body)["alerts"])
+            status = 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def _client(url, **kwargs):
+    return WebhookClient(url, sleep=lambda seconds: None, **kwargs)
+
+
+def test_webhook_reuses_keep_alive_connection():
+    server = FakeWebhookServer()
+    client = _client(server.url, size=1)
+    try:
+        for i in range(5):
+            client.post([{"sample_id": f"G{i}"}, {"sample_id": f"G{i}b"}])
+    finally:
+        client.close()
+        server.close()
+
+    assert len(server.batches) == 5
+    assert all(len(batch) == 2 for batch in server.batches)
+    assert server.connections == 1
+
+
+def test_webhook_retries_with_backoff_until_success():
+    server = FakeWebhookServer(fail_first=2)
+    client = _client(server.url, max_retries=3)
+    try:
+        client.post([{"sample_id": "B1"}])
+    finally:
+        client.close()
+        server.close()
+
+    assert client.retries == 2
+    assert server.batches == [[{"sample_id": "B1"}]]
+    assert all(0 <= client.backoff(attempt) <= client.backoff_max for attempt in range(20))
+
+
+def test_webhook_circuit_opens_and_falls_back_to_log(caplog):
+    server = FakeWebhookServer(fail_first=100)
+    client = _client(server.url, max_retries=1, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    try:
+        with pytest.raises(WebhookError):
+            client.post([{"sample_id": "F1"}])
+        with caplog.at_level("WARNING"):
+            notifier.deliver([{"sample_id": "F2", "message": "Parámetros físicos fuera de rango"}],
+                             channel="webhook", webhook=client)
+            requests_before = 100 - server.fail_first
+            notifier.deliver([{"sample_id": "F3", "message": "Parámetros físicos fuera de rango"}],
+                             channel="webhook", webhook=client)
+    finally:
+        client.close()
+        server.close()
+
+    assert client.breaker.state == "open"
+    # Con el circuito abierto no se llega a contactar al servidor
+    assert 100 - server.fail_first == requests_before
+    assert "F3" in caplog.text and "[ALERTA]" in caplog.text
+
+
+def test_webhook_client_error_does_not_open_circuit():
+    server = FakeWebhookServer(fail_first=5, status=400)
+    client = _client(server.url, max_retries=3, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    try:
+        for _ in range(3):
+            with pytest.raises(WebhookError):
+                client.post([{"sample_id": "F1"}])
+    finally:
+        client.close()
+        server.close()
+
+    # Sin reintentos ni fallos del circuito: el 400 es culpa del lote, no del servicio
+    assert client.retries == 0
+    assert client.breaker.state == "closed" and client.breaker.trips == 0
+
+
+def test_dispatcher_sizes_webhook_pool_from_its_own_setting(monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_POOL_SIZE", 7)
+    dispatcher = AlertDispatcher(pool_size=1)
+    assert dispatcher.webhook.size == 7
+
+
+def test_circuit_breaker_half_open_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now = 10.0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_batches_webhook_posts():
+    server = FakeWebhookServer()
+    dispatcher = AlertDispatcher(pool_size=1, channel="webhook", webhook=_client(server.url, size=1))
+    for i in range(20):
+        dispatcher.submit({"sample_id": f"G{i}", "message": "Mutación crítica detectada"})
+    dispatcher.start()
+    await dispatcher.stop()
+    server.close()
+
+    assert sum(len(batch) for batch in server.batches) == 20
+    assert len(server.batches) == 1
@@ -0,0 +1,42 @@
+import json
+
+from benchmarks.common import environment, metric, save_results
+from benchmarks.gate import compare, merge
+
+
+def test_gate_flags_only_regressions_beyond_tolerance():
+    baseline = {
+        "micro.a": metric(10.0, "us"),
+        "micro.b": metric(10.0, "us"),
+        "pipeline.throughput": metric(1000.0, "registros/s", "higher"),
+        "micro.gone": metric(1.0, "us"),
+    }
+    current = {
+        "micro.a": metric(12.0, "us"),  # +20 %: dentro de la tolerancia
+        "micro.b": metric(14.0, "us"),  # +40 %: regresión
+        "pipeline.throughput": metric(700.0, "registros/s", "higher"),  # -30 %: regresión
+        "micro.new": metric(1.0, "us"),
+    }
+    rows, regressions = compare(baseline, current, tolerance=0.25)
+
+    assert regressions == ["micro.b", "pipeline.throughput"]
+    status = {row[0]: row[-1] for row in rows}
+    assert status["micro.a"] == "ok" and status["micro.new"] == "nueva" and status["micro.gone"] == "ausente"
+
+
+def test_merge_keeps_best_or_median_value_per_metric(tmp_path):
+    paths = []
+    for i, (latency, throughput) in enumerate([(5.0, 100.0), (4.0, 90.0), (9.0, 95.0)]):
+        path = tmp_path / f"run{i}.json"
+        save_results(path, {"lat": metric(latency, "ms"), "tp": metric(throughput, "r/s", "higher")}, meta={})
+        paths.append(str(path))
+
+    merged = merge(paths)
+    assert merged["lat"]["value"] == 4.0 and merged["tp"]["value"] == 100.0
+    median = merge(paths, pick="median")
+    assert median["lat"]["value"] == 5.0 and median["tp"]["value"] == 95.0
+    assert json.loads((tmp_path / "run0.json").read_text())["meta"] == {}
+
+
+def test_environment_records_only_machine_metadata():
+    assert set(environment()) == {"python", "numpy", "platform", "machine", "cpus"}
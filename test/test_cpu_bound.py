@@ -0,0 +1,134 @@
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from benchmarks.bench_matmul import legacy_matrix_multiplication
+from src.processing import factorials as factorials_module
+from src.processing import primes as primes_module
+from src.processing.cpu_bound import compute_primes, factorial, heavy_matrix_multiplication
+from src.processing.factorials import FactorialEngine
+from src.processing.matmul import blocked_matmul, matmul
+from src.processing.primes import PrimeSieve
+
+
+@pytest.mark.parametrize("backend", ["auto", "numpy", "blocked"])
+def test_heavy_matrix_multiplication_matches_original(backend):
+    assert heavy_matrix_multiplication(37, backend=backend) == legacy_matrix_multiplication(37)
+
+
+def test_heavy_matrix_multiplication_accepts_caller_matrices():
+    A = [[1, 2], [3, 4]]
+    B = [[5, 6], [7, 8]]
+    assert heavy_matrix_multiplication(2, A, B) == [[19, 22], [43, 50]]
+
+
+def test_blocked_matmul_handles_partial_blocks():
+    rng = np.random.default_rng(0)
+    a = rng.integers(-50, 50, (23, 17))
+    b = rng.integers(-50, 50, (17, 29))
+    assert blocked_matmul(a.tolist(), b.tolist(), block=8) == (a @ b).tolist()
+
+
+def test_parallel_matmul_tiles_in_shared_memory():
+    rng = np.random.default_rng(1)
+    a = rng.random((70, 45))
+    b = rng.random((45, 33))
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        result = matmul(a, b, backend="parallel", executor=executor, tile=16)
+    np.testing.assert_allclose(result, a @ b)
+
+
+def test_matmul_falls_back_to_exact_integers_on_overflow():
+    big = [[10 ** 12, 1], [1, 10 ** 12]]
+    result = matmul(big, big)
+    assert result.dtype == object
+    assert result[0][0] == 10 ** 24 + 1
+
+
+def test_matmul_bound_survives_int64_minimum():
+    low = np.iinfo(np.int64).min
+    result = matmul(np.array([[low, 1]]), np.array([[low], [1]]))
+    assert result.dtype == object
+    assert result[0][0] == 2 ** 126 + 1
+
+
+def test_matmul_rejects_incompatible_shapes():
+    with pytest.raises(ValueError):
+        matmul(np.ones((2, 3)), np.ones((2, 3)))
+
+
+def _trial_division(limit):
+    return [n for n in range(2, limit + 1) if all(n % d for d in range(2, math.isqrt(n) + 1))]
+
+
+@pytest.mark.parametrize("segment", [1, 7, 64, 1 << 21])
+def test_prime_sieve_matches_trial_division(segment):
+    assert PrimeSieve(segment=segment).primes_up_to(5000).tolist() == _trial_division(5000)
+
+
+def test_prime_sieve_extends_cache_incrementally(monkeypatch):
+    sieve = PrimeSieve(segment=100)
+    sieve.primes_up_to(1000)
+    sieved = []
+    original = primes_module.sieve_segment
+
+    def tracking_segment(lo, hi, base):
+        sieved.append(lo)
+        return original(lo, hi, base)
+
+    monkeypatch.setattr(primes_module, "sieve_segment", tracking_segment)
+    assert sieve.primes_up_to(2000).tolist() == _trial_division(2000)
+    assert min(sieved) == 1001
+    assert sieve.primes_up_to(10).tolist() == [2, 3, 5, 7]
+    assert sieve.limit == 2000
+
+
+def test_prime_sieve_generator_streams_past_cache():
+    sieve = PrimeSieve(segment=50)
+    sieve.primes_up_to(300)
+    assert list(sieve.iter_primes(3000)) == _trial_division(3000)
+    assert sieve.limit == 300
+    assert list(itertools.islice(PrimeSieve(segment=10).iter_primes(), 25)) == _trial_division(100)
+
+
+def test_prime_sieve_parallel_segments():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        sieve = PrimeSieve(segment=1000, parallel_min=1, executor=executor)
+        assert sieve.primes_up_to(20000).tolist() == _trial_division(20000)
+
+
+def test_compute_primes_returns_list():
+    assert compute_primes(30) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    assert compute_primes(1) == []
+
+
+def test_factorial_is_exact_beyond_recursion_limit():
+    assert factorial(0) == factorial(1) == 1
+    assert factorial(5000) == math.factorial(5000)
+
+
+def test_factorial_engine_starts_from_nearest_checkpoint(monkeypatch):
+    engine = FactorialEngine(cache_size=2)
+    engine.factorial(400)
+    ranges = []
+    original = factorials_module.range_product
+
+    def tracking_product(lo, hi):
+        ranges.append((lo, hi))
+        return original(lo, hi)
+
+    monkeypatch.setattr(factorials_module, "range_product", tracking_product)
+    assert engine.factorial(450) == math.factorial(450)
+    assert ranges[0] == (400, 450)
+    engine.factorial(10)
+    assert engine.stats()["entries"] == 2
+    assert 400 not in engine._cache
+
+
+def test_factorial_engine_parallel_product_tree():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        engine = FactorialEngine(cache_size=0, parallel_min=10, executor=executor)
+        assert engine.factorial(3000) == math.factorial(3000)
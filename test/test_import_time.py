@@ -0,0 +1,38 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Presupuesto de importación en frío de 'src' (microsegundos, acumulado)
+IMPORT_BUDGET_US = 50_000
+
+
+def _loaded_after(statement, modules):
+    code = f"import sys; {statement}; print(','.join(m for m in {modules!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+def _import_time_us(module):
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    for line in out.stderr.splitlines():
+        fields = [f.strip() for f in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise AssertionError(f"{module} no aparece en -X importtime")
+
+
+def test_import_src_is_lazy():
+    heavy = ("numpy", "pandas", "matplotlib", "smtplib", "email.mime", "src.services", "src.config.settings")
+    assert _loaded_after("import src", heavy) == []
+
+
+def test_main_does_not_load_reporting_or_mail_dependencies():
+    assert _loaded_after("import src.main", ("pandas", "matplotlib", "smtplib")) == []
+
+
+def test_import_src_within_budget():
+    best = min(_import_time_us("src") for _ in range(3))
+    assert best < IMPORT_BUDGET_US, f"import src tardó {best} us (presupuesto {IMPORT_BUDGET_US} us)"
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import pytest
+from src.processing import io_bound
+from src.processing.io_bound import (BufferedFileWriter, copy_file_async, iter_file_chunks, iter_file_mmap,
+                                     read_file_async, write_file_async)
+
+PAYLOAD = os.urandom(300_000)
+
+
+@pytest.mark.asyncio
+async def test_write_then_read_roundtrip(tmp_path):
+    path = tmp_path / "dump.txt"
+    await write_file_async(path, "línea\n" * 1000, chunk_size=100)
+
+    assert await read_file_async(path) == "línea\n" * 1000
+
+
+@pytest.mark.asyncio
+async def test_read_large_file_through_mmap(tmp_path, monkeypatch):
+    path = tmp_path / "dump.bin"
+    path.write_bytes(PAYLOAD)
+    monkeypatch.setattr(io_bound, "IO_MMAP_THRESHOLD", 1024)
+
+    assert await read_file_async(path, encoding=None) == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_read_empty_file_with_zero_mmap_threshold(tmp_path, monkeypatch):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    monkeypatch.setattr(io_bound, "IO_MMAP_THRESHOLD", 0)
+
+    assert await read_file_async(path, encoding=None) == b""
+
+
+@pytest.mark.asyncio
+async def test_chunk_iterators_cover_whole_file(tmp_path):
+    path = tmp_path / "dump.bin"
+    path.write_bytes(PAYLOAD)
+
+    chunks = [chunk async for chunk in iter_file_chunks(path, chunk_size=65536)]
+    mapped = [bytes(chunk) async for chunk in iter_file_mmap(path, chunk_size=65536)]
+
+    assert b"".join(chunks) == PAYLOAD
+    assert b"".join(mapped) == PAYLOAD
+    assert len(chunks) == len(mapped) == 5
+
+
+@pytest.mark.asyncio
+async def test_copy_file_async(tmp_path):
+    src, dst = tmp_path / "src.bin", tmp_path / "dst.bin"
+    src.write_bytes(PAYLOAD)
+
+    assert await copy_file_async(src, dst) == len(PAYLOAD)
+    assert dst.read_bytes() == PAYLOAD
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kernel_limit", [0, 1000, 200_000])
+async def test_copy_file_finishes_short_kernel_copies(tmp_path, monkeypatch, kernel_limit):
+    src, dst = tmp_path / "src.bin", tmp_path / "dst.bin"
+    src.write_bytes(PAYLOAD)
+
+    def short_copy(fd_in, fd_out, offset, size):
+        # El kernel devuelve 0 antes de tiempo: solo llega hasta 'kernel_limit'
+        os.pwrite(fd_out, os.pread(fd_in, kernel_limit - offset, offset), offset)
+        return kernel_limit
+
+    monkeypatch.setattr(io_bound, "_copy_file_range", short_copy)
+    monkeypatch.setattr(io_bound, "_sendfile", short_copy)
+
+    assert await copy_file_async(src, dst) == len(PAYLOAD)
+    assert dst.read_bytes() == PAYLOAD
+
+
+@pytest.mark.asyncio
+async def test_buffered_writer_groups_concurrent_writes(tmp_path):
+    path = tmp_path / "out.log"
+
+    async with BufferedFileWriter(path, buffer_size=4096) as writer:
+        async def producer(n):
+            for i in range(200):
+                await writer.write(f"{n}:{i}\n")
+        await asyncio.gather(*(producer(n) for n in range(5)))
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1000
+    assert writer.bytes_written == path.stat().st_size
+    assert writer.flushes < 10
@@ -0,0 +1,65 @@
+import io
+import logging
+import pytest
+from src.utils.log_setup import RateLimitFilter, SamplingFilter, setup_logging
+
+
+def _record(msg, level=logging.INFO, *args):
+    return logging.LogRecord("GeneticoService", level, __file__, 0, msg, args, None)
+
+
+def test_sampling_filter_keeps_one_in_n_per_template():
+    sampling = SamplingFilter(every_n=10)
+
+    kept = sum(sampling.filter(_record("Datos normalizados en cola: %s")) for _ in range(100))
+    other = sampling.filter(_record("Resultado normal: %s"))
+
+    assert kept == 10
+    assert other is True
+    assert sampling.dropped == 90
+
+
+def test_sampling_and_rate_limit_never_drop_warnings():
+    sampling = SamplingFilter(every_n=1000)
+    limit = RateLimitFilter(rate=1.0, burst=1.0)
+
+    assert all(sampling.filter(_record("pH fuera de rango: %s", logging.WARNING)) for _ in range(50))
+    assert all(limit.filter(_record("Error: %s", logging.ERROR)) for _ in range(50))
+
+
+def test_rate_limit_filter_caps_burst():
+    limit = RateLimitFilter(rate=0.001, burst=5)
+
+    kept = sum(limit.filter(_record("Procesando muestra: %s")) for _ in range(100))
+
+    assert kept == 5
+    assert limit.dropped == 95
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    root.handlers = handlers
+    root.setLevel(level)
+    for name in ("GeneticoService",):
+        logging.getLogger(name).filters.clear()
+
+
+def test_setup_logging_writes_each_line_once(restore_root_logger):
+    import src.services.genetico_service  # noqa: F401  (no debe añadir handlers propios)
+
+    stream = io.StringIO()
+    listener = setup_logging("INFO", sample_n=5, rate_limit=0,
+                             per_record_loggers=("GeneticoService",), stream=stream)
+    logger = logging.getLogger("GeneticoService")
+    for i in range(10):
+        logger.info("Datos normalizados en cola: %s", f"G{i}")
+    logger.warning("Aviso único")
+    listener.stop()
+
+    lines = stream.getvalue().splitlines()
+    assert not logger.handlers
+    assert len(lines) == 3
+    assert sum("Aviso único" in line for line in lines) == 1
@@ -0,0 +1,64 @@
+import random
+from src.metrics.monitor import LatencyHistogram, MetricsMonitor
+
+
+def test_histogram_percentiles_within_precision():
+    histogram = LatencyHistogram(precision=0.01)
+    values = [i / 1000 for i in range(1, 1001)]  # 1 ms .. 1 s
+    random.shuffle(values)
+    for value in values:
+        histogram.record(value)
+
+    percentiles = histogram.percentiles()
+    assert abs(percentiles["p50"] - 0.5) / 0.5 < 0.02
+    assert abs(percentiles["p99"] - 0.99) / 0.99 < 0.02
+    assert len(histogram.counts) < 2500
+
+
+def test_monitor_memory_is_constant_and_window_resets():
+    monitor = MetricsMonitor(interval=1)
+    buckets = len(LatencyHistogram().counts)
+    for i in range(10000):
+        monitor.log_event("GeneticoService", 0.001 * (i % 10 + 1), "ALERT" if i % 4 == 0 else "OK")
+
+    assert len(monitor.totals["GeneticoService"].latency.counts) == buckets
+    published = []
+    monitor.subscribe(published.append)
+    monitor.register_gauge("queue.genetico", lambda: {"depth": 3})
+
+    snapshot = monitor.publish()
+    assert snapshot["window"]["GeneticoService"]["statuses"] == {"ALERT": 2500, "OK": 7500}
+    assert snapshot["gauges"]["queue.genetico"] == {"depth": 3}
+    assert published == [snapshot]
+    assert monitor.snapshot()["window"] == {}
+    assert monitor.snapshot()["totals"]["GeneticoService"]["count"] == 10000
+
+
+def test_event_log_rotates_and_report_aggregates(tmp_path):
+    from src.metrics.event_log import MetricsEventLog, RECORD, list_segments
+    from src.metrics.report import aggregate
+
+    log = MetricsEventLog(tmp_path, segment_bytes=RECORD.size * 100, flush_bytes=RECORD.size * 7)
+    for i in range(1000):
+        service = "GeneticoService" if i % 2 else "FisicoService"
+        log.append(service, 0.001 * (i % 10 + 1), "ALERT" if i % 5 == 0 else "OK", timestamp=float(i))
+    log.close()
+
+    assert len(list_segments(tmp_path)) == 10
+    report = aggregate(tmp_path)
+    assert report["GeneticoService"]["count"] == 500
+    assert report["FisicoService"]["statuses"] == {"ALERT": 100, "OK": 400}
+    assert abs(report["GeneticoService"]["mean"] - 0.006) < 1e-9
+    assert abs(report["FisicoService"]["p50"] - 0.005) / 0.005 < 0.02
+    assert report["GeneticoService"]["max"] == 0.01
+
+
+def test_result_status_follows_alert_rules_and_motifs():
+    from src.main import result_status
+
+    assert result_status("fisico", {"temperature_alert": False, "pressure_alert": False}) == "OK"
+    assert result_status("fisico", {"temperature_alert": True, "pressure_alert": False}) == "ALERT"
+    assert result_status("bioquimico", {"anomaly_detected": True}) == "ALERT"
+    assert result_status("bioquimico", {"anomaly_detected": False}) == "OK"
+    assert result_status("genetico", {"mutation_detected": "BRCA1", "confidence": 0.95}) == "ALERT"
+    assert result_status("genetico", {"mutation_detected": None, "confidence": 0.0}) == "OK"
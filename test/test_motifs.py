@@ -0,0 +1,44 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.processing.motifs import MotifScanner, get_scanner
+from src.utils.packed_sequence import PackedSequenceColumn
+
+PANEL = {"a": "ACGTAC", "b": ["GGG", "TTTTA"], "c": "CAGT", "d": "A" * 9}
+
+
+def _reverse_complement(motif):
+    return motif[::-1].translate(str.maketrans("ACGT", "TGCA"))
+
+
+def _naive(sequence, motifs, both_strands):
+    motifs = [motifs] if isinstance(motifs, str) else motifs
+    return any(m in sequence or (both_strands and _reverse_complement(m) in sequence) for m in motifs)
+
+
+@pytest.mark.parametrize("both_strands", [False, True])
+@pytest.mark.parametrize("window", [1, 5, 256])
+def test_scanner_matches_naive_search(both_strands, window):
+    rng = random.Random(window)
+    sequences = ["".join(rng.choice("ACGTN") for _ in range(rng.randint(0, 80))) for _ in range(200)]
+    found = MotifScanner(PANEL, both_strands, window).scan_strings(sequences)
+
+    expected = np.array([[_naive(s, m, both_strands) for m in PANEL.values()] for s in sequences], dtype=bool)
+    np.testing.assert_array_equal(found, expected.reshape(found.shape))
+
+
+def test_scanner_rejects_invalid_motifs_and_caches_compilation():
+    with pytest.raises(ValueError):
+        MotifScanner({"x": "ACGN"})
+    assert get_scanner(PANEL) is get_scanner(dict(PANEL))
+
+
+def test_packed_column_is_quarter_size_and_slices_unaligned():
+    sequences = ["ACGT" * 250, "ttgca", "GGNNA"]
+    column = PackedSequenceColumn.from_strings(sequences)
+    assert column.data.nbytes == -(-sum(map(len, sequences)) // 4)
+    tail = column[1:]
+    assert tail.compact().to_list() == ["TTGCA", "GGNNA"]
+    assert MotifScanner({"x": "GCAGG"}, both_strands=False).scan(tail).ravel().tolist() == [False, False]
@@ -0,0 +1,122 @@
+import asyncio
+import time
+import pytest
+from src.processing.io_bound import batch_network_calls, iter_network_calls
+from src.processing.network import HTTPConnectionPool, SimulatedPool
+
+
+class FakeHTTPServer:
+    """Servidor HTTP/1.1 keep-alive; /slow tarda 5 s, el resto 'delay' segundos."""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while request := await reader.readline():
+                while await reader.readline() not in (b"\r\n", b""):
+                    pass
+                path = request.split()[1].decode()
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                await asyncio.sleep(5 if path == "/slow" else self.delay)
+                self.active -= 1
+                body = f"ok {path}".encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def close(self):
+        self.server.close()
+
+
+@pytest.mark.asyncio
+async def test_http_pool_reuses_connections_and_bounds_concurrency():
+    server = await FakeHTTPServer().start()
+    pool = HTTPConnectionPool()
+    urls = [server.url(f"/muestra/{i}") for i in range(60)]
+
+    results = await batch_network_calls(urls, pool, max_concurrency=5, per_host=5)
+    await pool.close()
+    await server.close()
+
+    assert results == [f"ok /muestra/{i}" for i in range(60)]
+    assert server.max_active <= 5
+    assert server.connections <= 5
+    assert pool.requests == 60
+
+
+@pytest.mark.asyncio
+async def test_results_stream_as_they_complete_with_call_timeout():
+    server = await FakeHTTPServer().start()
+    pool = HTTPConnectionPool()
+    urls = [server.url("/slow")] + [server.url(f"/r{i}") for i in range(5)]
+
+    seen = [r async for r in iter_network_calls(urls, pool, call_timeout=0.3)]
+    await pool.close()
+    await server.close()
+
+    # La llamada lenta no retiene a las demás y termina por timeout
+    assert [r.url for r in seen[:5]] == urls[1:]
+    assert isinstance(seen[-1].error, asyncio.TimeoutError)
+
+
+class TrackingPool(SimulatedPool):
+    def __init__(self):
+        super().__init__(latency=0.02)
+        self.active = {}
+        self.max_active = {}
+
+    async def request(self, url):
+        host = url.split("/")[2]
+        self.active[host] = self.active.get(host, 0) + 1
+        self.max_active[host] = max(self.max_active.get(host, 0), self.active[host])
+        try:
+            return await super().request(url)
+        finally:
+            self.active[host] -= 1
+
+
+@pytest.mark.asyncio
+async def test_per_host_limit_and_global_deadline():
+    pool = TrackingPool()
+    urls = [f"http://host{i % 2}/x{i}" for i in range(10_000)]
+
+    start = time.perf_counter()
+    results = [r async for r in iter_network_calls(urls, pool, max_concurrency=50, per_host=3, deadline=0.3)]
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 2
+    assert len(results) == len(urls)
+    assert max(pool.max_active.values()) <= 3
+    completed = [r for r in results if r.ok]
+    assert 0 < len(completed) < len(urls)
+    assert all(isinstance(r.error, asyncio.TimeoutError) for r in results if not r.ok)
+
+
+@pytest.mark.asyncio
+async def test_saturated_host_does_not_block_other_hosts():
+    pool = TrackingPool()
+    urls = [f"http://busy/x{i}" for i in range(6)] + ["http://idle/y"]
+
+    results = [r async for r in iter_network_calls(urls, pool, max_concurrency=3, per_host=1)]
+
+    # La URL del host libre no espera detrás de las del host saturado
+    assert "http://idle/y" in [r.url for r in results[:2]]
+    assert pool.max_active["busy"] == 1
+    assert sorted(r.url for r in results) == sorted(urls)
@@ -0,0 +1,34 @@
+import logging
+from src.utils.normalizer import normalize_batch
+from src.utils.record_batch import RecordBatch
+
+
+def test_normalize_batch_masks_and_single_summary(caplog):
+    raw = [
+        {"sample_id": "F001", "temperature": "36.5", "pressure": 101.0},
+        {"sample_id": "F002", "temperature": 45.0, "pressure": 101.0},
+        {"sample_id": "F003", "temperature": 50.0, "pressure": "n/a"},
+    ]
+    with caplog.at_level(logging.WARNING, logger="Normalizer"):
+        batch, masks = normalize_batch(raw, "fisico")
+
+    assert isinstance(batch, RecordBatch)
+    assert batch.column("temperature").tolist()[:2] == [36.5, 45.0]
+    assert masks["temperature"].tolist() == [True, False, False]
+    assert masks["coerced"].tolist() == [True, True, False]
+    assert masks["valid"].tolist() == [True, False, False]
+
+    # Un resumen por validación, no una línea por registro
+    range_lines = [r for r in caplog.records if "Temperatura fuera de rango" in r.getMessage()]
+    assert len(range_lines) == 1
+    assert "1/3" in range_lines[0].getMessage()
+    assert "F002" in range_lines[0].getMessage()
+
+
+def test_normalize_batch_uppercases_sequences_and_defaults():
+    raw = [{"sample_id": "G001", "sequence": "atcg", "quality": 0.5}, {"quality": 0.9}]
+    batch, masks = normalize_batch(raw, "genetico")
+
+    assert batch.column("sequence").to_list() == ["ATCG", ""]
+    assert batch.column("sample_id").to_list() == ["G001", "UNKNOWN"]
+    assert masks["valid"].all()
@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+from src.processing import orchestrator
+from src.processing.orchestrator import Pipeline, run_orchestration
+from src.services.fisico_service import FisicoService, analyze_fisico_batch
+
+
+def _counting_source(n):
+    remaining = iter(range(n))
+
+    async def source():
+        return next(remaining, None)
+    return source
+
+
+@pytest.mark.asyncio
+async def test_pipeline_drain_delivers_in_flight_items():
+    delivered = []
+
+    async def slow_double(x):
+        await asyncio.sleep(0.001)
+        return x * 2
+
+    async def sink(x):
+        delivered.append(x)
+
+    pipeline = (
+        Pipeline("test")
+        .source("ingest", _counting_source(50))
+        .stage("double", slow_double, concurrency=3)
+        .stage("sink", sink)
+    )
+    pipeline.start()
+    await pipeline.sources_done.wait()
+    assert await pipeline.stop(deadline=5.0) is True
+
+    assert sorted(delivered) == [x * 2 for x in range(50)]
+    assert pipeline._sources_watcher.done()
+    stats = pipeline.stats()
+    assert stats["double"]["processed"] == 50
+    assert stats["sink"]["depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_cancels_after_deadline():
+    async def stuck(x):
+        await asyncio.sleep(10)
+
+    pipeline = Pipeline("stuck").source("ingest", _counting_source(3)).stage("stuck", stuck)
+    pipeline.start()
+    await pipeline.sources_done.wait()
+
+    assert await pipeline.stop(deadline=0.05) is False
+    assert all(task.done() for stage in pipeline.stages for task in stage.tasks)
+    assert pipeline._sources_watcher.done()
+
+
+@pytest.mark.asyncio
+async def test_run_orchestration_processes_service_until_source_exhausted(monkeypatch):
+    monkeypatch.setitem(orchestrator.INGEST_INTERVAL, "fisico", 0)
+    service = FisicoService("dummy_source")
+    readings = iter([{"sample_id": f"F{i}", "temperature": 36.0, "pressure": 101.0} for i in range(20)])
+
+    async def fetch():
+        return next(readings, None)
+    service.fetch_from_source = fetch
+
+    handled = []
+
+    async def analyze(svc, batch):
+        return analyze_fisico_batch(batch)
+
+    pipelines = await run_orchestration([service], analyze, handle=lambda svc, r: handled.append(r))
+
+    assert len(handled) == 20
+    assert pipelines[0].stats()["analyze"]["processed"] == 20
+    assert list(pipelines[0].stats()) == ["ingest", "analyze", "handle"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_normalizes_per_batch_with_one_summary(monkeypatch, caplog):
+    monkeypatch.setitem(orchestrator.INGEST_INTERVAL, "fisico", 0)
+    service = FisicoService("dummy_source")
+    # Sensor averiado: todas las lecturas fuera del rango de plausibilidad
+    readings = iter([{"sample_id": f"F{i}", "temperature": "55.0", "pressure": 101.0} for i in range(20)])
+
+    async def fetch():
+        return next(readings, None)
+    service.fetch_from_source = fetch
+
+    handled = []
+
+    async def analyze(svc, batch):
+        return analyze_fisico_batch(batch)
+
+    with caplog.at_level("WARNING", logger="Normalizer"):
+        await run_orchestration([service], analyze, handle=lambda svc, r: handled.append(r))
+
+    assert [r["temperature"] for r in handled] == [55.0] * 20
+    lines = [r.getMessage() for r in caplog.records if r.name == "Normalizer"]
+    assert lines and len(lines) < 20
+    assert all(line.startswith("Lote fisico:") for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_non_numeric_reading_drops_only_its_row(monkeypatch):
+    monkeypatch.setitem(orchestrator.INGEST_INTERVAL, "fisico", 0)
+    service = FisicoService("dummy_source")
+    readings = [{"sample_id": f"F{i}", "temperature": 36.0, "pressure": 101.0} for i in range(10)]
+    readings[3]["temperature"] = "bad"
+    remaining = iter(readings)
+
+    async def fetch():
+        return next(remaining, None)
+    service.fetch_from_source = fetch
+
+    handled = []
+
+    async def analyze(svc, batch):
+        return analyze_fisico_batch(batch)
+
+    pipelines = await run_orchestration([service], analyze, handle=lambda svc, r: handled.append(r))
+
+    assert sorted(r["sample_id"] for r in handled) == [f"F{i}" for i in range(10) if i != 3]
+    assert pipelines[0].stats()["analyze"]["errors"] == 0
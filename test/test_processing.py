@@ -0,0 +1,141 @@
+import asyncio
+import pytest
+from src.processing.batching import drain_batch
+from src.processing.backpressure import BoundedQueue
+from src.processing.shm_ring import SharedRingBuffer
+from src.processing.workers import WorkerPool
+from src.processing.router import ExecutionRouter
+from src.services.fisico_service import analyze_fisico_batch
+from src.utils.record_batch import RecordBatch
+
+
+@pytest.mark.asyncio
+async def test_drain_batch_respects_max_size():
+    queue = asyncio.Queue()
+    for i in range(10):
+        queue.put_nowait(i)
+
+    batch = await drain_batch(queue, max_size=4, linger=0.5)
+
+    assert batch == [0, 1, 2, 3]
+    assert queue.qsize() == 6
+
+
+@pytest.mark.asyncio
+async def test_drain_batch_dispatches_after_linger():
+    queue = asyncio.Queue()
+    queue.put_nowait("G123")
+
+    batch = await drain_batch(queue, max_size=64, linger=0.01)
+
+    assert batch == ["G123"]
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_drop_oldest_keeps_newest():
+    queue = BoundedQueue(maxsize=2, policy="drop_oldest")
+    for i in range(5):
+        await queue.put(i)
+
+    assert [queue.get_nowait(), queue.get_nowait()] == [3, 4]
+    assert queue.stats()["drops"] == 3
+    assert queue.high_water_mark == 2
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_drop_newest_rejects_overflow():
+    queue = BoundedQueue(maxsize=1, policy="drop_newest")
+    assert await queue.put("a") is True
+    assert await queue.put("b") is False
+    assert queue.get_nowait() == "a"
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_sample_keeps_one_in_n():
+    queue = BoundedQueue(maxsize=1, policy="sample", sample_n=3)
+    await queue.put(0)
+    accepted = [await queue.put(i) for i in range(1, 7)]
+
+    assert accepted == [False, False, True, False, False, True]
+    assert queue.get_nowait() == 6
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_block_measures_wait():
+    queue = BoundedQueue(maxsize=1, policy="block")
+    await queue.put("a")
+
+    async def consumer():
+        await asyncio.sleep(0.02)
+        queue.get_nowait()
+
+    await asyncio.gather(queue.put("b"), consumer())
+    assert queue.blocked_seconds > 0
+    assert queue.get_nowait() == "b"
+
+
+def test_shared_ring_reuses_space_after_release():
+    ring = SharedRingBuffer(256)
+    try:
+        first = ring.allocate(100)
+        second = ring.allocate(100)
+        assert (first, second) == (0, 128)
+        assert ring.allocate(100) is None
+
+        # Liberar fuera de orden no recupera espacio hasta liberar el más antiguo
+        ring.release(second)
+        assert ring.allocate(100) is None
+        ring.release(first)
+        assert ring.allocate(100) == 0
+    finally:
+        ring.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_analyzes_shared_and_pickled_batches():
+    records = [{"sample_id": f"F{i}", "temperature": 30.0 + i, "pressure": 101.0} for i in range(10)]
+    batch = RecordBatch.from_records(records, "fisico")
+    pool = WorkerPool(max_workers=1, ring_bytes=4096)
+    try:
+        shared = await pool.submit(batch)
+        pool.ring.allocate(pool.ring.size)  # anillo lleno: fuerza el camino con pickle
+        pickled = await pool.submit(batch)
+    finally:
+        pool.shutdown()
+
+    assert shared == pickled == analyze_fisico_batch(batch)
+    assert (pool.shared_batches, pool.pickled_batches) == (1, 1)
+
+
+class _SlowPool:
+    async def submit(self, batch):
+        await asyncio.sleep(0.01)
+        return analyze_fisico_batch(batch)
+
+
+@pytest.mark.asyncio
+async def test_router_prefers_inline_for_cheap_batches():
+    from concurrent.futures import ThreadPoolExecutor
+    batch = RecordBatch.from_records(
+        [{"sample_id": "F1", "temperature": 36.0, "pressure": 101.0}], "fisico")
+    with ThreadPoolExecutor(max_workers=1) as threads:
+        router = ExecutionRouter(_SlowPool(), threads, patience=2)
+        for _ in range(20):
+            assert await router.run(batch) == analyze_fisico_batch(batch)
+
+    key = ExecutionRouter.route_key(batch)
+    assert router.stats()["routes"]["fisico/1"]["mode"] != "process"
+    assert router.choose(key) != "process"
+    assert router.switches >= 1
+
+
+def test_router_hysteresis_ignores_small_differences():
+    router = ExecutionRouter(None, None, hysteresis=0.5, patience=1, min_samples=1, alpha=1.0)
+    key = ("bioquimico", 8)
+    router.choose(key)
+    for mode, cost in (("inline", 0.8), ("thread", 0.9), ("process", 1.0)):
+        router.observe(key, mode, cost)
+
+    assert router.choose(key) == "process"
+    router.observe(key, "inline", 0.1)
+    assert router.choose(key) == "inline"
@@ -0,0 +1,71 @@
+import pickle
+import numpy as np
+from src.utils.record_batch import RecordBatch, StringColumn
+
+GENETICO = [
+    {"sample_id": "G001", "sequence": "ATCG", "quality": 0.85},
+    {"sample_id": "G002", "sequence": "GGTTAACC", "quality": 0.99},
+    {"sample_id": "G003", "sequence": "", "quality": 0.5},
+]
+
+
+def test_roundtrip_records():
+    batch = RecordBatch.from_records(GENETICO, "genetico")
+    assert len(batch) == 3
+    assert batch.to_records() == GENETICO
+    assert batch[1] == GENETICO[1]
+
+
+def test_slice_shares_buffer_and_pickles_compact():
+    batch = RecordBatch.from_records(GENETICO, "genetico")
+    tail = batch[1:]
+    assert tail.to_records() == GENETICO[1:]
+    assert tail.column("sequence").data is batch.column("sequence").data
+
+    restored = pickle.loads(pickle.dumps(tail))
+    assert restored.to_records() == GENETICO[1:]
+    # Secuencias empaquetadas: 4 bases por byte
+    assert restored.column("sequence").data.size == len("GGTTAACC") // 4
+
+
+def test_concat_and_coerce_mixed_items():
+    first = RecordBatch.from_records(GENETICO[:2], "genetico")
+    merged = RecordBatch.coerce([first, GENETICO[2]], "genetico")
+    assert merged.to_records() == GENETICO
+    assert isinstance(merged.column("quality"), np.ndarray)
+
+
+def test_select_keeps_masked_rows_in_order():
+    batch = RecordBatch.from_records(GENETICO, "genetico")
+    assert batch.select(np.array([True, True, True])) is batch
+    assert batch.select(np.array([True, False, True])).to_records() == [GENETICO[0], GENETICO[2]]
+    assert len(batch.select(np.zeros(3, dtype=bool))) == 0
+
+
+def test_string_column_empty():
+    column = StringColumn.from_strings([])
+    assert len(column) == 0
+    assert column.to_list() == []
+
+
+def test_write_into_and_from_buffer_roundtrip():
+    batch = RecordBatch.from_records(GENETICO, "genetico")[1:]
+    buf = memoryview(bytearray(batch.nbytes + 16))
+
+    written = batch.write_into(buf, offset=16)
+    restored = RecordBatch.from_buffer(buf, offset=16)
+
+    assert written == batch.nbytes
+    assert restored.to_records() == GENETICO[1:]
+
+
+def test_packed_sequences_roundtrip_ambiguous_bases():
+    records = [{"sample_id": "G1", "sequence": "acgtNacg", "quality": 0.9},
+               {"sample_id": "G2", "sequence": "TTGCA", "quality": 0.8}]
+    batch = RecordBatch.from_records(records, "genetico")[1:]
+    buf = memoryview(bytearray(batch.nbytes))
+    batch.write_into(buf)
+    assert RecordBatch.from_buffer(buf).column("sequence").to_list() == ["TTGCA"]
+    full = RecordBatch.from_records(records, "genetico")
+    assert full.column("sequence").to_list() == ["ACGTNACG", "TTGCA"]
+    assert pickle.loads(pickle.dumps(full[:1])).column("sequence").to_list() == ["ACGTNACG"]
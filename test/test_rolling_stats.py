@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.processing.rolling_stats import RollingStatsDetector
+from src.services.fisico_service import FisicoService
+
+FIELDS = {"ph": {"max_step": 0.5, "min_std": 0.01}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _feed(detector, sample_id, values):
+    return [detector.observe(sample_id, {"ph": v}) for v in values]
+
+
+def test_zscore_alarm_after_warmup_only():
+    detector = RollingStatsDetector(FIELDS, alpha=0.2, z_threshold=3.0, warmup=5)
+    early = _feed(detector, "B1", [7.4, 7.41, 8.0])
+    assert all(not r["alarms"] for r in early)
+
+    detector = RollingStatsDetector(FIELDS, alpha=0.2, z_threshold=3.0, warmup=5)
+    _feed(detector, "B1", [7.40, 7.42, 7.38, 7.41, 7.39, 7.40])
+    result = detector.observe("B1", {"ph": 7.7})
+    assert result["alarms"] == ["ph:zscore"]
+    assert result["zscores"]["ph"] > 3.0
+    assert detector.baseline("B1")["ph"]["mean"] == pytest.approx(7.40, abs=0.1)
+
+
+def test_non_finite_readings_do_not_poison_the_baseline():
+    detector = RollingStatsDetector(FIELDS, alpha=0.2, z_threshold=3.0, warmup=3)
+    _feed(detector, "B1", [float("nan"), 7.40, 7.42, float("nan"), 7.38, 7.41])
+    after = _feed(detector, "B1", [7.40, 7.39, float("inf"), 7.41])
+
+    assert all(not r["alarms"] for r in after)
+    assert "ph" not in after[2]["zscores"]
+    assert detector.baseline("B1")["ph"]["mean"] == pytest.approx(7.40, abs=0.05)
+
+
+def test_step_alarm_between_consecutive_readings():
+    detector = RollingStatsDetector({"ph": {"max_step": 0.5, "min_std": 10.0}}, warmup=2)
+    _feed(detector, "B1", [7.0, 7.1, 7.2])
+    assert detector.observe("B1", {"ph": 7.9})["alarms"] == ["ph:step"]
+
+
+def test_store_is_bounded_by_lru_and_ttl():
+    clock = FakeClock()
+    detector = RollingStatsDetector(FIELDS, max_entries=2, ttl=10, clock=clock)
+    detector.observe("A", {"ph": 7.0})
+    detector.observe("B", {"ph": 7.0})
+    detector.observe("A", {"ph": 7.0})
+    detector.observe("C", {"ph": 7.0})  # B es la menos reciente
+    assert detector.baseline("B") is None and len(detector) == 2
+
+    clock.now = 11
+    detector.observe("D", {"ph": 7.0})
+    assert detector.baseline("A") is None and detector.baseline("C") is None
+    assert detector.stats()["expired"] == 2 and detector.stats()["evicted"] == 1
+
+
+def test_snapshot_restore_keeps_baselines(tmp_path):
+    detector = RollingStatsDetector(FIELDS, warmup=3)
+    _feed(detector, "B1", [7.40, 7.42, 7.38, 7.41])
+    path = tmp_path / "bioquimico.json"
+    detector.save(path)
+
+    restored = RollingStatsDetector(FIELDS, warmup=3)
+    assert restored.load(path) == 1
+    assert restored.baseline("B1") == detector.baseline("B1")
+    assert restored.observe("B1", {"ph": 7.9})["alarms"]  # Sin nuevo calentamiento
+
+    other = RollingStatsDetector({"temperature": {}})
+    assert other.load(path) == 0
+
+
+def test_restore_rejects_other_snapshot_versions():
+    detector = RollingStatsDetector(FIELDS, warmup=3)
+    _feed(detector, "B1", [7.40, 7.42, 7.38, 7.41])
+    snapshot = detector.snapshot()
+    snapshot["version"] = 1
+
+    assert RollingStatsDetector(FIELDS, warmup=3).restore(snapshot) == 0
+
+
+@pytest.mark.asyncio
+async def test_fisico_service_alerts_on_deviation_within_range():
+    service = FisicoService("dummy_source")
+    with patch("src.alerts.notifier.send_alert") as mock_alert:
+        for _ in range(12):
+            service.handle_result(service.analyze({"sample_id": "F1", "temperature": 36.5, "pressure": 101.0}))
+        mock_alert.assert_not_called()
+        # Dentro de los umbrales fijos, pero lejos de la línea base de la muestra
+        service.handle_result(service.analyze({"sample_id": "F1", "temperature": 37.9, "pressure": 101.0}))
+        mock_alert.assert_called_once()
+        assert mock_alert.call_args[0][0]["type"] == "desviacion"
@@ -0,0 +1,94 @@
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.config import rules
+from src.config.settings import RULES_FILE
+from src.services.bioquimico_service import BioquimicoService
+from src.services.fisico_service import FisicoService
+
+
+@pytest.fixture
+def restore_rules():
+    yield
+    rules.reload(RULES_FILE, force=True)
+
+
+def _write_table(path, specs):
+    path.write_text(json.dumps({"version": 1, "rules": specs}), encoding="utf-8")
+    return path
+
+
+def test_default_table_separates_validation_from_alerts():
+    table = rules.current()
+    assert [(r.low, r.high) for r in table.validation("bioquimico")] == [(6.5, 8.0)]
+    assert [(r.name, r.low, r.high) for r in table.alerts("bioquimico")] == [("anomaly_detected", 7.0, 7.8)]
+    assert len(table.alerts("genetico")) == 0
+
+
+def test_compiled_predicate_matches_per_record_check():
+    ruleset = rules.current().alerts("fisico")
+    rng = np.random.default_rng(7)
+    columns = {"temperature": rng.uniform(33, 40, 500), "pressure": rng.uniform(95, 108, 500)}
+    columns["temperature"][3] = np.nan
+
+    matrix = ruleset.violations(columns)
+    expected = [
+        [rule in ruleset.check({f: columns[f][i] for f in columns}) for rule in ruleset]
+        for i in range(500)
+    ]
+    assert matrix.tolist() == expected
+    assert not matrix[3, 0]  # NaN no incumple reglas
+
+
+@pytest.mark.parametrize("spec", [
+    {"stream": "bioquimico", "field": "color", "min": 0, "max": 1},
+    {"stream": "bioquimico", "field": "ph", "min": 8, "max": 7},
+    {"stream": "quimico", "field": "ph", "min": 0, "max": 1},
+    {"stream": "bioquimico", "field": "ph", "min": 0, "max": 1, "severity": "grave"},
+])
+def test_invalid_rules_are_rejected(spec):
+    spec = {"name": "r", "message": "m", **spec}
+    with pytest.raises(ValueError):
+        rules.RuleTable.from_dict({"rules": [spec]})
+
+
+def test_hot_reload_changes_analysis_and_keeps_table_on_error(tmp_path, restore_rules):
+    service = BioquimicoService("dummy_source")
+    data = {"sample_id": "B1", "ph": 7.9, "enzyme_activity": 100.0}
+    assert service.analyze(data)["anomaly_detected"] is True
+
+    path = _write_table(tmp_path / "rules.json", [
+        {"name": "anomaly_detected", "stream": "bioquimico", "field": "ph", "min": 6.8, "max": 8.2,
+         "severity": "critical", "alert": "anomalia", "message": "pH crítico"},
+    ])
+    assert rules.reload(path) is True
+    assert service.analyze(data)["anomaly_detected"] is False
+    assert rules.reload(path) is False  # Sin cambios
+
+    path.write_text("{ no es json", encoding="utf-8")
+    assert rules.reload(path) is False
+    assert rules.current().alerts("bioquimico").rules[0].message == "pH crítico"
+
+
+def test_worker_catches_up_by_digest(tmp_path, restore_rules):
+    default_digest = rules.current().digest
+    rules.reload(_write_table(tmp_path / "rules.json", []))
+    assert rules.current().digest != default_digest
+
+    # Un worker con la tabla vieja recibe la huella vigente y recarga RULES_FILE
+    assert rules.ensure(default_digest).digest == default_digest
+
+
+@pytest.mark.asyncio
+async def test_one_alert_per_type_with_rule_severity():
+    service = FisicoService("dummy_source")
+    result = service.analyze({"sample_id": "F1", "temperature": 39.0, "pressure": 110.0})
+    assert result["temperature_alert"] and result["pressure_alert"]
+    with patch("src.alerts.notifier.send_alert") as mock_alert:
+        service.handle_result(result)
+        mock_alert.assert_called_once()
+        event = mock_alert.call_args[0][0]
+        assert event["type"] == "fuera_de_rango" and event["severity"] == "warning"
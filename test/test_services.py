@@ -13,15 +13,23 @@ async def test_genetico_service_normal_result():
     data = {"sample_id": "G001", "sequence": "ATCG", "quality": 0.85}
     result = service.analyze(data)
 
-    assert result["mutation_detected"] == "TP53"
-    assert result["confidence"] == 0.95
+    assert result["mutation_detected"] is None
+    assert result["confidence"] == 0.0
+
+    with patch("src.alerts.notifier.send_alert") as mock_alert:
+        service.handle_result(result)
+        mock_alert.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_genetico_service_alert_triggered():
     service = GeneticoService("dummy_source")
-    data = {"sample_id": "G002", "sequence": "ATCG", "quality": 0.99}
+    # KRAS_G12D del panel por defecto, en minúsculas y dentro de una secuencia mayor
+    data = {"sample_id": "G002", "sequence": "ttacgttggagctgatggcgtag", "quality": 0.99}
     result = service.analyze(data)
 
+    assert result["mutation_detected"] == "KRAS_G12D"
+    assert result["confidence"] == 0.99
+
     with patch("src.alerts.notifier.send_alert") as mock_alert:
         service.handle_result(result)
         mock_alert.assert_called_once()
@@ -29,6 +37,19 @@ async def test_genetico_service_alert_triggered():
         assert args["sample_id"] == "G002"
         assert "Mutación crítica detectada" in args["message"]
 
+@pytest.mark.asyncio
+async def test_genetico_batch_scans_panel_on_both_strands():
+    service = GeneticoService("dummy_source")
+    records = [
+        {"sample_id": "G1", "sequence": "AAGTGAGGCACTGCAA", "quality": 0.7},   # TP53_R175H
+        {"sample_id": "G2", "sequence": "CCATCAGCTCCAACCC", "quality": 0.95},  # KRAS_G12D, cadena inversa
+        {"sample_id": "G3", "sequence": "GTGAGGNCACTGC", "quality": 0.99},     # base ambigua
+    ]
+    results = service.analyze_batch(records)
+
+    assert [r["mutation_detected"] for r in results] == ["TP53_R175H", "KRAS_G12D", None]
+    assert [r["confidence"] for r in results] == [0.7, 0.95, 0.0]
+
 # -------------------------
 # BIOQUIMICO SERVICE TESTS
 # -------------------------
@@ -77,4 +98,14 @@ async def test_fisico_service_alert_triggered():
         mock_alert.assert_called_once()
         args = mock_alert.call_args[0][0]
         assert args["sample_id"] == "F002"
-        assert "Parámetros físicos fuera de rango" in args["message"]
\ No newline at end of file
+        assert "Parámetros físicos fuera de rango" in args["message"]
+# -------------------------
+# ANALISIS POR LOTES
+# -------------------------
+def test_analyze_batch_matches_analyze():
+    service = FisicoService("dummy_source")
+    records = [
+        {"sample_id": "F001", "temperature": 36.5, "pressure": 101.0},
+        {"sample_id": "F002", "temperature": 39.0, "pressure": 101.0},
+    ]
+    assert service.analyze_batch(records) == [service.analyze(r) for r in records]
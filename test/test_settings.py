@@ -0,0 +1,35 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _import_settings(**env):
+    # La configuración se lee al importar: cada caso en un intérprete nuevo
+    return subprocess.run([sys.executable, "-c", "import src.config.settings as s; print(len(s.MOTIF_PANEL))"],
+                          cwd=ROOT, capture_output=True, text=True, env={**os.environ, **env})
+
+
+def test_motif_panel_file_is_loaded(tmp_path):
+    path = tmp_path / "panel.json"
+    path.write_text(json.dumps({"M1": "ACGT", "M2": ["GATTACA", "gattaca"]}))
+
+    out = _import_settings(MOTIF_PANEL_FILE=str(path))
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "2"
+
+
+@pytest.mark.parametrize("content", [None, "{no es json", "[]", "{}", '{"M1": "ACGX"}', '{"M1": []}', '{"M1": 7}'])
+def test_invalid_motif_panel_file_fails_with_clear_message(tmp_path, content):
+    path = tmp_path / "panel.json"
+    if content is not None:
+        path.write_text(content)
+
+    out = _import_settings(MOTIF_PANEL_FILE=str(path))
+    assert out.returncode != 0
+    assert "ValueError: MOTIF_PANEL_FILE" in out.stderr
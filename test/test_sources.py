@@ -0,0 +1,127 @@
+import asyncio
+import json
+import time
+import pytest
+from src.processing import orchestrator
+from src.processing.orchestrator import run_orchestration
+from src.services.bioquimico_service import BioquimicoService, analyze_bioquimico_batch
+from src.services.fisico_service import analyze_fisico_batch
+from src.sources.adapters import (BinarySource, CSVSource, NDJSONSource, SimulatedSource, SyntheticSource,
+                                  open_source, write_binary)
+from src.sources.pacing import Pacer
+from src.utils.record_batch import RecordBatch
+
+READINGS = [{"sample_id": f"B{i}", "ph": 7.0 + i / 100, "enzyme_activity": 100.0 + i} for i in range(100)]
+
+
+async def _read_all(source):
+    records = []
+    while (record := await source.read()) is not None:
+        records.append(record)
+    return records
+
+
+@pytest.mark.asyncio
+async def test_ndjson_source_reads_across_chunk_boundaries(tmp_path):
+    path = tmp_path / "bioquimico.ndjson"
+    path.write_text("".join(json.dumps(r) + "\n" for r in READINGS))
+
+    records = await _read_all(NDJSONSource(path, "bioquimico", chunk_bytes=37))
+
+    assert records == READINGS
+
+
+@pytest.mark.asyncio
+async def test_csv_source_reads_rows_as_text(tmp_path):
+    path = tmp_path / "bioquimico.csv"
+    rows = "".join(f"{r['sample_id']},{r['ph']},{r['enzyme_activity']}\n" for r in READINGS)
+    path.write_text("sample_id,ph,enzyme_activity\n" + rows)
+
+    records = await _read_all(CSVSource(path, "bioquimico", chunk_bytes=64))
+
+    assert len(records) == 100
+    assert records[5] == {"sample_id": "B5", "ph": "7.05", "enzyme_activity": "105.0"}
+
+
+@pytest.mark.asyncio
+async def test_binary_source_roundtrip(tmp_path):
+    path = tmp_path / "bioquimico.bin"
+    assert write_binary(path, READINGS, "bioquimico") == 100
+
+    source = BinarySource(path, "bioquimico", chunk_records=7)
+    records = await _read_all(source)
+
+    assert records == READINGS
+    assert source._mmap is None  # cerrado al agotarse
+
+
+def test_write_binary_rejects_oversized_strings(tmp_path):
+    path = tmp_path / "genetico.bin"
+    record = {"sample_id": "G1", "sequence": "A" * 257, "quality": 0.9}
+    with pytest.raises(ValueError, match="sequence"):
+        write_binary(path, [record], "genetico")
+    assert not path.exists()
+
+    record["sequence"] = "A" * 256
+    assert write_binary(path, [record], "genetico") == 1
+
+
+def test_open_source_picks_adapter_by_extension(tmp_path):
+    assert isinstance(open_source("stream/genetico", "genetico"), SimulatedSource)
+    assert isinstance(open_source(str(tmp_path / "a.jsonl"), "genetico"), NDJSONSource)
+    assert isinstance(open_source(str(tmp_path / "a.csv"), "genetico"), CSVSource)
+    assert isinstance(open_source(str(tmp_path / "a.dat"), "genetico"), BinarySource)
+
+
+@pytest.mark.asyncio
+async def test_pacer_rate_mode_holds_target_rate():
+    pacer = Pacer("rate", rate=200)
+    start = time.perf_counter()
+    for _ in range(41):
+        await pacer.wait()
+    elapsed = time.perf_counter() - start
+
+    assert 0.18 <= elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_replay_file_through_pipeline_at_full_speed(tmp_path, monkeypatch):
+    path = tmp_path / "bioquimico.bin"
+    write_binary(path, READINGS, "bioquimico")
+    monkeypatch.setattr(orchestrator, "REPLAY_MODE", "fast")
+    service = BioquimicoService(str(path))
+    handled = []
+
+    async def analyze(svc, batch):
+        return analyze_bioquimico_batch(batch)
+
+    start = time.perf_counter()
+    await run_orchestration([service], analyze, handle=lambda svc, r: handled.append(r))
+
+    # En vivo serían 100 × 0.2 s; en replay el fichero se consume de inmediato
+    assert time.perf_counter() - start < 5
+    # La etapa de análisis tiene concurrencia 2: el orden entre lotes no se garantiza
+    assert sorted(r["sample_id"] for r in handled) == sorted(r["sample_id"] for r in READINGS)
+
+
+@pytest.mark.asyncio
+async def test_synthetic_source_is_bounded_and_reproducible():
+    records = await _read_all(SyntheticSource("fisico", limit=1000, chunk_records=300, seed=3))
+    again = await _read_all(SyntheticSource("fisico", limit=1000, chunk_records=300, seed=3))
+
+    assert len(records) == 1000 and records == again
+    assert set(records[0]) == {"sample_id", "temperature", "pressure"}
+    assert isinstance(open_source("synthetic", "fisico"), SyntheticSource)
+
+
+@pytest.mark.asyncio
+async def test_synthetic_anomalies_break_alert_rules():
+    source = SyntheticSource("fisico", limit=2000, anomaly_ratio=0.1, seed=1)
+    records = await _read_all(source)
+    results = analyze_fisico_batch(RecordBatch.from_records(records, "fisico"))
+
+    flagged = sum(r["temperature_alert"] or r["pressure_alert"] for r in results)
+    assert source.generator.anomalies == pytest.approx(200, rel=0.25)
+    # Los valores normales (3 desviaciones) casi nunca cruzan los límites
+    assert source.generator.anomalies <= flagged <= source.generator.anomalies + 5
+
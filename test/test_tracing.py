@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+
+from src.metrics.tracing import SPANS, STAMPS, TRACE_KEY, BatchTrace, Tracer, current_batch
+from src.processing import orchestrator
+from src.processing.orchestrator import run_orchestration
+from src.processing.router import ExecutionRouter
+from src.processing.workers import WorkerPool
+from src.services.fisico_service import FisicoService, analyze_fisico_batch
+from src.utils.record_batch import RecordBatch
+
+
+def _fisico_service(n):
+    service = FisicoService("dummy_source")
+    readings = iter([{"sample_id": f"F{i}", "temperature": 36.0, "pressure": 101.0} for i in range(n)])
+
+    async def fetch():
+        return next(readings, None)
+    service.fetch_from_source = fetch
+    return service
+
+
+@pytest.mark.asyncio
+async def test_traced_samples_get_every_stage_stamp(monkeypatch):
+    monkeypatch.setitem(orchestrator.INGEST_INTERVAL, "fisico", 0)
+    router = ExecutionRouter(None, None, mode="inline")
+    tracer = Tracer(sample_rate=1.0)
+    handled = []
+
+    async def analyze(svc, batch):
+        return await router.run(batch)
+
+    await run_orchestration([_fisico_service(20)], analyze, handle=lambda svc, r: handled.append(r), tracer=tracer)
+
+    assert len(handled) == 20 and not any(TRACE_KEY in r for r in handled)
+    assert tracer.finished == 20
+    for trace in tracer.completed:
+        stamps = [trace.stamps()[name] for name in STAMPS]
+        assert None not in stamps and stamps == sorted(stamps)
+        assert trace.batch.mode == "inline" and trace.batch.worker == os.getpid()
+    summary = tracer.summary()["fisico"]
+    assert set(summary) == set(SPANS) and summary["total"]["count"] == 20
+
+
+@pytest.mark.asyncio
+async def test_sampling_rate_limits_traced_records(monkeypatch):
+    monkeypatch.setitem(orchestrator.INGEST_INTERVAL, "fisico", 0)
+    tracer = Tracer(sample_rate=0.1, seed=1)
+    handled = []
+
+    async def analyze(svc, batch):
+        return analyze_fisico_batch(batch)
+
+    await run_orchestration([_fisico_service(500)], analyze, handle=lambda svc, r: handled.append(r), tracer=tracer)
+
+    assert len(handled) == 500
+    assert 20 <= tracer.finished <= 80
+    # Sin router no hay marcas de entrega ni de worker: esos tramos se omiten
+    assert "analyze" not in tracer.summary()["fisico"]
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_returns_worker_timing_from_child_process():
+    batch = RecordBatch.from_records([{"sample_id": "F1", "temperature": 36.0, "pressure": 101.0}], "fisico")
+    pool = WorkerPool(max_workers=1, ring_bytes=4096)
+    try:
+        results, (start, end, pid) = await pool.submit(batch, timed=True)
+    finally:
+        pool.shutdown()
+
+    assert results == analyze_fisico_batch(batch)
+    assert start <= end and pid != os.getpid()
+
+
+def test_export_writes_nested_chrome_trace_events(tmp_path):
+    tracer = Tracer(sample_rate=1.0)
+    traces = [tracer.sample("fisico", sample_id) for sample_id in ("F1", "F2")]
+    for trace in traces:
+        trace.enqueued = trace.ingested + 0.001
+        trace.batch = BatchTrace(trace.ingested + 0.002, size=2)
+        trace.batch.submitted = trace.ingested + 0.003
+        trace.batch.record_worker((trace.ingested + 0.004, trace.ingested + 0.005, 123))
+    for trace in traces:
+        tracer.finish(trace)
+        trace.handled = trace.ingested + 0.006
+
+    path = tmp_path / "trace.json"
+    assert tracer.export(path) == 2
+    events = json.loads(path.read_text())["traceEvents"]
+
+    samples = [e for e in events if e.get("cat") == "sample"]
+    stages = [e for e in events if e.get("cat") == "stage"]
+    assert [e["name"] for e in samples] == ["F1", "F2"] and len(stages) == 12
+    # Las muestras se solapan: van a carriles distintos y los tramos quedan dentro de la suya
+    assert samples[0]["tid"] != samples[1]["tid"]
+    for stage in stages:
+        parent = next(s for s in samples if s["tid"] == stage["tid"])
+        assert parent["ts"] <= stage["ts"] and stage["ts"] + stage["dur"] <= parent["ts"] + parent["dur"] + 1e-3
+    assert current_batch.get() is None